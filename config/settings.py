@@ -31,6 +31,7 @@ INSTALLED_APPS = [
     'drf_yasg',
     
     # Local Apps
+    'core',
     'users',
     'products',
     'wallet',
@@ -187,6 +188,113 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# CACHES
+# The wallet alias holds per-user balances and the catalog alias product
+# list/detail responses, each invalidated through version keys that writes
+# bump. Set REDIS_URL (needs the redis package) to keep both in Redis, shared
+# by every worker and management command. Without it they use per-process
+# local memory, where a bump made by another process is only seen once
+# entries expire.
+
+REDIS_URL = config('REDIS_URL', default='')
+REDIS_CACHE_BACKEND = 'django.core.cache.backends.redis.RedisCache'
+LOCMEM_CACHE_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+DEFAULT_CACHE_BACKEND = REDIS_CACHE_BACKEND if REDIS_URL else LOCMEM_CACHE_BACKEND
+
+WALLET_CACHE_BACKEND = config('WALLET_CACHE_BACKEND', default=DEFAULT_CACHE_BACKEND)
+CATALOG_CACHE_BACKEND = config('CATALOG_CACHE_BACKEND', default=DEFAULT_CACHE_BACKEND)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'wallet': {
+        'BACKEND': WALLET_CACHE_BACKEND,
+        'LOCATION': config(
+            'WALLET_CACHE_LOCATION',
+            default=REDIS_URL if WALLET_CACHE_BACKEND == REDIS_CACHE_BACKEND else 'wallet-balances'
+        ),
+        'TIMEOUT': config('WALLET_CACHE_TIMEOUT', default=60, cast=int),
+        # Each active user takes two keys, a balance and its version.
+        'OPTIONS': {} if WALLET_CACHE_BACKEND == REDIS_CACHE_BACKEND else {
+            'MAX_ENTRIES': config('WALLET_CACHE_MAX_ENTRIES', default=5000, cast=int),
+        },
+    },
+    'catalog': {
+        'BACKEND': CATALOG_CACHE_BACKEND,
+        'LOCATION': config(
+            'CATALOG_CACHE_LOCATION',
+            default=REDIS_URL if CATALOG_CACHE_BACKEND == REDIS_CACHE_BACKEND else 'catalog-responses'
+        ),
+        'TIMEOUT': config('CATALOG_CACHE_TIMEOUT', default=300, cast=int),
+        # Redis evicts by its own maxmemory policy and takes no MAX_ENTRIES.
+        'OPTIONS': {} if CATALOG_CACHE_BACKEND == REDIS_CACHE_BACKEND else {
+            'MAX_ENTRIES': config('CATALOG_CACHE_MAX_ENTRIES', default=5000, cast=int),
+        },
+    },
+}
+
+# Number of web worker processes (the variable gunicorn reads too). A
+# local-memory balance cache can't see credits and debits handled by other
+# workers, so it is only on by default for a single worker or a shared backend.
+WEB_CONCURRENCY = config('WEB_CONCURRENCY', default=1, cast=int)
+WALLET_CACHE_ENABLED = config(
+    'WALLET_CACHE_ENABLED',
+    default=WALLET_CACHE_BACKEND != LOCMEM_CACHE_BACKEND or WEB_CONCURRENCY <= 1,
+    cast=bool
+)
+
+# Product list/detail GETs are served from the catalog alias, keyed by a
+# version that every product write bumps. ETags are a digest of the body.
+CATALOG_CACHE_ENABLED = config('CATALOG_CACHE_ENABLED', default=True, cast=bool)
+
+
+# PRODUCT LIST
+# Build GET /api/products/ pages from .values() rows instead of
+# ProductListSerializer; the JSON is identical.
+
+PRODUCT_LIST_FAST_PATH = config('PRODUCT_LIST_FAST_PATH', default=True, cast=bool)
+
+
+# LOW STOCK
+# Products with 0 < stock_quantity < LOW_STOCK_THRESHOLD count as low stock.
+
+LOW_STOCK_THRESHOLD = config('LOW_STOCK_THRESHOLD', default=10, cast=int)
+
+# The stock alert feed holds back alerts newer than this many seconds, so an
+# alert committed after a higher id was polled is not skipped. Keep it above
+# the longest stock-changing transaction.
+STOCK_ALERT_FEED_DELAY = config('STOCK_ALERT_FEED_DELAY', default=5, cast=int)
+
+
+# PRODUCT SEARCH
+# 'fulltext' - FTS5 index on SQLite, pg_trgm indexes on PostgreSQL
+# 'basic'    - name/description icontains scan
+
+PRODUCT_SEARCH_BACKEND = config('PRODUCT_SEARCH_BACKEND', default='fulltext')
+
+
+# PURCHASE ENGINE
+# 'locking'     - row locks on product and wallet (select_for_update)
+# 'conditional' - guarded single-statement UPDATEs, no read-modify-write
+
+PURCHASE_ENGINE = config('PURCHASE_ENGINE', default='locking')
+
+
+# IDEMPOTENCY KEYS
+
+IDEMPOTENCY_KEY_TTL = timedelta(hours=config('IDEMPOTENCY_KEY_TTL_HOURS', default=24, cast=int))
+IDEMPOTENCY_CACHE_SIZE = config('IDEMPOTENCY_CACHE_SIZE', default=10000, cast=int)
+
+
+# WALLET SNAPSHOTS
+# Transaction timestamps are taken before commit, so a snapshot boundary is
+# only written once it is this many seconds in the past. Keep it above the
+# longest wallet transaction.
+
+WALLET_SNAPSHOT_DELAY = config('WALLET_SNAPSHOT_DELAY', default=60, cast=int)
+
+
 # LOGGING CONFIGURATION
 
 LOGGING = {
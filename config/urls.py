@@ -38,4 +38,5 @@ urlpatterns = [
     path('api/products/', include('products.urls')),
     path('api/wallet/', include('wallet.urls')),
     path('api/orders/', include('orders.urls')),
+    path('api/core/', include('core.urls')),
 ]
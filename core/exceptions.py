@@ -42,6 +42,12 @@ class ProductNotFoundError(APIException):
     default_code = 'product_not_found'
 
 
+class DuplicateProductError(APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_detail = 'A product with this name already exists.'
+    default_code = 'duplicate_product'
+
+
 class WalletNotFoundError(APIException):
     status_code = status.HTTP_404_NOT_FOUND
     default_detail = 'Wallet not found for this user.'
@@ -54,5 +60,13 @@ class UnauthorizedAccessError(APIException):
     default_code = 'unauthorized_access'
 
 
+class IdempotencyKeyReuseError(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = 'Idempotency-Key was already used with a different request.'
+    default_code = 'idempotency_key_reuse'
 
 
+class IdempotencyConflictError(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'A request with this Idempotency-Key is already being processed.'
+    default_code = 'idempotency_conflict'
@@ -0,0 +1,250 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .exceptions import IdempotencyConflictError, IdempotencyKeyReuseError
+from .models import IdempotencyKey
+from .utils import create_error_response
+
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+class LRUCache:
+    """Thread-safe LRU map whose entries also expire at a wall-clock time."""
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: Any, value: Any, expires_at: float) -> None:
+        if self.max_size <= 0:
+            return
+        
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class IdempotencyService:
+    _cache = LRUCache(settings.IDEMPOTENCY_CACHE_SIZE)
+    _metrics_lock = threading.Lock()
+    _metrics = {'memory_hits': 0, 'store_hits': 0, 'misses': 0, 'stored': 0}
+    
+    @staticmethod
+    def fingerprint(data: Any) -> str:
+        payload = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    @classmethod
+    def lookup(
+        cls,
+        user_id: int,
+        scope: str,
+        key: str,
+        request_hash: str
+    ) -> Optional[Tuple[int, Any]]:
+        cache_key = (user_id, scope, key)
+        cached = cls._cache.get(cache_key)
+        
+        if cached is not None:
+            cls._record('memory_hits')
+        else:
+            record = IdempotencyKey.objects.filter(
+                user_id=user_id,
+                scope=scope,
+                key=key,
+                expires_at__gt=timezone.now()
+            ).values_list(
+                'request_hash', 'status_code', 'response_body', 'expires_at'
+            ).first()
+            
+            if record is None:
+                cls._record('misses')
+                return None
+            
+            cls._record('store_hits')
+            cached = record[:3]
+            cls._cache.set(cache_key, cached, record[3].timestamp())
+        
+        stored_hash, status_code, response_body = cached
+        if stored_hash != request_hash:
+            raise IdempotencyKeyReuseError()
+        
+        return status_code, response_body
+    
+    @classmethod
+    def remember(
+        cls,
+        user_id: int,
+        scope: str,
+        key: str,
+        request_hash: str,
+        status_code: int,
+        response_body: Any
+    ) -> None:
+        """
+        Persist a response for replay. Must run inside the transaction that
+        performed the work, so a concurrent duplicate that loses the race on
+        the unique constraint rolls its own work back.
+        """
+        now = timezone.now()
+        expires_at = now + settings.IDEMPOTENCY_KEY_TTL
+        
+        try:
+            with transaction.atomic():
+                # An expired row still holds the unique constraint until the
+                # purge runs, so a key reused after expiry replaces it.
+                IdempotencyKey.objects.filter(
+                    user_id=user_id,
+                    scope=scope,
+                    key=key,
+                    expires_at__lte=now
+                ).delete()
+                IdempotencyKey.objects.create(
+                    user_id=user_id,
+                    scope=scope,
+                    key=key,
+                    request_hash=request_hash,
+                    status_code=status_code,
+                    response_body=response_body,
+                    expires_at=expires_at
+                )
+        except IntegrityError:
+            raise IdempotencyConflictError()
+        
+        cls._record('stored')
+        cached = (request_hash, status_code, response_body)
+        transaction.on_commit(
+            lambda: cls._cache.set(
+                (user_id, scope, key), cached, expires_at.timestamp()
+            )
+        )
+    
+    @classmethod
+    def get_metrics(cls) -> Dict[str, Any]:
+        with cls._metrics_lock:
+            metrics = dict(cls._metrics)
+        
+        hits = metrics['memory_hits'] + metrics['store_hits']
+        lookups = hits + metrics['misses']
+        metrics['hit_rate'] = hits / lookups if lookups else 0.0
+        metrics['cache_size'] = len(cls._cache)
+        metrics['store_size'] = IdempotencyKey.objects.count()
+        return metrics
+    
+    @classmethod
+    def _record(cls, metric: str) -> None:
+        with cls._metrics_lock:
+            cls._metrics[metric] += 1
+
+
+class IdempotentRequestMixin:
+    """
+    Replays the stored response for a repeated ``Idempotency-Key`` header.
+    Views set ``idempotency_scope`` and call ``get_idempotent_replay`` before
+    doing any work and ``remember_idempotent_response`` inside the same
+    transaction as the work itself.
+    """
+    idempotency_scope: str = None
+    
+    def get_idempotency_key(self, request) -> Optional[str]:
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        return key.strip() if key and key.strip() else None
+    
+    def get_idempotent_replay(self, request) -> Optional[Response]:
+        key = self.get_idempotency_key(request)
+        if key is None:
+            return None
+        
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                create_error_response(
+                    f'{IDEMPOTENCY_HEADER} cannot exceed {MAX_KEY_LENGTH} characters'
+                ),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            replay = IdempotencyService.lookup(
+                request.user.id,
+                self.idempotency_scope,
+                key,
+                IdempotencyService.fingerprint(request.data)
+            )
+        except IdempotencyKeyReuseError as e:
+            return Response(
+                create_error_response(str(e.detail)),
+                status=e.status_code
+            )
+        
+        if replay is None:
+            return None
+        
+        status_code, response_body = replay
+        return Response(response_body, status=status_code)
+    
+    def remember_idempotent_response(
+        self,
+        request,
+        status_code: int,
+        response_body: Any
+    ) -> None:
+        key = self.get_idempotency_key(request)
+        if key is None:
+            return
+        
+        IdempotencyService.remember(
+            request.user.id,
+            self.idempotency_scope,
+            key,
+            IdempotencyService.fingerprint(request.data),
+            status_code,
+            response_body
+        )
+    
+    def idempotency_conflict_response(self, request) -> Response:
+        replay = self.get_idempotent_replay(request)
+        if replay is not None:
+            return replay
+        
+        return Response(
+            create_error_response(IdempotencyConflictError.default_detail),
+            status=status.HTTP_409_CONFLICT
+        )
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = 'Delete expired idempotency keys in batches'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of keys deleted per batch (default: 5000)'
+        )
+        
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only count expired keys without deleting them'
+        )
+    
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        now = timezone.now()
+        expired = IdempotencyKey.objects.filter(expires_at__lte=now)
+        
+        if options['dry_run']:
+            self.stdout.write(f"Expired idempotency keys: {expired.count()}")
+            return
+        
+        total_deleted = 0
+        while True:
+            batch_ids = list(expired.values_list('id', flat=True)[:batch_size])
+            if not batch_ids:
+                break
+            
+            deleted, _ = IdempotencyKey.objects.filter(id__in=batch_ids).delete()
+            total_deleted += deleted
+            self.stdout.write(f"Deleted {total_deleted} expired keys...")
+        
+        self.stdout.write(
+            self.style.SUCCESS(f"[OK] Purged {total_deleted} expired idempotency keys")
+        )
+        self.stdout.write(f"Remaining keys: {IdempotencyKey.objects.count()}")
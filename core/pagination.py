@@ -0,0 +1,140 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+from typing import Any, List, Optional, Sequence
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only keyset pagination over ``ordering``.
+    
+    The cursor carries the ordering values of the last row on the page, so the
+    next page is a range scan starting right after it: no COUNT query and no
+    OFFSET, and page N costs the same as page 1. The last ordering field must
+    be unique (usually ``id``) to break ties.
+    """
+    ordering: Sequence[str] = ('-id',)
+    page_size = api_settings.PAGE_SIZE or 10
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+    
+    def paginate_queryset(self, queryset, request, view=None) -> List[Any]:
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+        
+        queryset = queryset.order_by(*self.ordering)
+        
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self._after_position(position))
+        
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        results = results[:self.page_size]
+        
+        self.next_position = None
+        if self.has_next:
+            self.next_position = [
+                self._get_value(results[-1], field) for field in self._field_names
+            ]
+        
+        return results
+    
+    def get_paginated_response(self, data) -> Response:
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+    
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                },
+                'results': schema,
+            },
+        }
+    
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+    
+    def get_next_link(self) -> Optional[str]:
+        if self.next_position is None:
+            return None
+        
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_position)
+        )
+    
+    def encode_cursor(self, position: List[Any]) -> str:
+        # isoformat() keeps full microsecond precision, which DjangoJSONEncoder
+        # truncates; a truncated timestamp would skip or repeat rows.
+        payload = json.dumps(
+            position,
+            default=lambda value: value.isoformat() if hasattr(value, 'isoformat') else str(value)
+        )
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+    
+    def decode_cursor(self, request) -> Optional[List[Any]]:
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        
+        try:
+            position = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+            if not isinstance(position, list) or len(position) != len(self.ordering):
+                raise ValueError(token)
+            
+            return [
+                self.model._meta.get_field(field).to_python(value)
+                for field, value in zip(self._field_names, position)
+            ]
+        except (TypeError, ValueError, UnicodeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+    
+    @property
+    def _field_names(self) -> List[str]:
+        return [field.lstrip('-') for field in self.ordering]
+    
+    def _after_position(self, position: List[Any]) -> Q:
+        # (a, b, c) > (x, y, z) expanded into
+        # a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z),
+        # with > flipped to < for descending fields.
+        condition = Q()
+        equal_prefix = Q()
+        
+        for ordering_field, value in zip(self.ordering, position):
+            field = ordering_field.lstrip('-')
+            lookup = 'lt' if ordering_field.startswith('-') else 'gt'
+            condition |= equal_prefix & Q(**{f'{field}__{lookup}': value})
+            equal_prefix &= Q(**{field: value})
+        
+        return condition
+    
+    def _get_value(self, item: Any, field: str) -> Any:
+        if isinstance(item, dict):
+            return item[field]
+        return getattr(item, self.model._meta.get_field(field).attname)
@@ -0,0 +1,108 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Sequence
+
+from django.http import StreamingHttpResponse
+
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+ROWS_PER_CHUNK = 500
+
+
+def _to_text(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def iter_csv(fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    """
+    Encode rows as CSV, header first. Rows are buffered ``ROWS_PER_CHUNK`` at
+    a time so each yielded chunk is a reasonable write, not one per row.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield buffer.getvalue().encode('utf-8')
+    
+    buffer.seek(0)
+    buffer.truncate()
+    pending = 0
+    for row in rows:
+        writer.writerow(['' if value is None else _to_text(value) for value in row])
+        pending += 1
+        if pending >= ROWS_PER_CHUNK:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    
+    if pending:
+        yield buffer.getvalue().encode('utf-8')
+
+
+def iter_jsonl(fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(fields, row)), default=_to_text))
+        if len(lines) >= ROWS_PER_CHUNK:
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
+            lines = []
+    
+    if lines:
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Gzip a byte stream incrementally. Each chunk is sync-flushed, so a
+    client sees data as it is produced instead of after the last row.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_export(
+    file_format: str,
+    fields: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    compress: bool = False
+) -> Iterator[bytes]:
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {file_format}")
+    
+    encode = iter_csv if file_format == 'csv' else iter_jsonl
+    chunks = encode(fields, rows)
+    return gzip_chunks(chunks) if compress else chunks
+
+
+def export_filename(basename: str, file_format: str, compress: bool = False) -> str:
+    return f"{basename}.{file_format}{'.gz' if compress else ''}"
+
+
+def streaming_export_response(
+    chunks: Iterable[bytes],
+    filename: str,
+    file_format: str,
+    compress: bool = False
+) -> StreamingHttpResponse:
+    # Gzipped exports are served as .gz files rather than with
+    # Content-Encoding, so clients save them compressed.
+    content_type = 'application/gzip' if compress else EXPORT_FORMATS[file_format]
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,108 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.idempotency import IDEMPOTENCY_HEADER, IdempotencyService
+from core.models import IdempotencyKey
+from orders.models import Order
+from products.models import Product
+from wallet.models import Transaction
+from wallet.services import WalletService
+
+
+User = get_user_model()
+
+
+class IdempotentRequestTest(TestCase):
+    def setUp(self):
+        # The in-process cache outlives each test's rolled back transaction.
+        IdempotencyService._cache.clear()
+        self.customer = User.objects.create_user(
+            username='idempotent_customer',
+            email='idempotent_customer@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.customer)
+    
+    def _add_funds(self, amount: str, key: str):
+        return self.client.post(
+            '/api/wallet/add-funds/',
+            {'amount': amount},
+            format='json',
+            headers={IDEMPOTENCY_HEADER: key}
+        )
+    
+    def _balance(self) -> Decimal:
+        return WalletService.get_wallet(self.customer).balance
+    
+    def test_replay_returns_stored_response(self):
+        first = self._add_funds('25.00', 'add-1')
+        replay = self._add_funds('25.00', 'add-1')
+        
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(replay.status_code, 200)
+        self.assertEqual(replay.json(), first.json())
+        self.assertEqual(self._balance(), Decimal('25.00'))
+        self.assertEqual(
+            Transaction.objects.filter(wallet__user=self.customer).count(), 1
+        )
+    
+    def test_key_reused_with_different_body_is_rejected(self):
+        self._add_funds('25.00', 'add-1')
+        response = self._add_funds('30.00', 'add-1')
+        
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(self._balance(), Decimal('25.00'))
+    
+    def test_keys_are_scoped_per_user(self):
+        other = User.objects.create_user(
+            username='idempotent_other',
+            email='idempotent_other@example.com',
+            password='testpass123'
+        )
+        self._add_funds('25.00', 'shared-key')
+        self.client.force_authenticate(other)
+        response = self._add_funds('10.00', 'shared-key')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(WalletService.get_wallet(other).balance, Decimal('10.00'))
+    
+    def test_expired_key_can_be_reused(self):
+        self._add_funds('25.00', 'add-1')
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        IdempotencyService._cache.clear()
+        
+        response = self._add_funds('30.00', 'add-1')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._balance(), Decimal('55.00'))
+        self.assertEqual(IdempotencyKey.objects.count(), 1)
+    
+    def test_purchase_replay_places_one_order(self):
+        WalletService.credit_wallet(self.customer, Decimal('100.00'))
+        product = Product.objects.create(
+            name='Idempotent Product',
+            price=Decimal('15.00'),
+            stock_quantity=10
+        )
+        
+        responses = [
+            self.client.post(
+                '/api/orders/purchase/',
+                {'product_id': product.id, 'quantity': 2},
+                format='json',
+                headers={IDEMPOTENCY_HEADER: 'purchase-1'}
+            )
+            for _ in range(2)
+        ]
+        
+        self.assertEqual([response.status_code for response in responses], [201, 201])
+        self.assertEqual(responses[1].json(), responses[0].json())
+        self.assertEqual(Order.objects.filter(customer=self.customer).count(), 1)
+        self.assertEqual(Product.objects.get(id=product.id).stock_quantity, 8)
+        self.assertEqual(self._balance(), Decimal('70.00'))
@@ -0,0 +1,10 @@
+from django.urls import path
+from .views import (
+    IdempotencyMetricsView,
+)
+
+app_name = 'core'
+
+urlpatterns = [
+    path('idempotency/metrics/', IdempotencyMetricsView.as_view(), name='idempotency_metrics'),
+]
@@ -0,0 +1,19 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+
+from users.permissions import IsAdmin
+from .idempotency import IdempotencyService
+from .utils import create_success_response
+
+
+class IdempotencyMetricsView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+    
+    def get(self, request):
+        return Response(
+            create_success_response(
+                message='Idempotency metrics retrieved successfully',
+                data=IdempotencyService.get_metrics()
+            )
+        )
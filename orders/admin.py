@@ -1,5 +1,8 @@
 from django.contrib import admin
+from django.db import transaction
+
 from .models import Order
+from .services import PurchaseService
 
 
 @admin.register(Order)
@@ -37,6 +40,23 @@ class OrderAdmin(admin.ModelAdmin):
         }),
     )
     
+    def save_model(self, request, obj, form, change):
+        # Statistics read the customer's summary row, so a status edit has
+        # to move the order in or out of its completed count. The previous
+        # status is read under a row lock so concurrent edits of the same
+        # order each apply their own transition exactly once.
+        with transaction.atomic():
+            previous_status = None
+            if change:
+                previous_status = Order.objects.select_for_update().filter(
+                    pk=obj.pk
+                ).values_list('status', flat=True).first()
+            
+            super().save_model(request, obj, form, change)
+            
+            if previous_status is not None:
+                PurchaseService.record_status_change(obj, previous_status)
+    
     def has_add_permission(self, request):
         return False
     
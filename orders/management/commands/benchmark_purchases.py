@@ -0,0 +1,130 @@
+import threading
+import time
+import uuid
+from decimal import Decimal
+from typing import Dict, Any
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+from django.contrib.auth import get_user_model
+
+from orders.services import PurchaseService
+from products.models import Product
+from wallet.models import Wallet
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark concurrent purchases of a single product per purchase engine'
+    
+    ENGINES = ['locking', 'conditional']
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--buyers',
+            type=int,
+            default=50,
+            help='Number of concurrent buyers (default: 50)'
+        )
+        
+        parser.add_argument(
+            '--purchases',
+            type=int,
+            default=20,
+            help='Purchases made by each buyer (default: 20)'
+        )
+        
+        parser.add_argument(
+            '--engine',
+            choices=self.ENGINES,
+            help='Benchmark a single engine instead of all of them'
+        )
+    
+    def handle(self, *args, **options):
+        engines = [options['engine']] if options['engine'] else self.ENGINES
+        
+        self.stdout.write(
+            self.style.SUCCESS('\n=== Purchase Benchmark ===')
+        )
+        self.stdout.write(
+            f"Buyers: {options['buyers']}, "
+            f"purchases per buyer: {options['purchases']}, "
+            f"database: {connection.vendor}\n"
+        )
+        
+        for engine in engines:
+            result = self._run(engine, options['buyers'], options['purchases'])
+            self.stdout.write(
+                f"{engine:<12} {result['purchases_per_second']:>10.1f} purchases/sec  "
+                f"({result['succeeded']} ok, {result['failed']} failed, "
+                f"{result['elapsed']:.2f}s)"
+            )
+        
+        self.stdout.write('')
+    
+    def _run(self, engine: str, buyers: int, purchases: int) -> Dict[str, Any]:
+        run_id = uuid.uuid4().hex[:8]
+        product = Product.objects.create(
+            name=f'Benchmark product {run_id}',
+            price=Decimal('1.00'),
+            stock_quantity=buyers * purchases
+        )
+        customers = [
+            User.objects.create_user(
+                username=f'bench_{run_id}_{idx}',
+                email=f'bench_{run_id}_{idx}@example.com',
+                password=None
+            )
+            for idx in range(buyers)
+        ]
+        for customer in customers:
+            Wallet.objects.update_or_create(
+                user=customer,
+                defaults={'balance': Decimal(purchases)}
+            )
+        
+        counters = {'succeeded': 0, 'failed': 0}
+        counters_lock = threading.Lock()
+        start_barrier = threading.Barrier(buyers)
+        
+        def buyer(customer):
+            succeeded = failed = 0
+            try:
+                start_barrier.wait()
+                for _ in range(purchases):
+                    try:
+                        PurchaseService.create_purchase(customer, product.id, 1)
+                        succeeded += 1
+                    except Exception:
+                        failed += 1
+            finally:
+                connection.close()
+            with counters_lock:
+                counters['succeeded'] += succeeded
+                counters['failed'] += failed
+        
+        threads = [
+            threading.Thread(target=buyer, args=(customer,))
+            for customer in customers
+        ]
+        
+        with override_settings(PURCHASE_ENGINE=engine):
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        
+        User.objects.filter(id__in=[customer.id for customer in customers]).delete()
+        product.delete()
+        
+        return {
+            'succeeded': counters['succeeded'],
+            'failed': counters['failed'],
+            'elapsed': elapsed,
+            'purchases_per_second': counters['succeeded'] / elapsed if elapsed else 0.0
+        }
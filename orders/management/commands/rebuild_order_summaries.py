@@ -0,0 +1,88 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.contrib.auth import get_user_model
+
+from orders.models import Order, CustomerOrderSummary
+from orders.summaries import (
+    SUMMARY_FIELDS,
+    aggregate_order_summaries,
+    build_order_summaries
+)
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Recompute customer order summaries from the orders table'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Number of customers recomputed per transaction (default: 1000)'
+        )
+    
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        last_id = 0
+        processed = 0
+        
+        self.stdout.write(
+            self.style.SUCCESS('\n=== Rebuilding Order Summaries ===\n')
+        )
+        
+        while True:
+            customer_ids = list(
+                User.objects.filter(id__gt=last_id).order_by('id').values_list(
+                    'id', flat=True
+                )[:chunk_size]
+            )
+            if not customer_ids:
+                break
+            
+            self._rebuild_chunk(customer_ids)
+            last_id = customer_ids[-1]
+            processed += len(customer_ids)
+            self.stdout.write(f"Processed {processed} customers...")
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"[OK] Rebuilt summaries for {processed} customers "
+                f"({CustomerOrderSummary.objects.count()} with orders)\n"
+            )
+        )
+    
+    @transaction.atomic
+    def _rebuild_chunk(self, customer_ids):
+        # Lock the chunk's summary rows before aggregating. A purchase that
+        # commits while we work then blocks on its F() update until the
+        # absolute values below are written, and lands on top of them
+        # instead of being overwritten. Missing rows are created first so
+        # there is something to lock; rows left empty are deleted below.
+        CustomerOrderSummary.objects.bulk_create(
+            [CustomerOrderSummary(customer_id=customer_id) for customer_id in customer_ids],
+            ignore_conflicts=True
+        )
+        list(
+            CustomerOrderSummary.objects.select_for_update().filter(
+                customer_id__in=customer_ids
+            ).values_list('id', flat=True)
+        )
+        
+        summaries = build_order_summaries(
+            CustomerOrderSummary,
+            aggregate_order_summaries(Order.objects.filter(customer_id__in=customer_ids))
+        )
+        
+        CustomerOrderSummary.objects.filter(customer_id__in=customer_ids).exclude(
+            customer_id__in=[summary.customer_id for summary in summaries]
+        ).delete()
+        
+        CustomerOrderSummary.objects.bulk_create(
+            summaries,
+            update_conflicts=True,
+            unique_fields=['customer'],
+            update_fields=SUMMARY_FIELDS
+        )
@@ -0,0 +1,41 @@
+from django.db import migrations
+
+from orders.summaries import (
+    SUMMARY_FIELDS,
+    aggregate_order_summaries,
+    build_order_summaries
+)
+
+
+CHUNK_SIZE = 1000
+
+
+def backfill_order_summaries(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    CustomerOrderSummary = apps.get_model('orders', 'CustomerOrderSummary')
+
+    customer_ids = list(
+        Order.objects.order_by('customer_id').values_list('customer_id', flat=True).distinct()
+    )
+    for start in range(0, len(customer_ids), CHUNK_SIZE):
+        chunk = customer_ids[start:start + CHUNK_SIZE]
+        CustomerOrderSummary.objects.bulk_create(
+            build_order_summaries(
+                CustomerOrderSummary,
+                aggregate_order_summaries(Order.objects.filter(customer_id__in=chunk))
+            ),
+            update_conflicts=True,
+            unique_fields=['customer'],
+            update_fields=SUMMARY_FIELDS
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_customerordersummary'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_order_summaries, migrations.RunPython.noop),
+    ]
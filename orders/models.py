@@ -51,3 +51,29 @@ class Order(models.Model):
     @property
     def total_amount(self) -> Decimal:
         return self.unit_price * self.quantity
+
+
+class CustomerOrderSummary(models.Model):
+    customer = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='order_summary'
+    )
+    
+    total_orders = models.PositiveIntegerField(default=0)
+    completed_orders = models.PositiveIntegerField(default=0)
+    total_spent = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=Decimal('0.00')
+    )
+    last_order_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'customer_order_summaries'
+        verbose_name = 'Customer Order Summary'
+        verbose_name_plural = 'Customer Order Summaries'
+    
+    def __str__(self) -> str:
+        return f"{self.customer.username} - {self.total_orders} orders"
@@ -32,5 +32,51 @@ class CreatePurchaseSerializer(serializers.Serializer):
         return value
 
 
+class CheckoutItemSerializer(serializers.Serializer):
+    product_id = serializers.IntegerField(required=True, min_value=1)
+    quantity = serializers.IntegerField(required=True, min_value=1, max_value=1000)
+
+
+class CheckoutSerializer(serializers.Serializer):
+    items = CheckoutItemSerializer(many=True, allow_empty=False)
+    
+    def validate_items(self, value):
+        if len(value) > 100:
+            raise serializers.ValidationError("Checkout cannot contain more than 100 lines")
+        
+        quantities = {}
+        for item in value:
+            product_id = item['product_id']
+            quantities[product_id] = quantities.get(product_id, 0) + item['quantity']
+            if quantities[product_id] > 1000:
+                raise serializers.ValidationError(
+                    f"Quantity for product {product_id} cannot exceed 1000 items per order"
+                )
+        
+        return value
+
+
+class SpendBucketSerializer(serializers.Serializer):
+    orders = serializers.IntegerField()
+    total_spent = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class MonthlySpendSerializer(SpendBucketSerializer):
+    month = serializers.CharField()
+
+
+class TopProductSerializer(serializers.Serializer):
+    product_id = serializers.IntegerField()
+    product_name = serializers.CharField()
+    quantity = serializers.IntegerField()
+    total_spent = serializers.DecimalField(max_digits=14, decimal_places=2)
 
 
+class OrderStatisticsSerializer(serializers.Serializer):
+    total_orders = serializers.IntegerField()
+    completed_orders = serializers.IntegerField()
+    total_spent = serializers.DecimalField(max_digits=14, decimal_places=2)
+    last_order_at = serializers.DateTimeField(allow_null=True)
+    by_status = serializers.DictField(child=SpendBucketSerializer(), required=False)
+    top_products = TopProductSerializer(many=True, required=False)
+    monthly_spend = MonthlySpendSerializer(many=True, required=False)
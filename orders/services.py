@@ -1,9 +1,13 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 from decimal import Decimal
+from django.conf import settings
 from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce, Greatest, TruncMonth
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
-from .models import Order
+from .models import Order, CustomerOrderSummary
 from products.models import Product
 from products.services import ProductService
 from wallet.services import WalletService
@@ -19,11 +23,25 @@ User = get_user_model()
 
 class PurchaseService:
     @staticmethod
-    @transaction.atomic
     def create_purchase(
         customer: User,
         product_id: int,
         quantity: int
+    ) -> Dict[str, Any]:
+        if settings.PURCHASE_ENGINE == 'conditional':
+            return PurchaseService._create_purchase_conditional(
+                customer, product_id, quantity
+            )
+        return PurchaseService._create_purchase_locking(
+            customer, product_id, quantity
+        )
+    
+    @staticmethod
+    @transaction.atomic
+    def _create_purchase_locking(
+        customer: User,
+        product_id: int,
+        quantity: int
     ) -> Dict[str, Any]:
         if quantity <= 0:
             raise InvalidTransactionError("Quantity must be greater than zero")
@@ -56,6 +74,9 @@ class PurchaseService:
         )
         
         product.reduce_stock(quantity)
+        ProductService.record_stock_changes(
+            [(product.id, product.stock_quantity + quantity, product.stock_quantity)]
+        )
         
         order = Order.objects.create(
             customer=customer,
@@ -65,15 +86,227 @@ class PurchaseService:
             total_price=total_cost,
             status=Order.OrderStatus.COMPLETED
         )
+        PurchaseService.record_orders_in_summary(customer, [order])
+        
+        return {
+            'order': order,
+            'transaction': transaction_record,
+            'product': product,
+            'total_amount': total_cost,
+            'remaining_balance': transaction_record.balance_after_transaction
+        }
+    
+    @staticmethod
+    @transaction.atomic
+    def _create_purchase_conditional(
+        customer: User,
+        product_id: int,
+        quantity: int
+    ) -> Dict[str, Any]:
+        # No row is locked up front: stock and balance are each decremented by
+        # a single guarded UPDATE and the affected-row count decides failure.
+        # The stock UPDATE goes last, so the hot product row is only locked
+        # from that statement to commit, not across the wallet debit and the
+        # inserts. Any exception rolls back the whole purchase.
+        if quantity <= 0:
+            raise InvalidTransactionError("Quantity must be greater than zero")
+        
+        try:
+            product = Product.objects.get(id=product_id)
+        except Product.DoesNotExist:
+            raise ProductNotFoundError(f"Product with ID {product_id} not found")
+        
+        # Unlocked pre-check so an obviously sold-out product doesn't debit
+        # and roll back; the guarded UPDATE below is what actually decides.
+        if product.stock_quantity < quantity:
+            raise StockUnavailableError(
+                product_name=product.name,
+                requested=quantity,
+                available=product.stock_quantity
+            )
+        
+        total_cost = product.price * quantity
+        
+        transaction_record = WalletService.debit_wallet_conditional(
+            user=customer,
+            amount=total_cost,
+            description=f"Purchase: {product.name} x{quantity}"
+        )
+        
+        order = Order.objects.create(
+            customer=customer,
+            product=product,
+            quantity=quantity,
+            unit_price=product.price,
+            total_price=total_cost,
+            status=Order.OrderStatus.COMPLETED
+        )
+        PurchaseService.record_orders_in_summary(customer, [order])
+        
+        updated = Product.objects.filter(
+            id=product_id,
+            stock_quantity__gte=quantity
+        ).update(
+            stock_quantity=F('stock_quantity') - quantity,
+            updated_at=timezone.now()
+        )
+        product.stock_quantity = Product.objects.filter(id=product_id).values_list(
+            'stock_quantity', flat=True
+        ).first() or 0
+        
+        if not updated:
+            raise StockUnavailableError(
+                product_name=product.name,
+                requested=quantity,
+                available=product.stock_quantity
+            )
+        ProductService.record_stock_changes(
+            [(product.id, product.stock_quantity + quantity, product.stock_quantity)]
+        )
         
         return {
             'order': order,
             'transaction': transaction_record,
             'product': product,
             'total_amount': total_cost,
-            'remaining_balance': WalletService.get_wallet_balance(customer)
+            'remaining_balance': transaction_record.balance_after_transaction
         }
     
+    @staticmethod
+    @transaction.atomic
+    def create_checkout(
+        customer: User,
+        items: List[Dict[str, int]]
+    ) -> Dict[str, Any]:
+        quantities: Dict[int, int] = {}
+        for item in items:
+            if item['quantity'] <= 0:
+                raise InvalidTransactionError("Quantity must be greater than zero")
+            product_id = item['product_id']
+            quantities[product_id] = quantities.get(product_id, 0) + item['quantity']
+        
+        if not quantities:
+            raise InvalidTransactionError("Checkout must contain at least one item")
+        
+        # Lock in id order so concurrent checkouts over overlapping baskets
+        # always acquire row locks in the same sequence.
+        products = {
+            product.id: product
+            for product in Product.objects.select_for_update().filter(
+                id__in=quantities.keys()
+            ).order_by('id')
+        }
+        
+        missing_ids = sorted(set(quantities) - set(products))
+        if missing_ids:
+            raise ProductNotFoundError(
+                f"Product with ID {missing_ids[0]} not found"
+            )
+        
+        total_cost = Decimal('0.00')
+        for product_id, quantity in quantities.items():
+            product = products[product_id]
+            if product.stock_quantity < quantity:
+                raise StockUnavailableError(
+                    product_name=product.name,
+                    requested=quantity,
+                    available=product.stock_quantity
+                )
+            total_cost += product.price * quantity
+        
+        if not WalletService.check_sufficient_balance(customer, total_cost):
+            wallet_balance = WalletService.get_wallet_balance(customer)
+            raise InsufficientBalanceError(
+                required_balance=float(total_cost),
+                available_balance=float(wallet_balance)
+            )
+        
+        total_items = sum(quantities.values())
+        transaction_record = WalletService.debit_wallet(
+            user=customer,
+            amount=total_cost,
+            description=f"Checkout: {len(quantities)} products, {total_items} items"
+        )
+        
+        now = timezone.now()
+        orders = []
+        for product_id, quantity in quantities.items():
+            product = products[product_id]
+            product.stock_quantity -= quantity
+            product.updated_at = now
+            orders.append(Order(
+                customer=customer,
+                product=product,
+                quantity=quantity,
+                unit_price=product.price,
+                total_price=product.price * quantity,
+                status=Order.OrderStatus.COMPLETED
+            ))
+        
+        Product.objects.bulk_update(
+            products.values(),
+            ['stock_quantity', 'updated_at']
+        )
+        ProductService.record_stock_changes(
+            (
+                product_id,
+                products[product_id].stock_quantity + quantity,
+                products[product_id].stock_quantity
+            )
+            for product_id, quantity in quantities.items()
+        )
+        orders = Order.objects.bulk_create(orders)
+        PurchaseService.record_orders_in_summary(customer, orders)
+        
+        return {
+            'orders': orders,
+            'transaction': transaction_record,
+            'total_amount': total_cost,
+            'remaining_balance': transaction_record.balance_after_transaction
+        }
+    
+    @staticmethod
+    def record_orders_in_summary(customer: User, orders: List[Order]) -> None:
+        if not orders:
+            return
+        
+        completed = sum(
+            1 for order in orders if order.status == Order.OrderStatus.COMPLETED
+        )
+        last_order_at = max(order.created_at for order in orders)
+        changes = {
+            'total_orders': F('total_orders') + len(orders),
+            'completed_orders': F('completed_orders') + completed,
+            'total_spent': F('total_spent') + sum(order.total_price for order in orders),
+            # Orders from concurrent purchases can commit out of order, so
+            # never move the timestamp backwards. Coalesce because GREATEST
+            # returns NULL for a NULL argument on SQLite and MySQL.
+            'last_order_at': Greatest(Coalesce('last_order_at', last_order_at), last_order_at),
+            'updated_at': timezone.now()
+        }
+        
+        summaries = CustomerOrderSummary.objects.filter(customer=customer)
+        if not summaries.update(**changes):
+            CustomerOrderSummary.objects.get_or_create(customer=customer)
+            summaries.update(**changes)
+    
+    @staticmethod
+    def record_status_change(order: Order, previous_status: str) -> None:
+        """
+        Move an order in or out of the customer's ``completed_orders`` after
+        its status is edited. Totals and spend count every order whatever
+        its status, so only the completed count changes.
+        """
+        was_completed = previous_status == Order.OrderStatus.COMPLETED
+        is_completed = order.status == Order.OrderStatus.COMPLETED
+        if was_completed == is_completed:
+            return
+        
+        CustomerOrderSummary.objects.filter(customer_id=order.customer_id).update(
+            completed_orders=F('completed_orders') + (1 if is_completed else -1),
+            updated_at=timezone.now()
+        )
+    
     @staticmethod
     def get_customer_orders(
         customer: User,
@@ -96,19 +329,75 @@ class PurchaseService:
         return queryset.get(id=order_id)
     
     @staticmethod
-    def get_order_statistics(customer: User) -> Dict[str, Any]:
-        orders = Order.objects.filter(customer=customer)
+    def get_order_statistics(
+        customer: User,
+        include_breakdown: bool = False,
+        top_products: int = 5
+    ) -> Dict[str, Any]:
+        summary = CustomerOrderSummary.objects.filter(customer=customer).first()
+        statistics = {
+            'total_orders': summary.total_orders if summary else 0,
+            'completed_orders': summary.completed_orders if summary else 0,
+            'total_spent': summary.total_spent if summary else Decimal('0.00'),
+            'last_order_at': summary.last_order_at if summary else None
+        }
         
-        total_orders = orders.count()
-        total_spent = sum(order.total_price for order in orders)
-        completed_orders = orders.filter(status=Order.OrderStatus.COMPLETED).count()
+        if include_breakdown:
+            statistics.update(
+                PurchaseService.get_order_breakdown(customer, top_products)
+            )
+        
+        return statistics
+    
+    @staticmethod
+    def get_order_breakdown(
+        customer: User,
+        top_products: int = 5
+    ) -> Dict[str, Any]:
+        orders = Order.objects.filter(customer=customer).order_by()
+        
+        by_status = {
+            row['status']: {
+                'orders': row['orders'],
+                'total_spent': row['total_spent']
+            }
+            for row in orders.values('status').annotate(
+                orders=Count('id'),
+                total_spent=Sum('total_price')
+            )
+        }
+        
+        top_products_data = list(
+            orders.values('product_id', 'product__name').annotate(
+                quantity=Sum('quantity'),
+                total_spent=Sum('total_price')
+            ).order_by('-total_spent', 'product_id')[:top_products]
+        )
+        
+        monthly_spend = list(
+            orders.annotate(month=TruncMonth('created_at')).values('month').annotate(
+                orders=Count('id'),
+                total_spent=Sum('total_price')
+            ).order_by('month')
+        )
         
         return {
-            'total_orders': total_orders,
-            'completed_orders': completed_orders,
-            'total_spent': total_spent
+            'by_status': by_status,
+            'top_products': [
+                {
+                    'product_id': row['product_id'],
+                    'product_name': row['product__name'],
+                    'quantity': row['quantity'],
+                    'total_spent': row['total_spent']
+                }
+                for row in top_products_data
+            ],
+            'monthly_spend': [
+                {
+                    'month': row['month'].strftime('%Y-%m'),
+                    'orders': row['orders'],
+                    'total_spent': row['total_spent']
+                }
+                for row in monthly_spend
+            ]
         }
-
-
-
-
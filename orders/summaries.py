@@ -0,0 +1,40 @@
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List
+
+from django.db.models import Count, Max, Q, Sum
+
+
+# Kept as a literal rather than Order.OrderStatus.COMPLETED so migrations can
+# use this module with historical models.
+COMPLETED_STATUS = 'COMPLETED'
+
+SUMMARY_FIELDS = [
+    'total_orders', 'completed_orders', 'total_spent', 'last_order_at', 'updated_at'
+]
+
+
+def aggregate_order_summaries(orders) -> Iterable[Dict[str, Any]]:
+    """
+    One row of summary totals per customer in ``orders``. Shared by the
+    rebuild command and the backfill migration so both agree with the
+    incremental updates made at purchase time.
+    """
+    return orders.order_by().values('customer_id').annotate(
+        total_orders=Count('id'),
+        completed_orders=Count('id', filter=Q(status=COMPLETED_STATUS)),
+        total_spent=Sum('total_price'),
+        last_order_at=Max('created_at')
+    )
+
+
+def build_order_summaries(summary_model, rows) -> List[Any]:
+    return [
+        summary_model(
+            customer_id=row['customer_id'],
+            total_orders=row['total_orders'],
+            completed_orders=row['completed_orders'],
+            total_spent=row['total_spent'] or Decimal('0.00'),
+            last_order_at=row['last_order_at']
+        )
+        for row in rows
+    ]
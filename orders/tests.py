@@ -1,3 +1,325 @@
-from django.test import TestCase
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from orders.models import Order
+from orders.services import PurchaseService
+from products.models import Product
+from wallet.models import Transaction
+from wallet.services import WalletService
+
+
+User = get_user_model()
+
+
+class OrderStatisticsQueryCountTest(TestCase):
+    """
+    Statistics are read from the customer's summary row and the breakdown
+    from grouped aggregates, so the number of queries must not grow with
+    the number of orders.
+    """
+    
+    def setUp(self):
+        self.customer = User.objects.create_user(
+            username='stats_customer',
+            email='stats_customer@example.com',
+            password='testpass123'
+        )
+        self.products = [
+            Product.objects.create(
+                name=f'Stats Product {idx}',
+                price=Decimal('10.00') + idx,
+                stock_quantity=1000
+            )
+            for idx in range(3)
+        ]
+    
+    def _add_orders(self, count: int) -> None:
+        orders = Order.objects.bulk_create([
+            Order(
+                customer=self.customer,
+                product=self.products[idx % len(self.products)],
+                quantity=1,
+                unit_price=self.products[idx % len(self.products)].price,
+                total_price=self.products[idx % len(self.products)].price,
+                status=(
+                    Order.OrderStatus.FAILED if idx % 5 == 0
+                    else Order.OrderStatus.COMPLETED
+                )
+            )
+            for idx in range(count)
+        ])
+        PurchaseService.record_orders_in_summary(self.customer, orders)
+    
+    def _count_queries(self, include_breakdown: bool) -> int:
+        with CaptureQueriesContext(connection) as queries:
+            PurchaseService.get_order_statistics(
+                self.customer,
+                include_breakdown=include_breakdown
+            )
+        return len(queries)
+    
+    def test_summary_query_count_is_constant(self):
+        self._add_orders(5)
+        small = self._count_queries(include_breakdown=False)
+        
+        self._add_orders(200)
+        self.assertEqual(self._count_queries(include_breakdown=False), small)
+        self.assertEqual(small, 1)
+    
+    def test_breakdown_query_count_is_constant(self):
+        self._add_orders(5)
+        small = self._count_queries(include_breakdown=True)
+        
+        self._add_orders(200)
+        self.assertEqual(self._count_queries(include_breakdown=True), small)
+    
+    def test_breakdown_matches_orders(self):
+        self._add_orders(50)
+        statistics = PurchaseService.get_order_statistics(
+            self.customer,
+            include_breakdown=True
+        )
+        orders = Order.objects.filter(customer=self.customer)
+        
+        self.assertEqual(statistics['total_orders'], 50)
+        self.assertEqual(
+            statistics['completed_orders'],
+            orders.filter(status=Order.OrderStatus.COMPLETED).count()
+        )
+        self.assertEqual(
+            statistics['by_status'][Order.OrderStatus.FAILED]['orders'],
+            orders.filter(status=Order.OrderStatus.FAILED).count()
+        )
+        self.assertEqual(
+            sum(row['quantity'] for row in statistics['top_products']),
+            50
+        )
+
+
+class OrderAdminStatusChangeTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='orders_admin',
+            email='orders_admin@example.com',
+            password='testpass123',
+            role='ADMIN'
+        )
+        self.customer = User.objects.create_user(
+            username='orders_customer',
+            email='orders_customer@example.com',
+            password='testpass123'
+        )
+        product = Product.objects.create(
+            name='Admin Status Product',
+            price=Decimal('5.00'),
+            stock_quantity=10
+        )
+        self.order = Order.objects.create(
+            customer=self.customer,
+            product=product,
+            quantity=1,
+            unit_price=product.price,
+            total_price=product.price
+        )
+        PurchaseService.record_orders_in_summary(self.customer, [self.order])
+        self.client.force_login(self.admin)
+    
+    def _set_status(self, status: str) -> None:
+        response = self.client.post(
+            f'/admin/orders/order/{self.order.pk}/change/',
+            {'status': status, '_save': 'Save'}
+        )
+        self.assertEqual(response.status_code, 302)
+    
+    def _completed_orders(self) -> int:
+        return PurchaseService.get_order_statistics(self.customer)['completed_orders']
+    
+    def test_status_edits_update_completed_count(self):
+        self.assertEqual(self._completed_orders(), 1)
+        
+        self._set_status(Order.OrderStatus.FAILED)
+        self.assertEqual(self._completed_orders(), 0)
+        
+        self._set_status(Order.OrderStatus.PENDING)
+        self.assertEqual(self._completed_orders(), 0)
+        
+        self._set_status(Order.OrderStatus.COMPLETED)
+        self.assertEqual(self._completed_orders(), 1)
+
+
+class PurchaseRollbackTest(TestCase):
+    """
+    A purchase that fails for stock or funds must leave stock, balance,
+    orders and the ledger exactly as they were, under either engine.
+    """
+    
+    def setUp(self):
+        self.customer = User.objects.create_user(
+            username='purchase_customer',
+            email='purchase_customer@example.com',
+            password='testpass123'
+        )
+        WalletService.credit_wallet(self.customer, Decimal('50.00'))
+        self.product = Product.objects.create(
+            name='Rollback Product',
+            price=Decimal('20.00'),
+            stock_quantity=5
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.customer)
+    
+    def _purchase(self, quantity: int):
+        return self.client.post(
+            '/api/orders/purchase/',
+            {'product_id': self.product.id, 'quantity': quantity},
+            format='json'
+        )
+    
+    def _assert_untouched(self):
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.stock_quantity, 5)
+        self.assertEqual(WalletService.get_wallet(self.customer).balance, Decimal('50.00'))
+        self.assertFalse(Order.objects.filter(customer=self.customer).exists())
+        self.assertEqual(
+            Transaction.objects.filter(wallet__user=self.customer).count(), 1
+        )
+    
+    def test_insufficient_funds_rolls_back(self):
+        for engine in ['locking', 'conditional']:
+            with self.subTest(engine=engine), override_settings(PURCHASE_ENGINE=engine):
+                response = self._purchase(3)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()['message'], 'Insufficient wallet balance')
+                self._assert_untouched()
+    
+    def test_insufficient_stock_rolls_back(self):
+        for engine in ['locking', 'conditional']:
+            with self.subTest(engine=engine), override_settings(PURCHASE_ENGINE=engine):
+                response = self._purchase(6)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json()['message'], 'Insufficient stock')
+                self._assert_untouched()
+    
+    @override_settings(PURCHASE_ENGINE='conditional')
+    def test_conditional_stock_race_rolls_back_debit(self):
+        # Another purchase takes the last units after the pre-check, so the
+        # guarded stock UPDATE matches no row and the debit must be undone.
+        record_orders = PurchaseService.record_orders_in_summary
+        
+        def sell_out(customer, orders):
+            record_orders(customer, orders)
+            Product.objects.filter(id=self.product.id).update(stock_quantity=0)
+        
+        with mock.patch.object(PurchaseService, 'record_orders_in_summary', side_effect=sell_out):
+            response = self._purchase(2)
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(WalletService.get_wallet(self.customer).balance, Decimal('50.00'))
+        self.assertFalse(Order.objects.filter(customer=self.customer).exists())
+        self.assertEqual(
+            Transaction.objects.filter(wallet__user=self.customer).count(), 1
+        )
+    
+    def test_successful_purchase_debits_and_decrements(self):
+        for engine in ['locking', 'conditional']:
+            with self.subTest(engine=engine), override_settings(PURCHASE_ENGINE=engine):
+                before = WalletService.get_wallet(self.customer).balance
+                stock = Product.objects.get(id=self.product.id).stock_quantity
+                
+                response = self._purchase(1)
+                
+                self.assertEqual(response.status_code, 201)
+                self.assertEqual(
+                    WalletService.get_wallet(self.customer).balance,
+                    before - Decimal('20.00')
+                )
+                self.assertEqual(
+                    Product.objects.get(id=self.product.id).stock_quantity,
+                    stock - 1
+                )
+
+
+class CheckoutRollbackTest(TestCase):
+    """
+    A checkout is all or nothing: one short line or a short wallet fails
+    every line, and a success writes one order per line and one debit.
+    """
+    
+    def setUp(self):
+        self.customer = User.objects.create_user(
+            username='checkout_customer',
+            email='checkout_customer@example.com',
+            password='testpass123'
+        )
+        WalletService.credit_wallet(self.customer, Decimal('100.00'))
+        self.products = [
+            Product.objects.create(
+                name=f'Checkout Product {idx}',
+                price=Decimal('10.00'),
+                stock_quantity=3
+            )
+            for idx in range(2)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.customer)
+    
+    def _checkout(self, quantities):
+        return self.client.post(
+            '/api/orders/checkout/',
+            {
+                'items': [
+                    {'product_id': product.id, 'quantity': quantity}
+                    for product, quantity in zip(self.products, quantities)
+                ]
+            },
+            format='json'
+        )
+    
+    def _assert_untouched(self, balance: Decimal = Decimal('100.00')):
+        self.assertEqual(
+            [Product.objects.get(id=product.id).stock_quantity for product in self.products],
+            [3, 3]
+        )
+        self.assertEqual(WalletService.get_wallet(self.customer).balance, balance)
+        self.assertFalse(Order.objects.filter(customer=self.customer).exists())
+    
+    def test_insufficient_stock_on_one_line_rolls_back(self):
+        response = self._checkout([2, 4])
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['message'], 'Insufficient stock')
+        self._assert_untouched()
+    
+    def test_insufficient_funds_rolls_back(self):
+        WalletService.debit_wallet(self.customer, Decimal('60.00'))
+        
+        response = self._checkout([3, 2])
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['message'], 'Insufficient wallet balance')
+        self._assert_untouched(balance=Decimal('40.00'))
+    
+    def test_checkout_writes_every_line_with_one_debit(self):
+        response = self._checkout([2, 1])
+        
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['data']['total_amount'], '30.00')
+        self.assertEqual(
+            [Product.objects.get(id=product.id).stock_quantity for product in self.products],
+            [1, 2]
+        )
+        self.assertEqual(WalletService.get_wallet(self.customer).balance, Decimal('70.00'))
+        self.assertEqual(Order.objects.filter(customer=self.customer).count(), 2)
+        self.assertEqual(
+            Transaction.objects.filter(
+                wallet__user=self.customer,
+                transaction_type=Transaction.TransactionType.DEBIT
+            ).count(),
+            1
+        )
@@ -1,12 +1,16 @@
 from django.urls import path
 from .views import (
     CreatePurchaseView,
+    CheckoutView,
+    OrderStatisticsView,
 )
 
 app_name = 'orders'
 
 urlpatterns = [
     path('purchase/', CreatePurchaseView.as_view(), name='create_purchase'),
+    path('checkout/', CheckoutView.as_view(), name='checkout'),
+    path('statistics/', OrderStatisticsView.as_view(), name='order_statistics'),
 ]
 
 
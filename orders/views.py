@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -6,12 +7,16 @@ from rest_framework.permissions import IsAuthenticated
 from .serializers import (
     OrderDetailSerializer,
     CreatePurchaseSerializer,
+    CheckoutSerializer,
+    OrderStatisticsSerializer,
 )
 from .services import PurchaseService
 from wallet.serializers import TransactionSerializer
 from users.permissions import IsCustomer
+from core.idempotency import IdempotentRequestMixin
 from core.utils import create_success_response, create_error_response
 from core.exceptions import (
+    IdempotencyConflictError,
     InsufficientBalanceError,
     StockUnavailableError,
     ProductNotFoundError,
@@ -19,10 +24,15 @@ from core.exceptions import (
 )
 
 
-class CreatePurchaseView(APIView):
+class CreatePurchaseView(IdempotentRequestMixin, APIView):
     permission_classes = [IsAuthenticated, IsCustomer]
+    idempotency_scope = 'orders.purchase'
     
     def post(self, request):
+        replay = self.get_idempotent_replay(request)
+        if replay is not None:
+            return replay
+        
         serializer = CreatePurchaseSerializer(data=request.data)
         
         if not serializer.is_valid():
@@ -35,22 +45,99 @@ class CreatePurchaseView(APIView):
             )
         
         try:
-            purchase_result = PurchaseService.create_purchase(
+            with transaction.atomic():
+                purchase_result = PurchaseService.create_purchase(
+                    customer=request.user,
+                    product_id=serializer.validated_data['product_id'],
+                    quantity=serializer.validated_data['quantity']
+                )
+                
+                response_data = {
+                    'order': OrderDetailSerializer(purchase_result['order']).data,
+                    'transaction': TransactionSerializer(purchase_result['transaction']).data,
+                    'total_amount': str(purchase_result['total_amount']),
+                    'remaining_balance': str(purchase_result['remaining_balance'])
+                }
+                response_body = create_success_response(
+                    message='Purchase completed successfully',
+                    data=response_data
+                )
+                self.remember_idempotent_response(
+                    request, status.HTTP_201_CREATED, response_body
+                )
+            
+            return Response(response_body, status=status.HTTP_201_CREATED)
+            
+        except IdempotencyConflictError:
+            return self.idempotency_conflict_response(request)
+        except ProductNotFoundError as e:
+            return Response(
+                create_error_response(str(e.detail)),
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except StockUnavailableError as e:
+            return Response(
+                create_error_response(
+                    message='Insufficient stock',
+                    errors=e.detail
+                ),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except InsufficientBalanceError as e:
+            return Response(
+                create_error_response(
+                    message='Insufficient wallet balance',
+                    errors=e.detail
+                ),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except InvalidTransactionError as e:
+            return Response(
+                create_error_response(str(e)),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return Response(
+                create_error_response(
+                    message='Purchase failed',
+                    errors=str(e)
+                ),
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+
+class CheckoutView(APIView):
+    permission_classes = [IsAuthenticated, IsCustomer]
+    
+    def post(self, request):
+        serializer = CheckoutSerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return Response(
+                create_error_response(
+                    message='Invalid checkout data',
+                    errors=serializer.errors
+                ),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            checkout_result = PurchaseService.create_checkout(
                 customer=request.user,
-                product_id=serializer.validated_data['product_id'],
-                quantity=serializer.validated_data['quantity']
+                items=serializer.validated_data['items']
             )
             
             response_data = {
-                'order': OrderDetailSerializer(purchase_result['order']).data,
-                'transaction': TransactionSerializer(purchase_result['transaction']).data,
-                'total_amount': str(purchase_result['total_amount']),
-                'remaining_balance': str(purchase_result['remaining_balance'])
+                'orders': OrderDetailSerializer(checkout_result['orders'], many=True).data,
+                'transaction': TransactionSerializer(checkout_result['transaction']).data,
+                'total_amount': str(checkout_result['total_amount']),
+                'remaining_balance': str(checkout_result['remaining_balance'])
             }
             
             return Response(
                 create_success_response(
-                    message='Purchase completed successfully',
+                    message='Checkout completed successfully',
                     data=response_data
                 ),
                 status=status.HTTP_201_CREATED
@@ -85,8 +172,25 @@ class CreatePurchaseView(APIView):
         except Exception as e:
             return Response(
                 create_error_response(
-                    message='Purchase failed',
+                    message='Checkout failed',
                     errors=str(e)
                 ),
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class OrderStatisticsView(APIView):
+    permission_classes = [IsAuthenticated, IsCustomer]
+    
+    def get(self, request):
+        statistics = PurchaseService.get_order_statistics(
+            request.user,
+            include_breakdown=request.query_params.get('detailed') == 'true'
+        )
+        
+        return Response(
+            create_success_response(
+                message='Order statistics retrieved successfully',
+                data=OrderStatisticsSerializer(statistics).data
+            )
+        )
@@ -1,5 +1,26 @@
 from django.contrib import admin
-from .models import Product
+from .models import Product, StockAlert
+
+
+class StockStatusFilter(admin.SimpleListFilter):
+    title = 'stock status'
+    parameter_name = 'stock_status'
+    
+    def lookups(self, request, model_admin):
+        return [
+            ('in_stock', 'In stock'),
+            ('low_stock', 'Low stock'),
+            ('out_of_stock', 'Out of stock'),
+        ]
+    
+    def queryset(self, request, queryset):
+        if self.value() == 'in_stock':
+            return queryset.in_stock()
+        if self.value() == 'low_stock':
+            return queryset.low_stock()
+        if self.value() == 'out_of_stock':
+            return queryset.out_of_stock()
+        return queryset
 
 
 @admin.register(Product)
@@ -8,7 +29,7 @@ class ProductAdmin(admin.ModelAdmin):
         'id', 'name', 'price', 'stock_quantity',
         'is_in_stock', 'is_low_stock', 'created_at'
     ]
-    list_filter = ['created_at', 'updated_at']
+    list_filter = [StockStatusFilter, 'created_at', 'updated_at']
     search_fields = ['name', 'description']
     readonly_fields = ['created_at', 'updated_at', 'is_in_stock', 'is_low_stock']
     ordering = ['-created_at']
@@ -39,3 +60,19 @@ class ProductAdmin(admin.ModelAdmin):
         return obj.is_low_stock
     is_low_stock.boolean = True
     is_low_stock.short_description = 'Low Stock'
+
+
+@admin.register(StockAlert)
+class StockAlertAdmin(admin.ModelAdmin):
+    list_display = [
+        'id', 'product', 'alert_type', 'previous_quantity',
+        'stock_quantity', 'threshold', 'created_at'
+    ]
+    list_filter = ['alert_type', 'created_at']
+    search_fields = ['product__name']
+    list_select_related = ['product']
+    readonly_fields = [
+        'product', 'alert_type', 'previous_quantity',
+        'stock_quantity', 'threshold', 'created_at'
+    ]
+    ordering = ['-id']
@@ -0,0 +1,119 @@
+import hashlib
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+
+CATALOG_CACHE_ALIAS = 'catalog'
+VERSION_KEY = 'catalog:version'
+
+
+class CatalogCache:
+    """
+    Response cache for catalog reads, keyed by a catalog version.
+    
+    Every product write bumps the version in the ``catalog`` cache alias
+    once its transaction commits, so entries stored under an older version
+    are never served again and simply age out. Point the alias at a shared
+    backend (``REDIS_URL``) so bumps made by other workers and by
+    ``import_products`` are seen at once; with per-process local memory they
+    only show up as entries expire. ETags are a digest of the response
+    body, so a conditional GET never gets a 304 for content that changed,
+    whichever backend is used.
+    """
+    
+    @staticmethod
+    def is_enabled() -> bool:
+        return settings.CATALOG_CACHE_ENABLED
+    
+    @staticmethod
+    def get_version() -> int:
+        cache = caches[CATALOG_CACHE_ALIAS]
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            # Start from the clock rather than 1, so a version key that was
+            # evicted or lost on restart can't bring back entries stored
+            # under an earlier counter.
+            cache.add(VERSION_KEY, time.time_ns() // 1000, timeout=None)
+            version = cache.get(VERSION_KEY)
+        return version
+    
+    @staticmethod
+    def bump_version() -> None:
+        transaction.on_commit(CatalogCache._incr_version)
+    
+    @staticmethod
+    def _incr_version() -> None:
+        cache = caches[CATALOG_CACHE_ALIAS]
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            CatalogCache.get_version()
+    
+    @staticmethod
+    def make_etag(data: Any) -> str:
+        digest = hashlib.sha1(JSONRenderer().render(data)).hexdigest()[:32]
+        return f'"{digest}"'
+    
+    @staticmethod
+    def get_response(version: int, path: str) -> Optional[Tuple[str, Any]]:
+        return caches[CATALOG_CACHE_ALIAS].get(CatalogCache._response_key(version, path))
+    
+    @staticmethod
+    def set_response(version: int, path: str, etag: str, data: Any) -> None:
+        caches[CATALOG_CACHE_ALIAS].set(
+            CatalogCache._response_key(version, path), (etag, data)
+        )
+    
+    @staticmethod
+    def _response_key(version: int, path: str) -> str:
+        digest = hashlib.sha1(path.encode('utf-8')).hexdigest()
+        return f'catalog:response:{version}:{digest}'
+
+
+class CatalogCacheMixin:
+    """
+    Serves GET responses through ``CatalogCache``. Views wrap their normal
+    response building in ``cached_catalog_response``; a cache hit skips the
+    query and the serializer, and a matching ``If-None-Match`` gets a 304.
+    Only 200 responses are cached.
+    """
+    
+    def cached_catalog_response(
+        self,
+        request,
+        build_response: Callable[[], Response]
+    ) -> Response:
+        if not CatalogCache.is_enabled():
+            return build_response()
+        
+        version = CatalogCache.get_version()
+        path = request.get_full_path()
+        if_none_match = self._parse_if_none_match(request)
+        
+        cached = CatalogCache.get_response(version, path)
+        if cached is not None:
+            etag, data = cached
+            if etag in if_none_match:
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+            return Response(data, headers={'ETag': etag})
+        
+        response = build_response()
+        if response.status_code == status.HTTP_200_OK:
+            etag = CatalogCache.make_etag(response.data)
+            CatalogCache.set_response(version, path, etag, response.data)
+            if etag in if_none_match:
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+            response['ETag'] = etag
+        return response
+    
+    @staticmethod
+    def _parse_if_none_match(request) -> List[str]:
+        header = request.headers.get('If-None-Match', '')
+        return [tag.strip() for tag in header.split(',') if tag.strip()]
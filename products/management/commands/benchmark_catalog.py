@@ -0,0 +1,112 @@
+import statistics
+import time
+from decimal import Decimal
+from typing import Callable, List
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory
+
+from products.cache import CatalogCache
+from products.models import Product
+from products.validators import normalize_product_name
+from products.views import ProductDetailView, ProductListCreateView
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark product list/detail reads with and without the catalog cache'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--products',
+            type=int,
+            default=1000,
+            help='Number of products to generate (default: 1000)'
+        )
+        
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=2000,
+            help='Number of requests per scenario (default: 2000)'
+        )
+    
+    def handle(self, *args, **options):
+        iterations = options['requests']
+        factory = APIRequestFactory()
+        list_view = ProductListCreateView.as_view()
+        detail_view = ProductDetailView.as_view()
+        
+        self.stdout.write(self.style.SUCCESS('\n=== Catalog Cache Benchmark ==='))
+        self.stdout.write(
+            f"Products: {options['products']}, requests per scenario: {iterations}\n"
+        )
+        
+        try:
+            with transaction.atomic():
+                product_id = self._generate_products(options['products'])
+                list_path = '/api/products/?page=2'
+                detail_path = f'/api/products/{product_id}/'
+                
+                for label, view, path in [
+                    ('list', list_view, list_path),
+                    ('detail', detail_view, detail_path),
+                ]:
+                    kwargs = {'pk': product_id} if view is detail_view else {}
+                    
+                    def request(**headers):
+                        return view(factory.get(path, **headers), **kwargs)
+                    
+                    with override_settings(CATALOG_CACHE_ENABLED=False):
+                        self._report(f'{label} uncached', self._measure(request, iterations))
+                    
+                    etag = request()['ETag']
+                    self._report(f'{label} cached', self._measure(request, iterations))
+                    self._report(
+                        f'{label} 304',
+                        self._measure(lambda: request(HTTP_IF_NONE_MATCH=etag), iterations)
+                    )
+                
+                raise _Rollback()
+        except _Rollback:
+            pass
+        finally:
+            # Responses cached during the run describe rolled-back products.
+            CatalogCache.bump_version()
+        
+        self.stdout.write('')
+    
+    def _generate_products(self, count: int) -> int:
+        products = [
+            Product(
+                name=f'Catalog Benchmark {idx}',
+                normalized_name=normalize_product_name(f'Catalog Benchmark {idx}'),
+                description=f'Generated product number {idx}',
+                price=Decimal('9.99'),
+                stock_quantity=idx % 50
+            )
+            for idx in range(count)
+        ]
+        return Product.objects.bulk_create(products)[-1].id
+    
+    def _measure(self, func: Callable[[], object], iterations: int) -> List[float]:
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+    
+    def _report(self, label: str, timings: List[float]) -> None:
+        ordered = sorted(timings)
+        p50 = ordered[len(ordered) // 2]
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        self.stdout.write(
+            f"{label:<16} {1000 / statistics.mean(timings):10.0f} req/sec   "
+            f"p50 {p50:8.3f} ms   p99 {p99:8.3f} ms"
+        )
@@ -0,0 +1,217 @@
+import csv
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List, Optional
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from openpyxl import Workbook
+
+from products.management.commands.import_products import ProductImporter
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark product import throughput on generated product files'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=20000,
+            help='Number of rows in the generated workbook (default: 20000)'
+        )
+        
+        parser.add_argument(
+            '--batch-sizes',
+            type=str,
+            default='0,1000',
+            help='Comma-separated batch sizes to compare, 0 = per-row (default: 0,1000)'
+        )
+        
+        parser.add_argument(
+            '--formats',
+            type=str,
+            default='xlsx',
+            help=(
+                'Comma-separated input formats to compare with the last batch size: '
+                'xlsx, csv, jsonl (default: xlsx)'
+            )
+        )
+        
+        parser.add_argument(
+            '--workers',
+            type=str,
+            default='1',
+            help=(
+                'Comma-separated validation worker counts to compare with the '
+                'last batch size, e.g. 1,2,4,8 (default: 1)'
+            )
+        )
+        
+        parser.add_argument(
+            '--delta',
+            action='store_true',
+            help=(
+                'Add runs that re-import the same file into a populated catalog, '
+                'with and without --delta'
+            )
+        )
+        
+        parser.add_argument(
+            '--memory',
+            action='store_true',
+            help=(
+                'Trace peak Python memory per run and add a run that materializes '
+                'all rows before importing (slower)'
+            )
+        )
+    
+    def handle(self, *args, **options):
+        batch_sizes = [int(size) for size in options['batch_sizes'].split(',')]
+        worker_counts = [int(count) for count in options['workers'].split(',')]
+        formats = [fmt.strip().lower() for fmt in options['formats'].split(',') if fmt.strip()]
+        unknown_formats = set(formats) - {'xlsx', 'csv', 'jsonl'}
+        if unknown_formats:
+            raise CommandError(f"Unsupported formats: {', '.join(sorted(unknown_formats))}")
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir) / 'products.xlsx'
+            self._generate_workbook(file_path, options['rows'])
+            
+            format_paths = {}
+            for fmt in formats:
+                if fmt != 'xlsx':
+                    format_paths[fmt] = Path(tmp_dir) / f'products.{fmt}'
+                    self._generate_text_file(format_paths[fmt], options['rows'], fmt)
+            
+            self.stdout.write(
+                self.style.SUCCESS('\n=== Product Import Benchmark ===')
+            )
+            self.stdout.write(f"Rows: {options['rows']}\n")
+            
+            runs = [
+                (
+                    'per-row' if batch_size <= 0 else f'batch {batch_size}',
+                    file_path, batch_size, 1, False, None
+                )
+                for batch_size in batch_sizes
+            ]
+            runs.extend(
+                (f'{workers} workers', file_path, batch_sizes[-1], workers, False, None)
+                for workers in worker_counts if workers > 1
+            )
+            runs.extend(
+                (f'{fmt} batch {batch_sizes[-1]}', path, batch_sizes[-1], 1, False, None)
+                for fmt, path in format_paths.items()
+            )
+            if options['delta']:
+                runs.extend(
+                    (label, file_path, batch_sizes[-1], 1, False, delta)
+                    for label, delta in [('re-import full', False), ('re-import delta', True)]
+                )
+            if options['memory']:
+                runs.append(
+                    (f'materialized {batch_sizes[-1]}', file_path, batch_sizes[-1], 1, True, None)
+                )
+            
+            for label, path, batch_size, workers, materialize, delta in runs:
+                elapsed, stats, peak = self._run_import(
+                    path, batch_size, workers, materialize, options['memory'], delta
+                )
+                line = (
+                    f"{label:<18} {elapsed:8.2f}s  "
+                    f"{stats['total'] / elapsed if elapsed else 0:10.0f} rows/sec  "
+                    f"(created {stats['created']}, updated {stats['updated']}, "
+                    f"unchanged {stats['unchanged']}, failed {stats['failed']})"
+                )
+                if peak is not None:
+                    line += f"  peak {peak / (1024 * 1024):8.1f} MiB"
+                self.stdout.write(line)
+        
+        self.stdout.write('')
+    
+    def _generate_workbook(self, file_path: Path, rows: int) -> None:
+        rng = random.Random(42)
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet()
+        worksheet.append(['name', 'description', 'price', 'stock_quantity'])
+        
+        for idx in range(rows):
+            worksheet.append([
+                f'Benchmark Product {idx}',
+                f'Generated product number {idx}',
+                round(rng.uniform(1, 5000), 2),
+                rng.randint(0, 500)
+            ])
+        
+        workbook.save(file_path)
+    
+    def _generate_text_file(self, file_path: Path, rows: int, fmt: str) -> None:
+        rng = random.Random(42)
+        
+        with open(file_path, 'w', newline='', encoding='utf-8') as output:
+            writer = csv.writer(output) if fmt == 'csv' else None
+            if writer:
+                writer.writerow(['name', 'description', 'price', 'stock_quantity'])
+            
+            for idx in range(rows):
+                row = [
+                    f'Benchmark Product {idx}',
+                    f'Generated product number {idx}',
+                    round(rng.uniform(1, 5000), 2),
+                    rng.randint(0, 500)
+                ]
+                if writer:
+                    writer.writerow(row)
+                else:
+                    output.write(json.dumps(dict(zip(
+                        ['name', 'description', 'price', 'stock_quantity'], row
+                    ))) + '\n')
+    
+    def _run_import(
+        self,
+        file_path: Path,
+        batch_size: int,
+        workers: int,
+        materialize: bool,
+        trace_memory: bool,
+        delta: Optional[bool] = None
+    ):
+        # Each run is rolled back so every mode starts from the same catalog.
+        # Re-import runs (delta is not None) load the file once untimed first.
+        importer = ProductImporter(
+            str(file_path), batch_size=batch_size, workers=workers, delta=bool(delta)
+        )
+        peak = None
+        
+        try:
+            with transaction.atomic():
+                if delta is not None:
+                    seed = ProductImporter(str(file_path), batch_size=batch_size)
+                    seed.import_products(seed.iter_rows())
+                
+                if trace_memory:
+                    tracemalloc.start()
+                started = time.perf_counter()
+                rows = importer.iter_rows()
+                if materialize:
+                    rows = list(rows)
+                stats = importer.import_products(rows)
+                elapsed = time.perf_counter() - started
+                raise _Rollback()
+        except _Rollback:
+            pass
+        finally:
+            if trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+        
+        return elapsed, stats, peak
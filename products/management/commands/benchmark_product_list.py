@@ -0,0 +1,100 @@
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from products.models import Product
+from products.serializers import FastProductListSerializer, ProductListSerializer
+from products.validators import normalize_product_name
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark ProductListSerializer against the .values() fast list path'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-sizes',
+            type=str,
+            default='1000,10000,100000',
+            help='Comma-separated page sizes to serialize (default: 1000,10000,100000)'
+        )
+        
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Runs per page size; the fastest is reported (default: 3)'
+        )
+    
+    def handle(self, *args, **options):
+        page_sizes = [int(size) for size in options['page_sizes'].split(',')]
+        renderer = JSONRenderer()
+        
+        self.stdout.write(self.style.SUCCESS('\n=== Product List Serialization Benchmark ==='))
+        
+        try:
+            with transaction.atomic():
+                self._generate_products(max(page_sizes))
+                queryset = Product.objects.order_by('-created_at', 'id')
+                
+                for page_size in page_sizes:
+                    serializer_time, serializer_data = self._best_of(
+                        options['repeat'],
+                        lambda: ProductListSerializer(
+                            list(queryset[:page_size]), many=True
+                        ).data
+                    )
+                    fast_time, fast_data = self._best_of(
+                        options['repeat'],
+                        lambda: FastProductListSerializer.to_representation(
+                            list(FastProductListSerializer.get_queryset(queryset)[:page_size])
+                        )
+                    )
+                    
+                    if renderer.render(serializer_data) != renderer.render(fast_data):
+                        raise CommandError(f'Fast path output differs for page size {page_size}')
+                    
+                    self.stdout.write(
+                        f"{page_size:>7} rows   "
+                        f"serializer {page_size / serializer_time:10.0f} rows/sec   "
+                        f"fast {page_size / fast_time:10.0f} rows/sec   "
+                        f"({serializer_time / fast_time:.1f}x)"
+                    )
+                
+                raise _Rollback()
+        except _Rollback:
+            pass
+        
+        self.stdout.write(self.style.SUCCESS('[OK] Output was byte-identical for every page size\n'))
+    
+    def _generate_products(self, count: int) -> None:
+        self.stdout.write(f'Generating {count} products...\n')
+        batch_size = 5000
+        
+        for start in range(0, count, batch_size):
+            Product.objects.bulk_create([
+                Product(
+                    name=f'List Benchmark {idx}',
+                    normalized_name=normalize_product_name(f'List Benchmark {idx}'),
+                    description=f'Generated product number {idx}',
+                    price=Decimal('0.99') + idx % 1000,
+                    stock_quantity=idx % 7
+                )
+                for idx in range(start, min(start + batch_size, count))
+            ])
+    
+    def _best_of(self, repeat: int, func):
+        best = None
+        result = None
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
@@ -0,0 +1,113 @@
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+
+from products.models import Product
+from products.search import ProductSearchIndex
+from products.services import ProductService
+from products.validators import normalize_product_name
+
+
+WORDS = [
+    'wireless', 'bluetooth', 'portable', 'premium', 'compact', 'ergonomic',
+    'stainless', 'organic', 'leather', 'cotton', 'smart', 'digital', 'vintage',
+    'gaming', 'kitchen', 'garden', 'office', 'travel', 'outdoor', 'classic',
+    'speaker', 'headphones', 'keyboard', 'mouse', 'bottle', 'backpack', 'lamp',
+    'charger', 'blender', 'watch', 'camera', 'jacket', 'shoes', 'notebook',
+]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Benchmark icontains vs full-text product search on generated products'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--products',
+            type=int,
+            default=500000,
+            help='Number of products to generate (default: 500000)'
+        )
+        
+        parser.add_argument(
+            '--queries',
+            type=int,
+            default=20,
+            help='Number of search queries per mode (default: 20)'
+        )
+    
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        query_sets = {
+            'common word': [
+                rng.choice(WORDS)[:rng.randint(4, 6)] for _ in range(options['queries'])
+            ],
+            'selective': [
+                f"{rng.choice(WORDS)} {rng.randrange(options['products'])}"
+                for _ in range(options['queries'])
+            ],
+        }
+        
+        self.stdout.write(
+            self.style.SUCCESS('\n=== Product Search Benchmark ===')
+        )
+        
+        # Everything runs in one transaction that is rolled back at the end,
+        # so the generated catalog never outlives the benchmark.
+        try:
+            with transaction.atomic():
+                self._generate_products(options['products'], rng)
+                
+                for mode in ['basic', 'fulltext']:
+                    with override_settings(PRODUCT_SEARCH_BACKEND=mode):
+                        if mode == 'fulltext' and not ProductSearchIndex.is_enabled():
+                            self.stdout.write(
+                                self.style.WARNING('Full-text index not available, skipping')
+                            )
+                            continue
+                        for label, queries in query_sets.items():
+                            self._run_queries(mode, label, queries)
+                
+                raise _Rollback()
+        except _Rollback:
+            pass
+        
+        self.stdout.write('')
+    
+    def _generate_products(self, count: int, rng: random.Random) -> None:
+        self.stdout.write(f'Generating {count} products...')
+        batch_size = 5000
+        
+        for start in range(0, count, batch_size):
+            products = []
+            for idx in range(start, min(start + batch_size, count)):
+                words = rng.sample(WORDS, 3)
+                name = f"{' '.join(words).title()} {idx}"
+                products.append(Product(
+                    name=name,
+                    normalized_name=normalize_product_name(name),
+                    description=' '.join(rng.choices(WORDS, k=20)),
+                    price=Decimal('9.99'),
+                    stock_quantity=10
+                ))
+            ProductSearchIndex.index_products(Product.objects.bulk_create(products))
+        
+        self.stdout.write(self.style.SUCCESS('[OK] Products generated\n'))
+    
+    def _run_queries(self, mode: str, label: str, queries) -> None:
+        started = time.perf_counter()
+        for query in queries:
+            list(ProductService.get_all_products(search=query)[:10])
+        elapsed = time.perf_counter() - started
+        
+        self.stdout.write(
+            f"{mode:<10} {label:<12} {elapsed / len(queries) * 1000:10.2f} ms/query "
+            f"(first page of 10)"
+        )
@@ -0,0 +1,103 @@
+import sys
+import time
+from pathlib import Path
+from typing import Any, Iterator, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.streaming import EXPORT_FORMATS, iter_export
+from products.services import EXPORT_FIELDS, ProductService
+
+
+class Command(BaseCommand):
+    help = 'Stream the full product catalog to a CSV or JSONL file'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output',
+            type=str,
+            help=(
+                'Output file, or - for stdout. The format and compression are taken '
+                'from the extension (.csv, .jsonl, optionally .gz) unless given'
+            )
+        )
+        
+        parser.add_argument(
+            '--file-format',
+            choices=sorted(EXPORT_FORMATS),
+            help='Output format (default: from the extension, else csv)'
+        )
+        
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Gzip the output (implied by a .gz extension)'
+        )
+        
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Rows fetched from the database per round trip (default: 2000)'
+        )
+    
+    def handle(self, *args, **options):
+        output = options['output']
+        file_format, compress = self._resolve_format(output, options)
+        to_stdout = output == '-'
+        
+        counted_rows = _CountingIterator(
+            ProductService.iter_export_rows(chunk_size=options['chunk_size'])
+        )
+        chunks = iter_export(file_format, EXPORT_FIELDS, counted_rows, compress=compress)
+        started = time.perf_counter()
+        
+        try:
+            if to_stdout:
+                for chunk in chunks:
+                    sys.stdout.buffer.write(chunk)
+                sys.stdout.buffer.flush()
+            else:
+                with open(output, 'wb') as output_file:
+                    for chunk in chunks:
+                        output_file.write(chunk)
+        except OSError as e:
+            raise CommandError(f"Failed to write export: {str(e)}")
+        
+        elapsed = time.perf_counter() - started
+        summary = (
+            f"[OK] Exported {counted_rows.count} products to {output} "
+            f"({file_format}{', gzip' if compress else ''}) in {elapsed:.2f}s "
+            f"({counted_rows.count / elapsed if elapsed else 0:.0f} rows/sec)"
+        )
+        # Keep stdout clean for the data when streaming to it.
+        (self.stderr if to_stdout else self.stdout).write(self.style.SUCCESS(summary))
+    
+    def _resolve_format(self, output: str, options: dict) -> Tuple[str, bool]:
+        suffixes = [suffix.lower() for suffix in Path(output).suffixes]
+        compress = options['gzip'] or (suffixes[-1:] == ['.gz'])
+        if suffixes[-1:] == ['.gz']:
+            suffixes = suffixes[:-1]
+        
+        file_format = options['file_format']
+        if file_format is None:
+            extension = suffixes[-1].lstrip('.') if suffixes else 'csv'
+            if extension not in EXPORT_FORMATS:
+                raise CommandError(
+                    f"Cannot infer format from '{output}'; pass --file-format "
+                    f"({', '.join(sorted(EXPORT_FORMATS))})"
+                )
+            file_format = extension
+        
+        return file_format, compress
+
+
+class _CountingIterator:
+    def __init__(self, rows: Iterator[Any]):
+        self.rows = rows
+        self.count = 0
+    
+    def __iter__(self):
+        for row in self.rows:
+            self.count += 1
+            yield row
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from products.search import ProductSearchIndex
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the product full-text search index'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=5000,
+            help='Number of products indexed per batch (default: 5000)'
+        )
+    
+    def handle(self, *args, **options):
+        if connection.vendor == 'postgresql':
+            self.stdout.write(
+                'PostgreSQL search uses trigram indexes on the products table; '
+                'nothing to rebuild.'
+            )
+            return
+        
+        if not ProductSearchIndex.is_enabled():
+            self.stdout.write(
+                self.style.WARNING(
+                    'Full-text search is not available (PRODUCT_SEARCH_BACKEND is not '
+                    "'fulltext', or the database has no FTS5 index)."
+                )
+            )
+            return
+        
+        indexed = ProductSearchIndex.rebuild(chunk_size=options['chunk_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'[OK] Indexed {indexed} products')
+        )
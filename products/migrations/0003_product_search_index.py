@@ -0,0 +1,52 @@
+from django.db import DatabaseError, migrations
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    
+    if vendor == 'sqlite':
+        try:
+            schema_editor.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS products_fts "
+                "USING fts5(name, description, tokenize='unicode61')"
+            )
+        except DatabaseError:
+            # SQLite built without FTS5: search falls back to icontains.
+            return
+        schema_editor.execute(
+            "INSERT INTO products_fts (rowid, name, description) "
+            "SELECT id, name, description FROM products"
+        )
+    
+    elif vendor == 'postgresql':
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS products_name_trgm_idx "
+            "ON products USING gin (UPPER(name::text) gin_trgm_ops)"
+        )
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS products_description_trgm_idx "
+            "ON products USING gin (UPPER(description::text) gin_trgm_ops)"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    
+    if vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS products_fts")
+    
+    elif vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS products_name_trgm_idx")
+        schema_editor.execute("DROP INDEX IF EXISTS products_description_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_rename_products_pr_name_9ff0a3_idx_products_name_6f9890_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
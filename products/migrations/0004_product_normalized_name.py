@@ -0,0 +1,57 @@
+# Generated by Django 4.2.30 on 2026-10-18 00:07
+
+from django.db import migrations, models
+
+
+def populate_normalized_name(apps, schema_editor):
+    """
+    Fill normalized_name for existing products. Names that only differ in
+    case or surrounding whitespace would violate the new unique index, so the
+    migration stops and lists them instead of picking new names itself;
+    rename or merge those products and run it again.
+    """
+    Product = apps.get_model('products', 'Product')
+    groups = {}
+    to_update = []
+    
+    for product in Product.objects.order_by('id').only('id', 'name').iterator(chunk_size=2000):
+        product.normalized_name = product.name.strip().casefold()
+        groups.setdefault(product.normalized_name, []).append((product.id, product.name))
+        to_update.append(product)
+        if len(to_update) >= 2000:
+            Product.objects.bulk_update(to_update, ['normalized_name'])
+            to_update = []
+    
+    conflicts = [group for group in groups.values() if len(group) > 1]
+    if conflicts:
+        lines = '\n'.join(
+            '  ' + ', '.join(f'#{product_id} {name!r}' for product_id, name in group)
+            for group in conflicts
+        )
+        raise RuntimeError(
+            f"{len(conflicts)} groups of products have names that differ only in "
+            f"case or whitespace. Rename or merge them, then migrate again:\n{lines}"
+        )
+    
+    Product.objects.bulk_update(to_update, ['normalized_name'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_product_search_index'),
+    ]
+    
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='normalized_name',
+            field=models.CharField(editable=False, max_length=255, null=True),
+        ),
+        migrations.RunPython(populate_normalized_name, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='product',
+            name='normalized_name',
+            field=models.CharField(editable=False, max_length=255, unique=True),
+        ),
+    ]
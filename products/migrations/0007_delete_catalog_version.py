@@ -0,0 +1,16 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:06
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_catalog_version'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='CatalogVersion',
+        ),
+    ]
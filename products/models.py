@@ -1,10 +1,34 @@
+from django.conf import settings
 from django.db import models
+from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 
+from .validators import normalize_product_name
+
+
+def get_low_stock_threshold() -> int:
+    return settings.LOW_STOCK_THRESHOLD
+
+
+class ProductQuerySet(models.QuerySet):
+    # All three filters are range scans on the (stock_quantity, id) index.
+    
+    def in_stock(self) -> 'ProductQuerySet':
+        return self.filter(stock_quantity__gt=0)
+    
+    def out_of_stock(self) -> 'ProductQuerySet':
+        return self.filter(stock_quantity__lte=0)
+    
+    def low_stock(self, threshold: int = None) -> 'ProductQuerySet':
+        if threshold is None:
+            threshold = get_low_stock_threshold()
+        return self.filter(stock_quantity__gt=0, stock_quantity__lt=threshold)
+
 
 class Product(models.Model):
     name = models.CharField(max_length=255)
+    normalized_name = models.CharField(max_length=255, unique=True, editable=False)
     description = models.TextField(blank=True)
     price = models.DecimalField(
         max_digits=10,
@@ -18,6 +42,8 @@ class Product(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = ProductQuerySet.as_manager()
+    
     class Meta:
         db_table = 'products'
         verbose_name = 'Product'
@@ -26,8 +52,24 @@ class Product(models.Model):
         indexes = [
             models.Index(fields=['name']),
             models.Index(fields=['-created_at']),
+            models.Index(fields=['stock_quantity', 'id']),
         ]
     
+    def save(self, *args, **kwargs):
+        self.normalized_name = normalize_product_name(self.name)
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'normalized_name'}
+        
+        super().save(*args, **kwargs)
+    
+    def clean(self) -> None:
+        super().clean()
+        normalized_name = normalize_product_name(self.name)
+        if Product.objects.filter(normalized_name=normalized_name).exclude(pk=self.pk).exists():
+            raise ValidationError({'name': 'A product with this name already exists.'})
+    
     def __str__(self) -> str:
         return f"{self.name} - ₹{self.price}"
     
@@ -37,7 +79,7 @@ class Product(models.Model):
     
     @property
     def is_low_stock(self) -> bool:
-        return 0 < self.stock_quantity < 10
+        return 0 < self.stock_quantity < get_low_stock_threshold()
     
     def reduce_stock(self, quantity: int) -> None:
         if quantity > self.stock_quantity:
@@ -51,3 +93,34 @@ class Product(models.Model):
     def increase_stock(self, quantity: int) -> None:
         self.stock_quantity += quantity
         self.save(update_fields=['stock_quantity', 'updated_at'])
+
+
+class StockAlert(models.Model):
+    """
+    Change feed of stock crossing the low-stock threshold or running out,
+    written by purchases and stock adjustments. Consumers poll it by id.
+    """
+    class AlertType(models.TextChoices):
+        LOW_STOCK = 'LOW_STOCK', 'Low Stock'
+        OUT_OF_STOCK = 'OUT_OF_STOCK', 'Out of Stock'
+        RESTOCKED = 'RESTOCKED', 'Restocked'
+    
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name='stock_alerts'
+    )
+    alert_type = models.CharField(max_length=20, choices=AlertType.choices)
+    previous_quantity = models.IntegerField()
+    stock_quantity = models.IntegerField()
+    threshold = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'stock_alerts'
+        verbose_name = 'Stock Alert'
+        verbose_name_plural = 'Stock Alerts'
+        ordering = ['-id']
+    
+    def __str__(self) -> str:
+        return f"{self.get_alert_type_display()}: {self.product_id} ({self.stock_quantity})"
@@ -0,0 +1,189 @@
+import csv
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Type
+
+from openpyxl import load_workbook
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+class ProductFileReader:
+    """
+    Streams product rows out of an import file.
+    
+    Every reader yields plain dicts keyed by lower-cased column name, plus a
+    ``_row_number`` used in error messages, so the importer does not care
+    which format it is reading. Problems with the file as a whole (unreadable,
+    empty, missing columns) raise ``ValueError``; bad values in a row are left
+    to row validation.
+    """
+    extensions: Sequence[str] = ()
+    format_name = 'file'
+    
+    def __init__(self, file_path: Path, required_columns: Sequence[str]):
+        self.file_path = Path(file_path)
+        self.required_columns = list(required_columns)
+    
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        has_data = False
+        for product_dict in self._iter_records():
+            has_data = True
+            yield product_dict
+        
+        if not has_data:
+            raise ValueError(f"{self.format_name} file is empty or has no data")
+    
+    def _iter_records(self) -> Iterator[Dict[str, Any]]:
+        raise NotImplementedError
+    
+    def _check_columns(self, headers: Sequence[str]) -> None:
+        missing_columns = [
+            column for column in self.required_columns if column not in headers
+        ]
+        if missing_columns:
+            raise ValueError(
+                f"Missing required columns: {', '.join(missing_columns)}. "
+                f"Expected columns: {', '.join(self.required_columns)}"
+            )
+    
+    @staticmethod
+    def _normalize_headers(header_row: Sequence[Any]) -> List[str]:
+        return [str(value).strip().lower() if value else '' for value in header_row]
+
+
+class ExcelReader(ProductFileReader):
+    extensions = ('.xlsx', '.xls')
+    format_name = 'Excel'
+    
+    def _iter_records(self) -> Iterator[Dict[str, Any]]:
+        # Read-only mode parses rows lazily from the sheet XML, so memory
+        # stays flat regardless of file size.
+        workbook = load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            worksheet = workbook.active
+            if worksheet is None:
+                return
+            
+            rows = worksheet.iter_rows(values_only=True)
+            header_row = next(rows, None)
+            if header_row is None:
+                return
+            
+            headers = self._normalize_headers(header_row)
+            self._check_columns(headers)
+            
+            for row_idx, row in enumerate(rows, start=2):
+                if not any(row):
+                    continue
+                
+                product_dict = {
+                    header: row[idx]
+                    for idx, header in enumerate(headers)
+                    if header and idx < len(row)
+                }
+                
+                if product_dict.get('name'):
+                    product_dict['_row_number'] = row_idx
+                    yield product_dict
+        finally:
+            workbook.close()
+
+
+class CSVReader(ProductFileReader):
+    extensions = ('.csv',)
+    format_name = 'CSV'
+    
+    def _iter_records(self) -> Iterator[Dict[str, Any]]:
+        with open(self.file_path, newline='', encoding='utf-8-sig') as csv_file:
+            rows = csv.reader(csv_file)
+            header_row = next(rows, None)
+            if header_row is None:
+                return
+            
+            headers = self._normalize_headers(header_row)
+            self._check_columns(headers)
+            
+            for row in rows:
+                if not any(value.strip() for value in row):
+                    continue
+                
+                product_dict = {
+                    header: row[idx]
+                    for idx, header in enumerate(headers)
+                    if header and idx < len(row)
+                }
+                
+                if product_dict.get('name'):
+                    product_dict['_row_number'] = rows.line_num
+                    yield product_dict
+
+
+class JSONLinesReader(ProductFileReader):
+    extensions = ('.jsonl', '.ndjson')
+    format_name = 'JSONL'
+    
+    def _iter_records(self) -> Iterator[Dict[str, Any]]:
+        # No header to check up front, so a missing field surfaces as a row
+        # validation error instead.
+        with open(self.file_path, encoding='utf-8-sig') as jsonl_file:
+            for line_number, line in enumerate(jsonl_file, start=1):
+                if not line.strip():
+                    continue
+                
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Line {line_number}: invalid JSON ({e.msg})")
+                
+                if not isinstance(record, dict):
+                    raise ValueError(f"Line {line_number}: expected a JSON object")
+                
+                product_dict = {
+                    str(key).strip().lower(): value for key, value in record.items()
+                }
+                product_dict['_row_number'] = line_number
+                yield product_dict
+
+
+class ParquetReader(ProductFileReader):
+    extensions = ('.parquet',)
+    format_name = 'Parquet'
+    batch_size = 10000
+    
+    def _iter_records(self) -> Iterator[Dict[str, Any]]:
+        parquet_file = pq.ParquetFile(self.file_path)
+        headers = self._normalize_headers(parquet_file.schema_arrow.names)
+        self._check_columns(headers)
+        
+        row_number = 0
+        for batch in parquet_file.iter_batches(batch_size=self.batch_size):
+            for record in batch.to_pylist():
+                row_number += 1
+                product_dict = {
+                    str(key).strip().lower(): value for key, value in record.items()
+                }
+                
+                if product_dict.get('name'):
+                    product_dict['_row_number'] = row_number
+                    yield product_dict
+
+
+READERS: List[Type[ProductFileReader]] = [ExcelReader, CSVReader, JSONLinesReader]
+if pq is not None:
+    READERS.append(ParquetReader)
+
+
+def get_reader_class(file_path: Path) -> Optional[Type[ProductFileReader]]:
+    suffix = Path(file_path).suffix.lower()
+    for reader_class in READERS:
+        if suffix in reader_class.extensions:
+            return reader_class
+    return None
+
+
+def supported_extensions() -> List[str]:
+    return [extension for reader_class in READERS for extension in reader_class.extensions]
@@ -0,0 +1,169 @@
+import re
+import time
+from typing import Iterable, List
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q, QuerySet
+
+from .models import Product
+
+
+FTS_TABLE = 'products_fts'
+FTS_MISSING_TTL = 60
+SEARCH_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class ProductSearchIndex:
+    """
+    Full-text search over product name and description.
+    
+    SQLite keeps an FTS5 table (``products_fts``) whose rowid is the product
+    id, maintained by the signals in ``products.signals`` and rebuilt by the
+    ``rebuild_search_index`` command. PostgreSQL relies on pg_trgm indexes
+    over the columns themselves, so nothing has to be kept in sync there.
+    Any other backend, or a SQLite build without FTS5, falls back to
+    ``icontains``.
+    """
+    _fts_databases = set()
+    _fts_missing = {}
+    
+    @staticmethod
+    def is_enabled() -> bool:
+        if settings.PRODUCT_SEARCH_BACKEND != 'fulltext':
+            return False
+        
+        if connection.vendor == 'postgresql':
+            return True
+        
+        if connection.vendor == 'sqlite':
+            return ProductSearchIndex._has_fts_table()
+        
+        return False
+    
+    @staticmethod
+    def search(queryset: QuerySet, query: str) -> QuerySet:
+        tokens = SEARCH_TOKEN_RE.findall(query)
+        
+        if not tokens or not ProductSearchIndex.is_enabled():
+            return ProductSearchIndex.basic_search(queryset, query)
+        
+        if connection.vendor == 'postgresql':
+            return ProductSearchIndex._trigram_search(queryset, query)
+        
+        return ProductSearchIndex._fts5_search(queryset, tokens)
+    
+    @staticmethod
+    def basic_search(queryset: QuerySet, query: str) -> QuerySet:
+        return queryset.filter(
+            Q(name__icontains=query) | Q(description__icontains=query)
+        )
+    
+    @staticmethod
+    def index_products(products: Iterable[Product]) -> None:
+        if connection.vendor != 'sqlite' or not ProductSearchIndex._has_fts_table():
+            return
+        
+        rows = [(product.id, product.name, product.description) for product in products]
+        if not rows:
+            return
+        
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                [(row[0],) for row in rows]
+            )
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, name, description) VALUES (%s, %s, %s)',
+                rows
+            )
+    
+    @staticmethod
+    def remove_products(product_ids: Iterable[int]) -> None:
+        if connection.vendor != 'sqlite' or not ProductSearchIndex._has_fts_table():
+            return
+        
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                [(product_id,) for product_id in product_ids]
+            )
+    
+    @staticmethod
+    @transaction.atomic
+    def rebuild(chunk_size: int = 5000) -> int:
+        if connection.vendor != 'sqlite' or not ProductSearchIndex._has_fts_table():
+            return 0
+        
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        
+        indexed = 0
+        batch: List[Product] = []
+        for product in Product.objects.only('id', 'name', 'description').iterator(
+            chunk_size=chunk_size
+        ):
+            batch.append(product)
+            if len(batch) >= chunk_size:
+                ProductSearchIndex.index_products(batch)
+                indexed += len(batch)
+                batch = []
+        
+        ProductSearchIndex.index_products(batch)
+        return indexed + len(batch)
+    
+    @staticmethod
+    def _fts5_search(queryset: QuerySet, tokens: List[str]) -> QuerySet:
+        # Every token must match, each as a prefix: "lap pro" -> "lap"* AND "pro"*
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        
+        return queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = products.id', f'{FTS_TABLE} MATCH %s'],
+            params=[match],
+            select={'search_rank': f'bm25({FTS_TABLE}, 10.0, 1.0)'},
+        ).order_by('search_rank', '-created_at')
+    
+    @staticmethod
+    def _trigram_search(queryset: QuerySet, query: str) -> QuerySet:
+        from django.contrib.postgres.search import TrigramSimilarity
+        
+        # "%" is pg_trgm's similarity operator (pg_trgm.similarity_threshold,
+        # 0.3 by default), so misspelt names still match. Both conditions
+        # are written over UPPER(...) to use the trigram indexes from
+        # migration 0003; descriptions keep substring matching.
+        pattern = '%' + re.sub(r'([\\%_])', r'\\\1', query) + '%'
+        return queryset.extra(
+            where=[
+                'UPPER(products.name::text) %% UPPER(%s) '
+                'OR UPPER(products.description::text) LIKE UPPER(%s)'
+            ],
+            params=[query, pattern],
+        ).annotate(
+            search_rank=TrigramSimilarity('name', query)
+        ).order_by('-search_rank', '-created_at')
+    
+    @staticmethod
+    def reset_table_check() -> None:
+        ProductSearchIndex._fts_missing.clear()
+    
+    @staticmethod
+    def _has_fts_table() -> bool:
+        # A found table is remembered per database for the process lifetime
+        # (test runs switch to another database). A missing one is only
+        # remembered for FTS_MISSING_TTL seconds, and migrate clears it, so
+        # search turns on once the table exists without introspecting the
+        # schema on every search and save in the meantime.
+        database = connection.settings_dict['NAME']
+        if database in ProductSearchIndex._fts_databases:
+            return True
+        if ProductSearchIndex._fts_missing.get(database, 0) > time.monotonic():
+            return False
+        
+        if FTS_TABLE in connection.introspection.table_names():
+            ProductSearchIndex._fts_databases.add(database)
+            ProductSearchIndex._fts_missing.pop(database, None)
+            return True
+        
+        ProductSearchIndex._fts_missing[database] = time.monotonic() + FTS_MISSING_TTL
+        return False
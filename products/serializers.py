@@ -1,8 +1,24 @@
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from django.db.models import BooleanField, ExpressionWrapper, Q, QuerySet
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Product
+from rest_framework.settings import ISO_8601, api_settings
+
+from .models import Product, StockAlert
+from .services import ProductService
 from core.validators import validate_positive_amount, validate_stock_quantity, validate_product_name
 
 
+def validate_unique_product_name(value: str, instance: Optional[Product] = None) -> str:
+    value = validate_product_name(value)
+    exclude_id = instance.pk if instance else None
+    if ProductService.name_exists(value, exclude_id=exclude_id):
+        raise serializers.ValidationError('A product with this name already exists.')
+    return value
+
+
 class ProductSerializer(serializers.ModelSerializer):
     is_in_stock = serializers.BooleanField(read_only=True)
     is_low_stock = serializers.BooleanField(read_only=True)
@@ -16,30 +32,13 @@ class ProductSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at', 'is_in_stock', 'is_low_stock']
     
     def validate_name(self, value: str) -> str:
-        return validate_product_name(value)
+        return validate_unique_product_name(value, self.instance)
     
     def validate_price(self, value) -> any:
         return validate_positive_amount(value)
     
     def validate_stock_quantity(self, value) -> any:
         return validate_stock_quantity(value)
-    
-    def validate(self, attrs):
-        if not self.instance:
-            name = attrs.get('name', '').strip()
-            if Product.objects.filter(name__iexact=name).exists():
-                raise serializers.ValidationError({
-                    'name': 'A product with this name already exists.'
-                })
-        
-        if self.instance:
-            name = attrs.get('name', self.instance.name).strip()
-            if Product.objects.filter(name__iexact=name).exclude(pk=self.instance.pk).exists():
-                raise serializers.ValidationError({
-                    'name': 'A product with this name already exists.'
-                })
-        
-        return attrs
 
 
 class ProductListSerializer(serializers.ModelSerializer):
@@ -52,6 +51,140 @@ class ProductListSerializer(serializers.ModelSerializer):
             'is_in_stock', 'created_at'
         ]
         read_only_fields = fields
+    
+    def __init__(self, *args, fields: Optional[List[str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+    
+    @staticmethod
+    def parse_fields(value: Optional[str]) -> Optional[List[str]]:
+        """
+        Parse a ``fields=id,name`` sparse fieldset into the requested list
+        fields, in serializer order. Returns None when no fieldset is given.
+        """
+        if value is None:
+            return None
+        
+        allowed = ProductListSerializer.Meta.fields
+        requested = {field.strip() for field in value.split(',') if field.strip()}
+        unknown = requested - set(allowed)
+        if not requested or unknown:
+            raise serializers.ValidationError({
+                'fields': (
+                    f"Unknown fields: {', '.join(sorted(unknown)) or '(none given)'}. "
+                    f"Allowed fields: {', '.join(allowed)}"
+                )
+            })
+        
+        return [field for field in allowed if field in requested]
+    
+    @staticmethod
+    def get_columns(fields: List[str]) -> List[str]:
+        # Columns .only() must load: is_in_stock reads stock_quantity, and
+        # cursor pagination needs created_at and id from every row.
+        columns = {'id', 'created_at'}
+        columns.update(field for field in fields if field != 'is_in_stock')
+        if 'is_in_stock' in fields:
+            columns.add('stock_quantity')
+        return sorted(columns)
+
+
+class FastProductListSerializer:
+    """
+    Produces exactly what ``ProductListSerializer`` would, straight from
+    ``.values()`` rows. ``is_in_stock`` is computed in SQL and price and
+    created_at are formatted the way DRF's DecimalField and DateTimeField
+    format them, so the JSON is byte-identical without building a field
+    object per value.
+    """
+    fields = ProductListSerializer.Meta.fields
+    price_quantum = Decimal('0.01')
+    
+    @staticmethod
+    def get_queryset(queryset: QuerySet, fields: Optional[List[str]] = None) -> QuerySet:
+        fields = fields or FastProductListSerializer.fields
+        # id and created_at are always selected for cursor positions.
+        columns = {'id', 'created_at'}
+        columns.update(field for field in fields if field != 'is_in_stock')
+        
+        if 'is_in_stock' in fields:
+            queryset = queryset.annotate(
+                in_stock=ExpressionWrapper(Q(stock_quantity__gt=0), output_field=BooleanField())
+            )
+            columns.add('in_stock')
+        
+        return queryset.values(*sorted(columns))
+    
+    @staticmethod
+    def to_representation(
+        rows: Iterable[Dict[str, Any]],
+        fields: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        format_price = FastProductListSerializer._price_formatter()
+        format_datetime = FastProductListSerializer._datetime_formatter()
+        
+        if fields is not None and fields != FastProductListSerializer.fields:
+            return FastProductListSerializer._sparse_representation(
+                rows, fields, format_price, format_datetime
+            )
+        
+        return [
+            {
+                'id': row['id'],
+                'name': row['name'],
+                'price': format_price(row['price']),
+                'stock_quantity': row['stock_quantity'],
+                'is_in_stock': bool(row['in_stock']),
+                'created_at': format_datetime(row['created_at']),
+            }
+            for row in rows
+        ]
+    
+    @staticmethod
+    def _sparse_representation(
+        rows: Iterable[Dict[str, Any]],
+        fields: List[str],
+        format_price: Callable[[Any], Any],
+        format_datetime: Callable[[Any], Any]
+    ) -> List[Dict[str, Any]]:
+        getters = {
+            'id': lambda row: row['id'],
+            'name': lambda row: row['name'],
+            'price': lambda row: format_price(row['price']),
+            'stock_quantity': lambda row: row['stock_quantity'],
+            'is_in_stock': lambda row: bool(row['in_stock']),
+            'created_at': lambda row: format_datetime(row['created_at']),
+        }
+        selected = [(field, getters[field]) for field in fields]
+        
+        return [{field: getter(row) for field, getter in selected} for row in rows]
+    
+    @staticmethod
+    def _price_formatter():
+        quantum = FastProductListSerializer.price_quantum
+        
+        if api_settings.COERCE_DECIMAL_TO_STRING:
+            return lambda value: f'{value.quantize(quantum):f}'
+        return lambda value: value.quantize(quantum)
+    
+    @staticmethod
+    def _datetime_formatter():
+        output_format = api_settings.DATETIME_FORMAT
+        current_timezone = timezone.get_current_timezone()
+        
+        if output_format is None:
+            return lambda value: value
+        
+        if output_format.lower() == ISO_8601:
+            def format_iso(value):
+                text = value.astimezone(current_timezone).isoformat()
+                return text[:-6] + 'Z' if text.endswith('+00:00') else text
+            return format_iso
+        
+        return lambda value: value.astimezone(current_timezone).strftime(output_format)
 
 
 class ProductDetailSerializer(serializers.ModelSerializer):
@@ -73,7 +206,7 @@ class ProductUpdateSerializer(serializers.ModelSerializer):
         fields = ['name', 'description', 'price', 'stock_quantity']
     
     def validate_name(self, value: str) -> str:
-        return validate_product_name(value)
+        return validate_unique_product_name(value, self.instance)
     
     def validate_price(self, value) -> any:
         return validate_positive_amount(value)
@@ -82,5 +215,42 @@ class ProductUpdateSerializer(serializers.ModelSerializer):
         return validate_stock_quantity(value)
 
 
+class ProductExportSerializer(serializers.Serializer):
+    file_format = serializers.ChoiceField(choices=['csv', 'jsonl'], default='csv')
+    gzip = serializers.BooleanField(default=False)
+    chunk_size = serializers.IntegerField(default=2000, min_value=100, max_value=20000)
+
+
+class StockAdjustmentSerializer(serializers.Serializer):
+    product_id = serializers.IntegerField(min_value=1)
+    delta = serializers.IntegerField()
+
+
+class BulkStockAdjustmentSerializer(serializers.Serializer):
+    adjustments = StockAdjustmentSerializer(many=True, allow_empty=False)
+    
+    def validate_adjustments(self, value):
+        if len(value) > 10000:
+            raise serializers.ValidationError("Cannot submit more than 10000 adjustments at once")
+        return value
+
+
+class LowStockQuerySerializer(serializers.Serializer):
+    threshold = serializers.IntegerField(required=False, min_value=1)
+
+
+class StockAlertSerializer(serializers.ModelSerializer):
+    product_name = serializers.CharField(source='product.name', read_only=True)
+    
+    class Meta:
+        model = StockAlert
+        fields = [
+            'id', 'product_id', 'product_name', 'alert_type',
+            'previous_quantity', 'stock_quantity', 'threshold', 'created_at'
+        ]
+        read_only_fields = fields
 
 
+class StockAlertFeedSerializer(serializers.Serializer):
+    since_id = serializers.IntegerField(required=False, default=0, min_value=0)
+    limit = serializers.IntegerField(required=False, default=100, min_value=1, max_value=500)
@@ -1,8 +1,22 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
+from datetime import timedelta
 from decimal import Decimal
-from django.db.models import QuerySet, Q
-from .models import Product
-from core.exceptions import ProductNotFoundError, StockUnavailableError
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, IntegerField, QuerySet, Value, When
+from django.utils import timezone
+from .cache import CatalogCache
+from .models import Product, StockAlert, get_low_stock_threshold
+from .search import ProductSearchIndex
+from .validators import normalize_product_name
+from core.exceptions import DuplicateProductError, ProductNotFoundError, StockUnavailableError
+
+
+STOCK_ADJUSTMENT_BATCH_SIZE = 500
+
+EXPORT_FIELDS = [
+    'id', 'name', 'description', 'price', 'stock_quantity', 'created_at', 'updated_at'
+]
 
 
 class ProductService:
@@ -24,12 +38,87 @@ class ProductService:
             queryset = queryset.filter(stock_quantity__gt=0)
         
         if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) | Q(description__icontains=search)
-            )
+            queryset = ProductSearchIndex.search(queryset, search)
         
         return queryset
     
+    @staticmethod
+    def iter_export_rows(chunk_size: int = 2000) -> Iterator[Tuple[Any, ...]]:
+        """
+        Every product as a tuple of ``EXPORT_FIELDS``, in id order. Rows are
+        fetched ``chunk_size`` at a time (a server-side cursor on
+        PostgreSQL), so memory stays flat however large the catalog is.
+        """
+        return Product.objects.order_by('id').values_list(*EXPORT_FIELDS).iterator(
+            chunk_size=chunk_size
+        )
+    
+    @staticmethod
+    def get_low_stock_products(threshold: Optional[int] = None) -> QuerySet[Product]:
+        return Product.objects.low_stock(threshold).order_by('stock_quantity', 'id')
+    
+    @staticmethod
+    def get_stock_alerts(since_id: int = 0, limit: int = 100) -> List[StockAlert]:
+        """
+        Alerts after ``since_id`` in id order, holding back the newest
+        ``STOCK_ALERT_FEED_DELAY`` seconds. Ids are handed out at insert,
+        not at commit, so a transaction still open when a poll runs can
+        commit an id below one the poller has already seen. Only returning
+        alerts that settled before any still-running stock transaction could
+        have started means the cursor never moves past an alert that has not
+        committed yet.
+        """
+        settled_before = timezone.now() - timedelta(seconds=settings.STOCK_ALERT_FEED_DELAY)
+        return list(
+            StockAlert.objects.filter(id__gt=since_id, created_at__lte=settled_before)
+            .select_related('product')
+            .order_by('id')[:limit]
+        )
+    
+    @staticmethod
+    def record_stock_changes(changes: Iterable[Tuple[int, int, int]]) -> List[StockAlert]:
+        """
+        Write a ``StockAlert`` for every ``(product_id, before, after)`` stock
+        change that crosses the low-stock threshold or reaches zero. Called
+        inside the transaction that changes the stock, so alerts commit or
+        roll back with it.
+        """
+        threshold = get_low_stock_threshold()
+        alerts = []
+        
+        for product_id, before, after in changes:
+            if after <= 0 < before:
+                alert_type = StockAlert.AlertType.OUT_OF_STOCK
+            elif 0 < after < threshold <= before:
+                alert_type = StockAlert.AlertType.LOW_STOCK
+            elif before < threshold <= after:
+                alert_type = StockAlert.AlertType.RESTOCKED
+            else:
+                continue
+            
+            alerts.append(StockAlert(
+                product_id=product_id,
+                alert_type=alert_type,
+                previous_quantity=before,
+                stock_quantity=after,
+                threshold=threshold
+            ))
+        
+        return StockAlert.objects.bulk_create(alerts) if alerts else []
+    
+    @staticmethod
+    def get_product_by_name(name: str) -> Optional[Product]:
+        return Product.objects.filter(
+            normalized_name=normalize_product_name(name)
+        ).first()
+    
+    @staticmethod
+    def name_exists(name: str, exclude_id: Optional[int] = None) -> bool:
+        queryset = Product.objects.filter(normalized_name=normalize_product_name(name))
+        if exclude_id is not None:
+            queryset = queryset.exclude(pk=exclude_id)
+        return queryset.exists()
+    
     @staticmethod
     def create_product(
         name: str,
@@ -37,12 +126,18 @@ class ProductService:
         stock_quantity: int,
         description: str = ''
     ) -> Product:
-        product = Product.objects.create(
-            name=name,
-            description=description,
-            price=price,
-            stock_quantity=stock_quantity
-        )
+        # The unique index on normalized_name catches a concurrent create of
+        # the same name that slipped past the serializer's check.
+        try:
+            with transaction.atomic():
+                product = Product.objects.create(
+                    name=name,
+                    description=description,
+                    price=price,
+                    stock_quantity=stock_quantity
+                )
+        except IntegrityError:
+            raise DuplicateProductError()
         return product
     
     @staticmethod
@@ -56,7 +151,11 @@ class ProductService:
             if hasattr(product, field):
                 setattr(product, field, value)
         
-        product.save()
+        try:
+            with transaction.atomic():
+                product.save()
+        except IntegrityError:
+            raise DuplicateProductError()
         return product
     
     @staticmethod
@@ -83,12 +182,17 @@ class ProductService:
         return True, None
     
     @staticmethod
+    @transaction.atomic
     def update_stock(
         product_id: int,
         quantity_change: int,
         operation: str = 'reduce'
     ) -> Product:
-        product = ProductService.get_product_by_id(product_id)
+        try:
+            product = Product.objects.select_for_update().get(id=product_id)
+        except Product.DoesNotExist:
+            raise ProductNotFoundError(f"Product with ID {product_id} not found.")
+        previous_quantity = product.stock_quantity
         
         if operation == 'reduce':
             if quantity_change > product.stock_quantity:
@@ -101,8 +205,125 @@ class ProductService:
         elif operation == 'increase':
             product.increase_stock(quantity_change)
         
+        ProductService.record_stock_changes(
+            [(product.id, previous_quantity, product.stock_quantity)]
+        )
+        # Stock-only saves skip the catalog bump meant for purchases; an
+        # admin adjustment should still show up right away.
+        CatalogCache.bump_version()
         return product
     
+    @staticmethod
+    @transaction.atomic
+    def bulk_adjust_stock(adjustments: List[Dict[str, int]]) -> Dict[str, Any]:
+        """
+        Apply ``{'product_id', 'delta'}`` stock adjustments in one transaction.
+        
+        Products are locked in id order, then lines are checked in input order
+        against a running stock level, so several lines for one product add
+        up. A line for an unknown product, or one that would take stock below
+        zero, is rejected on its own and the other lines still apply. Accepted
+        deltas are written as ``stock_quantity + CASE id WHEN ... END``
+        updates, ``STOCK_ADJUSTMENT_BATCH_SIZE`` products per statement.
+        """
+        product_ids = sorted({line['product_id'] for line in adjustments})
+        stock_levels: Dict[int, int] = {}
+        for start in range(0, len(product_ids), STOCK_ADJUSTMENT_BATCH_SIZE):
+            batch_ids = product_ids[start:start + STOCK_ADJUSTMENT_BATCH_SIZE]
+            stock_levels.update(
+                Product.objects.select_for_update()
+                .filter(id__in=batch_ids)
+                .order_by('id')
+                .values_list('id', 'stock_quantity')
+            )
+        
+        results = []
+        net_deltas: Dict[int, int] = {}
+        for line_number, line in enumerate(adjustments, start=1):
+            product_id, delta = line['product_id'], line['delta']
+            result = {'line': line_number, 'product_id': product_id, 'delta': delta}
+            
+            if product_id not in stock_levels:
+                result.update(status='rejected', error=f"Product with ID {product_id} not found")
+            elif stock_levels[product_id] + delta < 0:
+                result.update(
+                    status='rejected',
+                    error=(
+                        f"Stock cannot go negative. Available: {stock_levels[product_id]}, "
+                        f"Adjustment: {delta}"
+                    )
+                )
+            else:
+                stock_levels[product_id] += delta
+                net_deltas[product_id] = net_deltas.get(product_id, 0) + delta
+                result.update(status='applied', stock_quantity=stock_levels[product_id])
+            
+            results.append(result)
+        
+        changed = [(product_id, delta) for product_id, delta in net_deltas.items() if delta]
+        now = timezone.now()
+        for start in range(0, len(changed), STOCK_ADJUSTMENT_BATCH_SIZE):
+            batch = changed[start:start + STOCK_ADJUSTMENT_BATCH_SIZE]
+            Product.objects.filter(id__in=[product_id for product_id, _ in batch]).update(
+                stock_quantity=F('stock_quantity') + Case(
+                    *[When(id=product_id, then=Value(delta)) for product_id, delta in batch],
+                    default=Value(0),
+                    output_field=IntegerField()
+                ),
+                updated_at=now
+            )
+        
+        if changed:
+            CatalogCache.bump_version()
+            ProductService.record_stock_changes(
+                (product_id, stock_levels[product_id] - delta, stock_levels[product_id])
+                for product_id, delta in changed
+            )
+        
+        applied = sum(1 for result in results if result['status'] == 'applied')
+        return {
+            'applied': applied,
+            'rejected': len(results) - applied,
+            'products_updated': len(changed),
+            'results': results
+        }
+    
+    @staticmethod
+    @transaction.atomic
+    def upsert_product(
+        name: str,
+        price: Decimal,
+        stock_quantity: int,
+        description: str = ''
+    ) -> Tuple[Product, bool]:
+        """
+        Create the product, or update the one whose name matches ignoring
+        case. The existing product keeps its name as stored.
+        """
+        values = {
+            'description': description,
+            'price': price,
+            'stock_quantity': stock_quantity
+        }
+        normalized_name = normalize_product_name(name)
+        
+        product = Product.objects.select_for_update().filter(
+            normalized_name=normalized_name
+        ).first()
+        if product is None:
+            try:
+                with transaction.atomic():
+                    return Product.objects.create(name=name, **values), True
+            except IntegrityError:
+                product = Product.objects.select_for_update().get(
+                    normalized_name=normalized_name
+                )
+        
+        for field, value in values.items():
+            setattr(product, field, value)
+        product.save(update_fields=[*values, 'updated_at'])
+        return product, False
+    
     @staticmethod
     def bulk_create_or_update_products(
         products_data: List[Dict[str, Any]]
@@ -114,20 +335,18 @@ class ProductService:
         
         for product_data in products_data:
             try:
-                product, created = Product.objects.update_or_create(
+                product, created = ProductService.upsert_product(
                     name=product_data['name'],
-                    defaults={
-                        'description': product_data.get('description', ''),
-                        'price': product_data['price'],
-                        'stock_quantity': product_data['stock_quantity']
-                    }
+                    description=product_data.get('description', ''),
+                    price=product_data['price'],
+                    stock_quantity=product_data['stock_quantity']
                 )
                 
                 if created:
                     created_count += 1
                 else:
                     updated_count += 1
-                    
+            
             except Exception as e:
                 failed_count += 1
                 errors.append({
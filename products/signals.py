@@ -0,0 +1,41 @@
+from django.db.models.signals import post_migrate, post_save, post_delete
+from django.dispatch import receiver
+
+from .cache import CatalogCache
+from .models import Product
+from .search import ProductSearchIndex
+
+
+SEARCHABLE_FIELDS = {'name', 'description'}
+STOCK_FIELDS = {'stock_quantity', 'updated_at'}
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def bump_catalog_version(sender, instance, update_fields=None, **kwargs):
+    # Purchases save stock alone (Product.reduce_stock); bumping the catalog
+    # for every sale would evict every cached page each time. Cached pages
+    # may show stock up to CATALOG_CACHE_TIMEOUT old, and purchases always
+    # check the live row.
+    if update_fields and STOCK_FIELDS.issuperset(update_fields):
+        return
+    
+    CatalogCache.bump_version()
+
+
+@receiver(post_save, sender=Product)
+def index_product_for_search(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields and not SEARCHABLE_FIELDS.intersection(update_fields):
+        return
+    
+    ProductSearchIndex.index_products([instance])
+
+
+@receiver(post_delete, sender=Product)
+def remove_product_from_search(sender, instance, **kwargs):
+    ProductSearchIndex.remove_products([instance.id])
+
+
+@receiver(post_migrate)
+def recheck_search_table(sender, **kwargs):
+    ProductSearchIndex.reset_table_check()
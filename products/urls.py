@@ -1,7 +1,11 @@
 from django.urls import path
 from .views import (
+    BulkStockAdjustmentView,
+    LowStockProductsView,
     ProductListCreateView,
     ProductDetailView,
+    ProductExportView,
+    StockAlertFeedView,
 )
 
 app_name = 'products'
@@ -9,6 +13,10 @@ app_name = 'products'
 urlpatterns = [
     path('', ProductListCreateView.as_view(), name='product_list_create'),
     path('<int:pk>/', ProductDetailView.as_view(), name='product_detail'),
+    path('export/', ProductExportView.as_view(), name='product_export'),
+    path('stock/bulk/', BulkStockAdjustmentView.as_view(), name='bulk_stock_adjustment'),
+    path('low-stock/', LowStockProductsView.as_view(), name='low_stock_products'),
+    path('stock-alerts/', StockAlertFeedView.as_view(), name='stock_alert_feed'),
 ]
 
 
@@ -0,0 +1,85 @@
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional, Tuple
+
+
+PRICE_QUANTUM = Decimal('0.01')
+MAX_PRICE = Decimal('1e8')
+
+
+def normalize_product_name(name: str) -> str:
+    """
+    Key used to match product names case-insensitively. Stored in
+    ``Product.normalized_name`` under a unique index, so lookups and duplicate
+    checks are exact index matches.
+    """
+    return str(name).strip().casefold()
+
+
+def validate_product_row(product_data: Dict[str, Any]) -> Dict[str, Any]:
+    validated = {}
+    
+    name = str(product_data.get('name', '')).strip()
+    if not name:
+        raise ValueError("Product name cannot be empty")
+    if len(name) > 255:
+        raise ValueError(f"Product name too long (max 255 characters): {name[:50]}...")
+    validated['name'] = name
+    validated['normalized_name'] = normalize_product_name(name)
+    
+    try:
+        price = Decimal(str(product_data.get('price', 0)))
+        if not price.is_finite() or price <= 0:
+            raise ValueError(f"Price must be positive: {price}")
+        # Product.price is max_digits=10, decimal_places=2.
+        if price.quantize(PRICE_QUANTUM) >= MAX_PRICE:
+            raise ValueError(f"Price too large: {price}")
+        validated['price'] = price
+    except (InvalidOperation, ValueError, TypeError) as e:
+        raise ValueError(f"Invalid price value: {product_data.get('price')}")
+    
+    try:
+        stock = int(product_data.get('stock_quantity', 0))
+        if stock < 0:
+            raise ValueError(f"Stock quantity cannot be negative: {stock}")
+        validated['stock_quantity'] = stock
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid stock quantity: {product_data.get('stock_quantity')}")
+    
+    validated['description'] = str(product_data.get('description', '')).strip()
+    
+    return validated
+
+
+def product_content(
+    description: str,
+    price: Any,
+    stock_quantity: int
+) -> Tuple[str, Decimal, int]:
+    """
+    The fields an import writes, normalized for comparison. Price is
+    quantized to the column's two decimal places so ``10`` from a file
+    matches ``10.00`` read back from the database.
+    """
+    return (
+        description or '',
+        Decimal(str(price)).quantize(PRICE_QUANTUM),
+        int(stock_quantity),
+    )
+
+
+def validate_product_rows(
+    rows: List[Dict[str, Any]]
+) -> List[Tuple[Any, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Validate a chunk of raw rows, returning ``(row_number, validated, error)``
+    per row in input order. Kept free of model imports so process pool
+    workers can run it without setting up Django.
+    """
+    results = []
+    for product_data in rows:
+        row_number = product_data.get('_row_number', 'Unknown')
+        try:
+            results.append((row_number, validate_product_row(product_data), None))
+        except ValueError as e:
+            results.append((row_number, None, str(e)))
+    return results
@@ -1,23 +1,35 @@
+from typing import List, Optional
+
 from rest_framework import status, generics
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from django.conf import settings
 from django.db.models import QuerySet
 
 from .models import Product
 from .serializers import (
+    BulkStockAdjustmentSerializer,
+    FastProductListSerializer,
+    LowStockQuerySerializer,
     ProductSerializer,
     ProductListSerializer,
     ProductDetailSerializer,
-    ProductUpdateSerializer
+    ProductExportSerializer,
+    ProductUpdateSerializer,
+    StockAlertFeedSerializer,
+    StockAlertSerializer
 )
-from .services import ProductService
+from .cache import CatalogCacheMixin
+from .pagination import ProductCursorPagination
+from .services import EXPORT_FIELDS, ProductService
 from users.permissions import IsAdmin, IsAdminOrReadOnly
+from core.streaming import export_filename, iter_export, streaming_export_response
 from core.utils import create_success_response, create_error_response
 from core.exceptions import ProductNotFoundError
 
 
-class ProductListCreateView(generics.ListCreateAPIView):
+class ProductListCreateView(CatalogCacheMixin, generics.ListCreateAPIView):
     queryset = Product.objects.all()
     permission_classes = [IsAdminOrReadOnly]
     
@@ -26,18 +38,46 @@ class ProductListCreateView(generics.ListCreateAPIView):
             return ProductSerializer
         return ProductListSerializer
     
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            query_params = self.request.query_params
+            if query_params.get('pagination') == 'cursor' or 'cursor' in query_params:
+                self._paginator = ProductCursorPagination()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+    
     def get_queryset(self) -> QuerySet[Product]:
-        return Product.objects.all()
+        if self.request.method != 'GET':
+            return Product.objects.all()
+        
+        return ProductService.get_all_products(
+            in_stock_only=self.request.query_params.get('in_stock') == 'true',
+            search=self.request.query_params.get('search', '').strip() or None
+        )
+    
+    def get_requested_fields(self) -> Optional[List[str]]:
+        return ProductListSerializer.parse_fields(self.request.query_params.get('fields'))
     
     def list(self, request, *args, **kwargs):
+        return self.cached_catalog_response(request, lambda: self._build_list(request))
+    
+    def _build_list(self, request) -> Response:
+        fields = self.get_requested_fields()
+        if settings.PRODUCT_LIST_FAST_PATH:
+            return self._build_fast_list(request, fields)
+        
         queryset = self.filter_queryset(self.get_queryset())
+        if fields is not None:
+            queryset = queryset.only(*ProductListSerializer.get_columns(fields))
         page = self.paginate_queryset(queryset)
         
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
+            serializer = self.get_serializer(page, many=True, fields=fields)
             return self.get_paginated_response(serializer.data)
         
-        serializer = self.get_serializer(queryset, many=True)
+        serializer = self.get_serializer(queryset, many=True, fields=fields)
         return Response(
             create_success_response(
                 message='Products retrieved successfully',
@@ -45,6 +85,24 @@ class ProductListCreateView(generics.ListCreateAPIView):
             )
         )
     
+    def _build_fast_list(self, request, fields: Optional[List[str]]) -> Response:
+        queryset = FastProductListSerializer.get_queryset(
+            self.filter_queryset(self.get_queryset()), fields
+        )
+        page = self.paginate_queryset(queryset)
+        
+        if page is not None:
+            return self.get_paginated_response(
+                FastProductListSerializer.to_representation(page, fields)
+            )
+        
+        return Response(
+            create_success_response(
+                message='Products retrieved successfully',
+                data=FastProductListSerializer.to_representation(queryset, fields)
+            )
+        )
+    
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -66,7 +124,7 @@ class ProductListCreateView(generics.ListCreateAPIView):
         )
 
 
-class ProductDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ProductDetailView(CatalogCacheMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Product.objects.all()
     permission_classes = [IsAdminOrReadOnly]
     
@@ -76,6 +134,9 @@ class ProductDetailView(generics.RetrieveUpdateDestroyAPIView):
         return ProductDetailSerializer
     
     def retrieve(self, request, *args, **kwargs):
+        return self.cached_catalog_response(request, self._build_detail)
+    
+    def _build_detail(self) -> Response:
         try:
             instance = self.get_object()
             serializer = self.get_serializer(instance)
@@ -122,3 +183,102 @@ class ProductDetailView(generics.RetrieveUpdateDestroyAPIView):
             ),
             status=status.HTTP_200_OK
         )
+
+
+class ProductExportView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+    
+    def get(self, request):
+        serializer = ProductExportSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(
+                create_error_response('Invalid export parameters', serializer.errors),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        options = serializer.validated_data
+        chunks = iter_export(
+            options['file_format'],
+            EXPORT_FIELDS,
+            ProductService.iter_export_rows(chunk_size=options['chunk_size']),
+            compress=options['gzip']
+        )
+        return streaming_export_response(
+            chunks,
+            export_filename('products', options['file_format'], options['gzip']),
+            options['file_format'],
+            options['gzip']
+        )
+
+
+class BulkStockAdjustmentView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+    
+    def post(self, request):
+        serializer = BulkStockAdjustmentSerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return Response(
+                create_error_response(
+                    message='Invalid stock adjustments',
+                    errors=serializer.errors
+                ),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        result = ProductService.bulk_adjust_stock(serializer.validated_data['adjustments'])
+        
+        return Response(
+            create_success_response(
+                message=(
+                    f"Applied {result['applied']} of "
+                    f"{result['applied'] + result['rejected']} stock adjustments"
+                ),
+                data=result
+            )
+        )
+
+
+class LowStockProductsView(generics.ListAPIView):
+    serializer_class = ProductListSerializer
+    permission_classes = [IsAuthenticated, IsAdmin]
+    
+    def get_queryset(self) -> QuerySet[Product]:
+        query_serializer = LowStockQuerySerializer(data=self.request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        
+        return ProductService.get_low_stock_products(
+            threshold=query_serializer.validated_data.get('threshold')
+        )
+
+
+class StockAlertFeedView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+    
+    def get(self, request):
+        query_serializer = StockAlertFeedSerializer(data=request.query_params)
+        
+        if not query_serializer.is_valid():
+            return Response(
+                create_error_response(
+                    message='Invalid feed parameters',
+                    errors=query_serializer.errors
+                ),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        since_id = query_serializer.validated_data['since_id']
+        alerts = ProductService.get_stock_alerts(
+            since_id=since_id,
+            limit=query_serializer.validated_data['limit']
+        )
+        
+        return Response(
+            create_success_response(
+                message='Stock alerts retrieved successfully',
+                data={
+                    'alerts': StockAlertSerializer(alerts, many=True).data,
+                    'last_id': alerts[-1].id if alerts else since_id
+                }
+            )
+        )
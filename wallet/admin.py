@@ -1,24 +1,40 @@
 from django.contrib import admin
-from .models import Wallet, Transaction
+from .models import Wallet, WalletShard, WalletSnapshot, Transaction
+from .services import WalletService
+
+
+class WalletShardInline(admin.TabularInline):
+    model = WalletShard
+    fields = ['shard_index', 'balance', 'updated_at']
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+    
+    def has_add_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(Wallet)
 class WalletAdmin(admin.ModelAdmin):
     list_display = [
-        'id', 'user', 'balance', 'has_sufficient_balance',
+        'id', 'user', 'balance', 'shard_count', 'has_sufficient_balance',
         'created_at', 'updated_at'
     ]
     list_filter = ['created_at', 'updated_at']
     search_fields = ['user__username', 'user__email']
-    readonly_fields = ['created_at', 'updated_at', 'has_sufficient_balance']
+    readonly_fields = [
+        'created_at', 'updated_at', 'has_sufficient_balance',
+        'shard_count', 'total_balance'
+    ]
     ordering = ['-created_at']
+    inlines = [WalletShardInline]
     
     fieldsets = (
         ('User', {
             'fields': ('user',)
         }),
         ('Balance', {
-            'fields': ('balance', 'has_sufficient_balance')
+            'fields': ('balance', 'shard_count', 'total_balance', 'has_sufficient_balance')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
@@ -26,6 +42,10 @@ class WalletAdmin(admin.ModelAdmin):
         }),
     )
     
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        WalletService.invalidate_balance_cache(obj.user_id)
+    
     def has_sufficient_balance(self, obj):
         return obj.has_sufficient_balance
     has_sufficient_balance.boolean = True
@@ -66,3 +86,19 @@ class TransactionAdmin(admin.ModelAdmin):
     
     def has_delete_permission(self, request, obj=None):
         return False
+
+
+@admin.register(WalletSnapshot)
+class WalletSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['id', 'wallet', 'period', 'as_of', 'balance', 'created_at']
+    list_filter = ['period', 'as_of']
+    search_fields = ['wallet__user__username']
+    list_select_related = ['wallet__user']
+    readonly_fields = ['wallet', 'period', 'as_of', 'balance', 'created_at']
+    ordering = ['-as_of']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
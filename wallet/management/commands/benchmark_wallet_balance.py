@@ -0,0 +1,87 @@
+import statistics
+import time
+import uuid
+from decimal import Decimal
+from typing import Callable, List
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from wallet.services import BALANCE_CACHE_ALIAS, WalletService
+from wallet.views import WalletBalanceView
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark WalletBalanceView latency with a cold vs warm balance cache'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=2000,
+            help='Number of balance requests per scenario (default: 2000)'
+        )
+    
+    def handle(self, *args, **options):
+        iterations = options['requests']
+        run_id = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(
+            username=f'bench_{run_id}',
+            email=f'bench_{run_id}@example.com',
+            password=None
+        )
+        WalletService.credit_wallet(user, Decimal('100.00'))
+        
+        factory = APIRequestFactory()
+        view = WalletBalanceView.as_view()
+        cache = caches[BALANCE_CACHE_ALIAS]
+        cache_key = WalletService._balance_cache_key(user.id)
+        
+        def request_balance():
+            request = factory.get('/api/wallet/balance/')
+            force_authenticate(request, user=user)
+            view(request)
+        
+        def cold():
+            cache.delete(cache_key)
+            request_balance()
+        
+        try:
+            self.stdout.write(
+                self.style.SUCCESS('\n=== Wallet Balance Benchmark ===')
+            )
+            self.stdout.write(
+                f"Requests per scenario: {iterations}, "
+                f"cache backend: {cache.__class__.__name__}\n"
+            )
+            
+            for label, func in [('cold cache', cold), ('warm cache', request_balance)]:
+                timings = self._measure(func, iterations)
+                self.stdout.write(
+                    f"{label:<12} p50 {self._percentile(timings, 50):8.3f} ms   "
+                    f"p99 {self._percentile(timings, 99):8.3f} ms   "
+                    f"mean {statistics.mean(timings):8.3f} ms"
+                )
+        finally:
+            cache.delete(cache_key)
+            user.delete()
+        
+        self.stdout.write('')
+    
+    def _measure(self, func: Callable[[], None], iterations: int) -> List[float]:
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+    
+    def _percentile(self, timings: List[float], percentile: int) -> float:
+        ordered = sorted(timings)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
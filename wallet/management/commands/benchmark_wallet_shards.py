@@ -0,0 +1,141 @@
+import threading
+import time
+import uuid
+from decimal import Decimal
+from typing import Any, Callable, Dict
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from wallet.services import WalletService
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark concurrent debits of one wallet against its shard count'
+    
+    ENGINES = {
+        'locking': WalletService.debit_wallet,
+        'conditional': WalletService.debit_wallet_conditional,
+    }
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--shards',
+            type=str,
+            default='0,4,16',
+            help='Comma-separated shard counts to compare (default: 0,4,16)'
+        )
+        
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=32,
+            help='Number of concurrent debiting threads (default: 32)'
+        )
+        
+        parser.add_argument(
+            '--debits',
+            type=int,
+            default=50,
+            help='Debits made by each worker (default: 50)'
+        )
+        
+        parser.add_argument(
+            '--engine',
+            choices=list(self.ENGINES),
+            help='Benchmark a single debit path instead of all of them'
+        )
+    
+    def handle(self, *args, **options):
+        shard_counts = [int(count) for count in options['shards'].split(',')]
+        engines = [options['engine']] if options['engine'] else list(self.ENGINES)
+        
+        self.stdout.write(self.style.SUCCESS('\n=== Wallet Shard Benchmark ==='))
+        self.stdout.write(
+            f"Workers: {options['workers']}, "
+            f"debits per worker: {options['debits']}, "
+            f"database: {connection.vendor}\n"
+        )
+        
+        for engine in engines:
+            for shard_count in shard_counts:
+                result = self._run(
+                    self.ENGINES[engine], shard_count, options['workers'], options['debits']
+                )
+                self.stdout.write(
+                    f"{engine:<12} {shard_count:>3} shards  "
+                    f"{result['debits_per_second']:>10.1f} debits/sec  "
+                    f"({result['succeeded']} ok, {result['failed']} failed, "
+                    f"{result['elapsed']:.2f}s)"
+                )
+                if result['expected_balance'] != result['final_balance']:
+                    self.stdout.write(self.style.ERROR(
+                        f"    balance {result['final_balance']} does not match "
+                        f"expected {result['expected_balance']}"
+                    ))
+        
+        self.stdout.write('')
+    
+    def _run(
+        self,
+        debit: Callable[..., Any],
+        shard_count: int,
+        workers: int,
+        debits: int
+    ) -> Dict[str, Any]:
+        run_id = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(
+            username=f'bench_{run_id}',
+            email=f'bench_{run_id}@example.com',
+            password=None
+        )
+        # Fund well past what the run spends, like a busy corporate wallet,
+        # so the shards rarely run dry and force a consolidation.
+        opening_balance = Decimal(workers * debits * 10)
+        WalletService.credit_wallet(user, opening_balance)
+        WalletService.set_shard_count(user, shard_count)
+        
+        counters = {'succeeded': 0, 'failed': 0}
+        counters_lock = threading.Lock()
+        start_barrier = threading.Barrier(workers)
+        
+        def worker():
+            succeeded = failed = 0
+            try:
+                start_barrier.wait()
+                for _ in range(debits):
+                    try:
+                        debit(user, Decimal('1.00'), 'Shard benchmark')
+                        succeeded += 1
+                    except Exception:
+                        failed += 1
+            finally:
+                connection.close()
+            with counters_lock:
+                counters['succeeded'] += succeeded
+                counters['failed'] += failed
+        
+        threads = [threading.Thread(target=worker) for _ in range(workers)]
+        
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        
+        final_balance = WalletService._total_balance(user=user)
+        user.delete()
+        
+        return {
+            'succeeded': counters['succeeded'],
+            'failed': counters['failed'],
+            'elapsed': elapsed,
+            'debits_per_second': counters['succeeded'] / elapsed if elapsed else 0.0,
+            'expected_balance': opening_balance - counters['succeeded'],
+            'final_balance': final_balance
+        }
@@ -0,0 +1,103 @@
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from wallet.readers import CREDIT_FILE_FORMATS, get_credit_file_format, iter_credit_records
+from wallet.services import BULK_CREDIT_CHUNK_SIZE, WalletService
+
+
+class Command(BaseCommand):
+    help = 'Credit many wallets from a CSV or JSONL file of user_id, amount, description'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'file_path',
+            type=str,
+            help=f"Path to the credit file ({', '.join(CREDIT_FILE_FORMATS)})"
+        )
+        
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=BULK_CREDIT_CHUNK_SIZE,
+            help=f'Records credited per transaction (default: {BULK_CREDIT_CHUNK_SIZE})'
+        )
+        
+        parser.add_argument(
+            '--skip-records',
+            type=int,
+            default=0,
+            help='Skip the first N records, to resume a run that stopped part way'
+        )
+    
+    def handle(self, *args, **options):
+        file_path = Path(options['file_path'])
+        file_format = get_credit_file_format(file_path.name)
+        if not file_path.exists():
+            raise CommandError(f"File not found: {file_path}")
+        if file_format is None:
+            raise CommandError(
+                f"Unsupported file type. Expected one of: {', '.join(CREDIT_FILE_FORMATS)}"
+            )
+        
+        self.stdout.write(self.style.SUCCESS('\n=== Bulk Wallet Credit Started ==='))
+        self.stdout.write(f'File: {file_path}\n')
+        
+        skip = max(0, options['skip_records'])
+        started = time.perf_counter()
+        
+        def report(stats: Dict[str, Any]) -> None:
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"  {skip + stats['total']} records processed "
+                f"({stats['credited']} credited, {stats['rejected']} rejected, "
+                f"{stats['total'] / elapsed if elapsed else 0:.0f} records/sec)"
+            )
+        
+        # Each chunk commits on its own, so a run that fails part way can be
+        # resumed with --skip-records set to the last count reported.
+        with open(file_path, newline='', encoding='utf-8-sig') as credit_file:
+            records = iter_credit_records(credit_file, file_format)
+            for _ in range(skip):
+                if next(records, None) is None:
+                    break
+            
+            try:
+                stats = WalletService.bulk_credit(
+                    records,
+                    chunk_size=options['chunk_size'],
+                    progress=report
+                )
+            except ValueError as e:
+                raise CommandError(str(e))
+        
+        self._display_results(stats, time.perf_counter() - started)
+    
+    def _display_results(self, stats: Dict[str, Any], elapsed: float) -> None:
+        self.stdout.write('\n' + '=' * 50)
+        self.stdout.write(self.style.SUCCESS('\n=== Bulk Credit Summary ===\n'))
+        
+        self.stdout.write(f"Total records processed: {stats['total']}")
+        self.stdout.write(
+            f"Elapsed: {elapsed:.2f}s "
+            f"({stats['total'] / elapsed if elapsed else 0:.0f} records/sec)"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"[+] Credited: {stats['credited']} "
+                f"({stats['total_amount']} to {stats['wallets_credited']} wallets)"
+            )
+        )
+        
+        if stats['rejected'] > 0:
+            self.stdout.write(self.style.ERROR(f"[-] Rejected: {stats['rejected']}"))
+            self.stdout.write('\n' + self.style.ERROR('Errors:'))
+            for error in stats['errors'][:10]:
+                self.stdout.write(f"  - {error}")
+            
+            if len(stats['errors']) > 10:
+                self.stdout.write(f"  ... and {len(stats['errors']) - 10} more errors")
+        
+        self.stdout.write('\n' + '=' * 50 + '\n')
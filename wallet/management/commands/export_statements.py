@@ -0,0 +1,135 @@
+import time
+from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.streaming import EXPORT_FORMATS, export_filename, iter_export
+from wallet.services import STATEMENT_EXPORT_FIELDS, WalletService
+
+
+class Command(BaseCommand):
+    help = 'Write a transaction statement file for every wallet in one pass over the ledger'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output_dir',
+            type=str,
+            help='Directory for the statement files (created if missing)'
+        )
+        
+        parser.add_argument(
+            '--since',
+            type=str,
+            help='Only transactions on or after this date, YYYY-MM-DD'
+        )
+        
+        parser.add_argument(
+            '--until',
+            type=str,
+            help='Only transactions before this date, YYYY-MM-DD'
+        )
+        
+        parser.add_argument(
+            '--file-format',
+            choices=sorted(EXPORT_FORMATS),
+            default='csv',
+            help='Output format (default: csv)'
+        )
+        
+        parser.add_argument(
+            '--gzip',
+            action='store_true',
+            help='Gzip each statement file'
+        )
+        
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Rows fetched from the database per round trip (default: 2000)'
+        )
+    
+    def handle(self, *args, **options):
+        since = self._parse_date(options['since'], '--since')
+        until = self._parse_date(options['until'], '--until')
+        if since and until and since >= until:
+            raise CommandError('--since must be before --until')
+        
+        output_dir = Path(options['output_dir'])
+        file_format = options['file_format']
+        compress = options['gzip']
+        try:
+            output_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            raise CommandError(f"Cannot create output directory: {str(e)}")
+        
+        self.stdout.write(self.style.SUCCESS('\n=== Export Statements ==='))
+        self.stdout.write(
+            f"Output: {output_dir} ({file_format}{', gzip' if compress else ''})\n"
+        )
+        
+        rows = WalletService.iter_all_statement_rows(
+            since=since,
+            until=until,
+            chunk_size=options['chunk_size']
+        )
+        started = time.perf_counter()
+        files = 0
+        written = 0
+        
+        # Rows arrive ordered by wallet, so each wallet's rows are one
+        # contiguous run: only the current file is open and nothing is
+        # held beyond the database fetch and the encoder's buffer.
+        for (wallet_id, user_id), wallet_rows in groupby(rows, key=itemgetter(0, 1)):
+            counter = _RowCounter()
+            chunks = iter_export(
+                file_format,
+                STATEMENT_EXPORT_FIELDS,
+                counter.strip(wallet_rows),
+                compress=compress
+            )
+            path = output_dir / export_filename(f'statement_user_{user_id}', file_format, compress)
+            try:
+                with open(path, 'wb') as output_file:
+                    for chunk in chunks:
+                        output_file.write(chunk)
+            except OSError as e:
+                raise CommandError(f"Failed to write {path}: {str(e)}")
+            
+            files += 1
+            written += counter.count
+            if options['verbosity'] > 1:
+                self.stdout.write(f"[OK] {path.name}: {counter.count} transactions")
+        
+        elapsed = time.perf_counter() - started
+        self.stdout.write('\n' + '=' * 50)
+        self.stdout.write(self.style.SUCCESS('\n=== Export Summary ===\n'))
+        self.stdout.write(f'Statement files: {files}')
+        self.stdout.write(f'Transactions:    {written}')
+        self.stdout.write(
+            f"Time: {elapsed:.2f}s ({written / elapsed if elapsed else 0:.0f} rows/sec)"
+        )
+        self.stdout.write('\n' + '=' * 50 + '\n')
+    
+    def _parse_date(self, value, option):
+        if value is None:
+            return None
+        try:
+            return timezone.make_aware(datetime.strptime(value, '%Y-%m-%d'))
+        except ValueError:
+            raise CommandError(f"Invalid {option} date '{value}', expected YYYY-MM-DD")
+
+
+class _RowCounter:
+    def __init__(self):
+        self.count = 0
+    
+    def strip(self, rows):
+        # Drop the leading wallet and user ids.
+        for row in rows:
+            self.count += 1
+            yield row[2:]
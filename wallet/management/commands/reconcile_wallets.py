@@ -0,0 +1,121 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from typing import Any, Dict, List
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from wallet import reconciliation
+from wallet.reconciliation import LEDGER_CHUNK_SIZE, reconcile_range, wallet_id_ranges
+
+
+def _paise_to_rupees(paise: int) -> Decimal:
+    return (Decimal(paise) / 100).quantize(Decimal('0.01'))
+
+
+class Command(BaseCommand):
+    help = 'Check wallet balances and running totals against the transaction ledger'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Reconcile N wallet-id ranges in parallel processes (default: 1)'
+        )
+        
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=LEDGER_CHUNK_SIZE,
+            help=f'Transactions fetched and summed per chunk (default: {LEDGER_CHUNK_SIZE})'
+        )
+        
+        parser.add_argument(
+            '--show',
+            type=int,
+            default=20,
+            help='Mismatched wallets to list per kind (default: 20)'
+        )
+    
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        chunk_size = max(1, options['chunk_size'])
+        ranges = wallet_id_ranges(workers)
+        
+        self.stdout.write(self.style.SUCCESS('\n=== Wallet Reconciliation ==='))
+        self.stdout.write(
+            f"Workers: {len(ranges)}, chunk size: {chunk_size}, "
+            f"arithmetic: {'numpy' if reconciliation.np is not None else 'python int'}\n"
+        )
+        
+        started = time.perf_counter()
+        results = []
+        if len(ranges) > 1:
+            # Children open their own connections; inherited sockets must
+            # not be shared.
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=len(ranges), initializer=django.setup) as executor:
+                futures = [
+                    executor.submit(reconcile_range, first_id, last_id, chunk_size)
+                    for first_id, last_id in ranges
+                ]
+                for future in futures:
+                    results.append(self._report_range(future.result()))
+        else:
+            for first_id, last_id in ranges:
+                results.append(self._report_range(reconcile_range(first_id, last_id, chunk_size)))
+        
+        self._display_results(results, time.perf_counter() - started, options['show'])
+    
+    def _report_range(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        self.stdout.write(
+            f"[OK] Wallets {result['first_id']}-{result['last_id']}: "
+            f"{result['wallets']} wallets, {result['transactions']} transactions"
+        )
+        return result
+    
+    def _display_results(self, results: List[Dict[str, Any]], elapsed: float, show: int) -> None:
+        wallets = sum(result['wallets'] for result in results)
+        transactions = sum(result['transactions'] for result in results)
+        balance_mismatches = [m for result in results for m in result['balance_mismatches']]
+        running_mismatches = [m for result in results for m in result['running_mismatches']]
+        balance_count = sum(result['balance_mismatch_count'] for result in results)
+        running_count = sum(result['running_mismatch_count'] for result in results)
+        
+        self.stdout.write('\n' + '=' * 50)
+        self.stdout.write(self.style.SUCCESS('\n=== Reconciliation Summary ===\n'))
+        self.stdout.write(f"Wallets checked: {wallets}")
+        self.stdout.write(
+            f"Transactions scanned: {transactions} in {elapsed:.2f}s "
+            f"({transactions / elapsed if elapsed else 0:.0f} rows/sec)"
+        )
+        
+        if balance_count:
+            self.stdout.write(self.style.ERROR(f"[-] Balance mismatches: {balance_count}"))
+            for mismatch in balance_mismatches[:show]:
+                self.stdout.write(
+                    f"  - Wallet {mismatch['wallet_id']} (user {mismatch['user_id']}): "
+                    f"balance {_paise_to_rupees(mismatch['balance'])}, "
+                    f"ledger {_paise_to_rupees(mismatch['ledger_total'])}"
+                )
+        
+        if running_count:
+            self.stdout.write(self.style.ERROR(f"[-] Running total breaks: {running_count}"))
+            for mismatch in running_mismatches[:show]:
+                self.stdout.write(
+                    f"  - Wallet {mismatch['wallet_id']} (user {mismatch['user_id']}): "
+                    f"transaction {mismatch['transaction_id']} records "
+                    f"{_paise_to_rupees(mismatch['recorded'])}, running total is "
+                    f"{_paise_to_rupees(mismatch['expected'])}"
+                )
+        
+        self.stdout.write('\n' + '=' * 50 + '\n')
+        
+        if balance_count or running_count:
+            raise CommandError(
+                f"{balance_count + running_count} wallet checks failed reconciliation"
+            )
+        self.stdout.write(self.style.SUCCESS('[SUCCESS] Every wallet matches its ledger\n'))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth import get_user_model
+
+from core.exceptions import InvalidTransactionError
+from wallet.services import MAX_WALLET_SHARDS, WalletService
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Split a wallet balance across shard rows, or merge it back with 0'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('username', type=str, help='Owner of the wallet')
+        
+        parser.add_argument(
+            'shards',
+            type=int,
+            help=f'Number of shards, 0 to {MAX_WALLET_SHARDS} (0 turns sharding off)'
+        )
+    
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['username']}' not found")
+        
+        try:
+            wallet = WalletService.set_shard_count(user, options['shards'])
+        except InvalidTransactionError as e:
+            raise CommandError(str(e))
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"[OK] {user.username}'s wallet now has {wallet.shard_count} shards "
+                f"(balance {wallet.total_balance})"
+            )
+        )
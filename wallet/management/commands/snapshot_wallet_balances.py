@@ -0,0 +1,102 @@
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from wallet.models import Transaction
+from wallet.services import SNAPSHOT_CHUNK_SIZE, WalletService
+from wallet.snapshots import iter_period_starts, next_period_start, period_start
+
+
+class Command(BaseCommand):
+    help = 'Write daily or monthly wallet balance snapshots from the transaction ledger'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--period',
+            choices=['daily', 'monthly'],
+            default='daily',
+            help='Snapshot at the start of each day or each month (default: daily)'
+        )
+        
+        parser.add_argument(
+            '--as-of',
+            type=str,
+            help=(
+                'Snapshot date, YYYY-MM-DD; balances cover everything before the '
+                'start of the day (or month) containing it. Default: today'
+            )
+        )
+        
+        parser.add_argument(
+            '--backfill',
+            action='store_true',
+            help='Also write every earlier snapshot back to the first transaction'
+        )
+        
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=SNAPSHOT_CHUNK_SIZE,
+            help=f'Wallets per batch (default: {SNAPSHOT_CHUNK_SIZE})'
+        )
+    
+    def handle(self, *args, **options):
+        period = options['period'].upper()
+        last = period_start(period, self._parse_as_of(options['as_of']))
+        
+        boundaries = [last]
+        if options['backfill']:
+            first_timestamp = Transaction.objects.order_by('timestamp').values_list(
+                'timestamp', flat=True
+            ).first()
+            if first_timestamp is not None:
+                # The first boundary with anything before it.
+                first = next_period_start(period, period_start(period, first_timestamp))
+                boundaries = list(iter_period_starts(period, first, last)) or boundaries
+        
+        cutoff = WalletService.snapshot_cutoff()
+        pending = [as_of for as_of in boundaries if as_of > cutoff]
+        boundaries = [as_of for as_of in boundaries if as_of <= cutoff]
+        
+        self.stdout.write(self.style.SUCCESS('\n=== Wallet Snapshots ==='))
+        self.stdout.write(f"Period: {options['period']}, snapshots: {len(boundaries)}\n")
+        
+        started = time.perf_counter()
+        written = 0
+        for as_of in boundaries:
+            stats = WalletService.snapshot_balances(
+                period,
+                as_of,
+                chunk_size=options['chunk_size']
+            )
+            written += stats['written']
+            self.stdout.write(
+                f"[OK] {timezone.localtime(as_of):%Y-%m-%d %H:%M %Z}: "
+                f"{stats['written']} snapshots for {stats['wallets']} wallets"
+            )
+        
+        for as_of in pending:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"[SKIP] {timezone.localtime(as_of):%Y-%m-%d %H:%M %Z}: less than "
+                    f"{settings.WALLET_SNAPSHOT_DELAY}s old, transactions may still be committing"
+                )
+            )
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n[SUCCESS] Wrote {written} snapshots in "
+                f"{time.perf_counter() - started:.2f}s\n"
+            )
+        )
+    
+    def _parse_as_of(self, value):
+        if value is None:
+            return timezone.now()
+        try:
+            return timezone.make_aware(datetime.strptime(value, '%Y-%m-%d'))
+        except ValueError:
+            raise CommandError(f"Invalid --as-of date '{value}', expected YYYY-MM-DD")
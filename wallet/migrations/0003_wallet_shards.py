@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-18 00:17
+
+from decimal import Decimal
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0002_rename_wallet_tran_wallet__b97fb2_idx_transaction_wallet__998df4_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wallet',
+            name='shard_count',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Number of WalletShard sub-balances; 0 keeps the whole balance on this row'),
+        ),
+        migrations.CreateModel(
+            name='WalletShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard_index', models.PositiveSmallIntegerField()),
+                ('balance', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10, validators=[django.core.validators.MinValueValidator(Decimal('0.00'))])),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('wallet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shards', to='wallet.wallet')),
+            ],
+            options={
+                'verbose_name': 'Wallet Shard',
+                'verbose_name_plural': 'Wallet Shards',
+                'db_table': 'wallet_shards',
+                'ordering': ['wallet', 'shard_index'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='walletshard',
+            constraint=models.UniqueConstraint(fields=('wallet', 'shard_index'), name='unique_wallet_shard'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.30 on 2026-10-18 00:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0003_wallet_shards'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WalletSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('DAILY', 'Daily'), ('MONTHLY', 'Monthly')], max_length=7)),
+                ('as_of', models.DateTimeField(help_text='The balance covers every transaction timestamped before this instant')),
+                ('balance', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('wallet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='wallet.wallet')),
+            ],
+            options={
+                'verbose_name': 'Wallet Snapshot',
+                'verbose_name_plural': 'Wallet Snapshots',
+                'db_table': 'wallet_snapshots',
+                'ordering': ['-as_of'],
+                'indexes': [models.Index(fields=['wallet', '-as_of'], name='wallet_snap_wallet__9081e6_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='walletsnapshot',
+            constraint=models.UniqueConstraint(fields=('wallet', 'period', 'as_of'), name='unique_wallet_snapshot'),
+        ),
+    ]
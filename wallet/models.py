@@ -1,6 +1,7 @@
 from django.db import models
 from django.conf import settings
 from django.core.validators import MinValueValidator
+from django.db.models import Sum
 from decimal import Decimal
 
 
@@ -18,6 +19,11 @@ class Wallet(models.Model):
         validators=[MinValueValidator(Decimal('0.00'))]
     )
     
+    shard_count = models.PositiveSmallIntegerField(
+        default=0,
+        help_text='Number of WalletShard sub-balances; 0 keeps the whole balance on this row'
+    )
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -28,11 +34,54 @@ class Wallet(models.Model):
         ordering = ['-created_at']
     
     def __str__(self) -> str:
-        return f"{self.user.username}'s Wallet - ₹{self.balance}"
+        return f"{self.user.username}'s Wallet - ₹{self.total_balance}"
+    
+    @property
+    def total_balance(self) -> Decimal:
+        # A sharded wallet's balance is this row's base balance plus its
+        # shards; an unsharded one needs no extra query.
+        if not self.shard_count:
+            return self.balance
+        shard_total = self.shards.aggregate(total=Sum('balance'))['total']
+        return (self.balance + (shard_total or Decimal('0.00'))).quantize(Decimal('0.01'))
     
     @property
     def has_sufficient_balance(self) -> bool:
-        return self.balance > Decimal('0.00')
+        return self.total_balance > Decimal('0.00')
+
+
+class WalletShard(models.Model):
+    wallet = models.ForeignKey(
+        Wallet,
+        on_delete=models.CASCADE,
+        related_name='shards'
+    )
+    
+    shard_index = models.PositiveSmallIntegerField()
+    
+    balance = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        validators=[MinValueValidator(Decimal('0.00'))]
+    )
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'wallet_shards'
+        verbose_name = 'Wallet Shard'
+        verbose_name_plural = 'Wallet Shards'
+        ordering = ['wallet', 'shard_index']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['wallet', 'shard_index'],
+                name='unique_wallet_shard'
+            ),
+        ]
+    
+    def __str__(self) -> str:
+        return f"Wallet {self.wallet_id} shard {self.shard_index} - ₹{self.balance}"
 
 
 class Transaction(models.Model):
@@ -80,3 +129,42 @@ class Transaction(models.Model):
             f"{self.get_transaction_type_display()} - "
             f"₹{self.amount} - {self.description}"
         )
+
+
+class WalletSnapshot(models.Model):
+    class Period(models.TextChoices):
+        DAILY = 'DAILY', 'Daily'
+        MONTHLY = 'MONTHLY', 'Monthly'
+    
+    wallet = models.ForeignKey(
+        Wallet,
+        on_delete=models.CASCADE,
+        related_name='snapshots'
+    )
+    
+    period = models.CharField(max_length=7, choices=Period.choices)
+    
+    as_of = models.DateTimeField(
+        help_text='The balance covers every transaction timestamped before this instant'
+    )
+    
+    balance = models.DecimalField(max_digits=12, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'wallet_snapshots'
+        verbose_name = 'Wallet Snapshot'
+        verbose_name_plural = 'Wallet Snapshots'
+        ordering = ['-as_of']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['wallet', 'period', 'as_of'],
+                name='unique_wallet_snapshot'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['wallet', '-as_of']),
+        ]
+    
+    def __str__(self) -> str:
+        return f"Wallet {self.wallet_id} {self.get_period_display()} {self.as_of:%Y-%m-%d} - ₹{self.balance}"
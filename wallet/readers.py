@@ -0,0 +1,75 @@
+import csv
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, TextIO
+
+
+CREDIT_FILE_FORMATS = {
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+}
+REQUIRED_CREDIT_COLUMNS = ['user_id', 'amount']
+
+
+def get_credit_file_format(filename: str) -> Optional[str]:
+    return CREDIT_FILE_FORMATS.get(Path(filename).suffix.lower())
+
+
+def iter_credit_records(stream: TextIO, file_format: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream ``user_id, amount[, description]`` records out of a CSV or JSONL
+    file as dicts, each with a ``_row_number`` for error messages. Problems
+    with the file itself raise ``ValueError``; bad values are left to
+    ``validate_credit_record``.
+    """
+    if file_format == 'csv':
+        return _iter_csv_records(stream)
+    if file_format == 'jsonl':
+        return _iter_jsonl_records(stream)
+    raise ValueError(f"Unsupported credit file format: {file_format}")
+
+
+def _iter_csv_records(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    rows = csv.reader(stream)
+    header_row = next(rows, None)
+    if header_row is None:
+        return
+    
+    headers = [value.strip().lower() for value in header_row]
+    missing_columns = [column for column in REQUIRED_CREDIT_COLUMNS if column not in headers]
+    if missing_columns:
+        raise ValueError(
+            f"Missing required columns: {', '.join(missing_columns)}. "
+            f"Expected columns: user_id, amount, description"
+        )
+    
+    for row in rows:
+        if not any(value.strip() for value in row):
+            continue
+        
+        record = {
+            header: row[idx]
+            for idx, header in enumerate(headers)
+            if header and idx < len(row)
+        }
+        record['_row_number'] = rows.line_num
+        yield record
+
+
+def _iter_jsonl_records(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Line {line_number}: invalid JSON ({e.msg})")
+        
+        if not isinstance(record, dict):
+            raise ValueError(f"Line {line_number}: expected a JSON object")
+        
+        record = {str(key).strip().lower(): value for key, value in record.items()}
+        record['_row_number'] = line_number
+        yield record
@@ -0,0 +1,250 @@
+from itertools import chain, islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.db.models import BigIntegerField, DecimalField, F, Sum, Value
+from django.db.models.functions import Cast, Coalesce, Round
+
+from .models import Transaction, Wallet
+from .services import WalletService
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+LEDGER_CHUNK_SIZE = 100000
+MAX_REPORTED_MISMATCHES = 1000
+
+
+def to_paise(expression) -> Cast:
+    return Cast(Round(expression * Value(100)), BigIntegerField())
+
+
+def wallet_id_ranges(workers: int) -> List[Tuple[int, int]]:
+    """
+    Split the wallet ids into ``workers`` contiguous, inclusive ranges. Each
+    range is reconciled on its own, so a worker never needs rows of a
+    wallet outside its range.
+    """
+    bounds = Wallet.objects.order_by().values_list('id', flat=True)
+    first_id, last_id = bounds.order_by('id').first(), bounds.order_by('-id').first()
+    if first_id is None:
+        return []
+    
+    workers = max(1, min(workers, last_id - first_id + 1))
+    span = (last_id - first_id + 1) // workers
+    ranges = []
+    for index in range(workers):
+        start = first_id + index * span
+        end = last_id if index == workers - 1 else start + span - 1
+        ranges.append((start, end))
+    return ranges
+
+
+def reconcile_range(
+    first_id: int,
+    last_id: int,
+    chunk_size: int = LEDGER_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """
+    Check every wallet with an id in ``[first_id, last_id]``: its balance
+    (base plus shards) must equal its credits minus debits, and each
+    ``balance_after_transaction`` must equal the running total up to that
+    row.
+    
+    Transactions are streamed in wallet, timestamp, id order as integer
+    paise, ``chunk_size`` rows at a time, and running totals are computed a
+    chunk at a time (with NumPy when installed), so no Decimal is built per
+    row and memory is bounded by the chunk size. Wallets are streamed in id
+    order alongside and merged with the per-wallet totals. Sharded wallets
+    only get the balance check, since their ``balance_after_transaction``
+    is not a strict running total.
+    """
+    result = {
+        'first_id': first_id,
+        'last_id': last_id,
+        'wallets': 0,
+        'transactions': 0,
+        'balance_mismatch_count': 0,
+        'running_mismatch_count': 0,
+        'balance_mismatches': [],
+        'running_mismatches': []
+    }
+    
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            # Both streams must see the same snapshot, or a purchase that
+            # commits between them shows up as a mismatch.
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ')
+        
+        wallets = _iter_wallet_totals(first_id, last_id, chunk_size)
+        pending_wallet = next(wallets, None)
+        
+        for segment in _iter_ledger_segments(first_id, last_id, chunk_size, result):
+            wallet_id = segment[0]
+            while pending_wallet is not None and pending_wallet[0] < wallet_id:
+                _check_wallet(pending_wallet, None, result)
+                pending_wallet = next(wallets, None)
+            
+            if pending_wallet is not None and pending_wallet[0] == wallet_id:
+                _check_wallet(pending_wallet, segment, result)
+                pending_wallet = next(wallets, None)
+        
+        while pending_wallet is not None:
+            _check_wallet(pending_wallet, None, result)
+            pending_wallet = next(wallets, None)
+    
+    return result
+
+
+def _iter_wallet_totals(first_id: int, last_id: int, chunk_size: int) -> Iterator[tuple]:
+    return Wallet.objects.filter(
+        id__gte=first_id,
+        id__lte=last_id
+    ).order_by('id').annotate(
+        shard_total=Coalesce(
+            Sum('shards__balance'),
+            Value(0),
+            output_field=DecimalField(max_digits=12, decimal_places=2)
+        )
+    ).values_list(
+        'id',
+        'user_id',
+        to_paise(F('balance') + F('shard_total')),
+        'shard_count'
+    ).iterator(chunk_size=chunk_size)
+
+
+def _iter_ledger_segments(
+    first_id: int,
+    last_id: int,
+    chunk_size: int,
+    result: Dict[str, Any]
+) -> Iterator[list]:
+    """
+    Yield one ``[wallet_id, total, count, first_break]`` segment per wallet
+    with transactions, in wallet id order. ``first_break`` is
+    ``(transaction_id, expected, recorded)`` for the first row whose
+    ``balance_after_transaction`` differs from the running total, or None.
+    """
+    rows = Transaction.objects.filter(
+        wallet_id__gte=first_id,
+        wallet_id__lte=last_id
+    ).order_by('wallet_id', 'timestamp', 'id').values_list(
+        'wallet_id',
+        to_paise(WalletService.signed_amount()),
+        to_paise(F('balance_after_transaction')),
+        'id'
+    ).iterator(chunk_size=chunk_size)
+    
+    running_totals = _running_totals_numpy if np is not None else _running_totals_python
+    open_segment = None
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        result['transactions'] += len(chunk)
+        
+        segments = running_totals(chunk, open_segment)
+        open_segment = segments.pop()
+        yield from segments
+    
+    if open_segment is not None:
+        yield open_segment
+
+
+def _running_totals_python(chunk: List[tuple], open_segment: Optional[list]) -> List[list]:
+    # Plain ints throughout; the last segment may continue in the next chunk
+    # and is returned last, still open.
+    segments = []
+    segment = open_segment
+    for wallet_id, amount, recorded, transaction_id in chunk:
+        if segment is None or segment[0] != wallet_id:
+            if segment is not None:
+                segments.append(segment)
+            segment = [wallet_id, 0, 0, None]
+        
+        segment[1] += amount
+        segment[2] += 1
+        if segment[3] is None and segment[1] != recorded:
+            segment[3] = (transaction_id, segment[1], recorded)
+    
+    segments.append(segment)
+    return segments
+
+
+def _running_totals_numpy(chunk: List[tuple], open_segment: Optional[list]) -> List[list]:
+    data = np.fromiter(
+        chain.from_iterable(chunk),
+        dtype=np.int64,
+        count=4 * len(chunk)
+    ).reshape(-1, 4)
+    wallet_ids, amounts, recorded, transaction_ids = data.T
+    
+    starts = np.flatnonzero(np.r_[True, wallet_ids[1:] != wallet_ids[:-1]])
+    lengths = np.diff(np.r_[starts, len(wallet_ids)])
+    
+    # One cumulative sum for the whole chunk, then each wallet's segment is
+    # shifted back to start from zero (or from the open segment's total).
+    running = np.cumsum(amounts)
+    offsets = np.where(starts > 0, running[starts - 1], 0)
+    continues = open_segment is not None and open_segment[0] == wallet_ids[0]
+    if continues:
+        offsets[0] -= open_segment[1]
+    running -= np.repeat(offsets, lengths)
+    
+    breaks = np.flatnonzero(running != recorded)
+    break_segments, first_breaks = np.unique(
+        np.searchsorted(starts, breaks, side='right') - 1,
+        return_index=True
+    )
+    first_break_by_segment = dict(zip(break_segments.tolist(), breaks[first_breaks].tolist()))
+    
+    segments = []
+    if open_segment is not None and not continues:
+        segments.append(open_segment)
+    
+    ends = starts + lengths - 1
+    for index, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+        segment = [int(wallet_ids[start]), int(running[end]), int(lengths[index]), None]
+        if index == 0 and continues:
+            segment[2] += open_segment[2]
+            segment[3] = open_segment[3]
+        
+        row = first_break_by_segment.get(index)
+        if segment[3] is None and row is not None:
+            segment[3] = (int(transaction_ids[row]), int(running[row]), int(recorded[row]))
+        segments.append(segment)
+    
+    return segments
+
+
+def _check_wallet(wallet: tuple, segment: Optional[list], result: Dict[str, Any]) -> None:
+    wallet_id, user_id, balance, shard_count = wallet
+    ledger_total = segment[1] if segment is not None else 0
+    result['wallets'] += 1
+    
+    if balance != ledger_total:
+        result['balance_mismatch_count'] += 1
+        if len(result['balance_mismatches']) < MAX_REPORTED_MISMATCHES:
+            result['balance_mismatches'].append({
+                'wallet_id': wallet_id,
+                'user_id': user_id,
+                'balance': balance,
+                'ledger_total': ledger_total
+            })
+    
+    if segment is not None and segment[3] is not None and not shard_count:
+        transaction_id, expected, recorded = segment[3]
+        result['running_mismatch_count'] += 1
+        if len(result['running_mismatches']) < MAX_REPORTED_MISMATCHES:
+            result['running_mismatches'].append({
+                'wallet_id': wallet_id,
+                'user_id': user_id,
+                'transaction_id': transaction_id,
+                'expected': expected,
+                'recorded': recorded
+            })
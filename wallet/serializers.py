@@ -1,10 +1,22 @@
 from rest_framework import serializers
 from .models import Wallet, Transaction
 from core.validators import validate_positive_amount
+from .readers import CREDIT_FILE_FORMATS, get_credit_file_format
+
+
+# Records accepted per bulk credit request, JSON or file. Larger runs go
+# through the bulk_credit_wallets command, which commits per chunk.
+MAX_BULK_CREDITS = 10000
 
 
 class WalletSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
+    balance = serializers.DecimalField(
+        source='total_balance',
+        max_digits=12,
+        decimal_places=2,
+        read_only=True
+    )
     has_sufficient_balance = serializers.BooleanField(read_only=True)
     
     class Meta:
@@ -57,7 +69,98 @@ class TransactionFilterSerializer(serializers.Serializer):
         min_value=1,
         max_value=100
     )
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+    
+    def validate(self, attrs):
+        since = attrs.get('since')
+        until = attrs.get('until')
+        if since and until and since > until:
+            raise serializers.ValidationError("'since' must be earlier than 'until'")
+        return attrs
+
+
+class CreditRecordSerializer(serializers.Serializer):
+    user_id = serializers.IntegerField(min_value=1)
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2)
+    description = serializers.CharField(
+        max_length=255,
+        required=False,
+        default='Wallet credit'
+    )
+    
+    def validate_amount(self, value):
+        return validate_positive_amount(value)
+
+
+class BulkCreditSerializer(serializers.Serializer):
+    credits = CreditRecordSerializer(many=True, required=False, allow_empty=False)
+    file = serializers.FileField(required=False)
+    
+    def validate_credits(self, value):
+        if len(value) > MAX_BULK_CREDITS:
+            raise serializers.ValidationError(
+                f"Cannot submit more than {MAX_BULK_CREDITS} credits at once; "
+                f"use the bulk_credit_wallets command instead"
+            )
+        return value
+    
+    def validate_file(self, value):
+        if get_credit_file_format(value.name) is None:
+            raise serializers.ValidationError(
+                f"Unsupported file type. Expected one of: {', '.join(CREDIT_FILE_FORMATS)}"
+            )
+        return value
+    
+    def validate(self, attrs):
+        if ('credits' in attrs) == ('file' in attrs):
+            raise serializers.ValidationError("Provide either 'credits' or 'file'")
+        return attrs
+
+
+class BalanceQuerySerializer(serializers.Serializer):
+    at = serializers.DateTimeField(required=False)
+
+
+class BalanceSerializer(serializers.Serializer):
+    balance = serializers.DecimalField(max_digits=12, decimal_places=2)
+    at = serializers.DateTimeField(required=False)
+
+
+class StatementQuerySerializer(serializers.Serializer):
+    month = serializers.RegexField(
+        r'^\d{4}-(0[1-9]|1[0-2])$',
+        required=False,
+        error_messages={'invalid': "Month must be in YYYY-MM format"}
+    )
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+    
+    def validate(self, attrs):
+        if 'month' in attrs and ('since' in attrs or 'until' in attrs):
+            raise serializers.ValidationError("Use either 'month' or 'since'/'until'")
+        if 'month' not in attrs and 'since' not in attrs:
+            raise serializers.ValidationError("Provide 'month' or 'since'")
+        
+        since = attrs.get('since')
+        until = attrs.get('until')
+        if since and until and since > until:
+            raise serializers.ValidationError("'since' must be earlier than 'until'")
+        return attrs
 
 
+class StatementSerializer(serializers.Serializer):
+    since = serializers.DateTimeField()
+    until = serializers.DateTimeField()
+    opening_balance = serializers.DecimalField(max_digits=12, decimal_places=2)
+    total_credits = serializers.DecimalField(max_digits=12, decimal_places=2)
+    total_debits = serializers.DecimalField(max_digits=12, decimal_places=2)
+    closing_balance = serializers.DecimalField(max_digits=12, decimal_places=2)
+    transaction_count = serializers.IntegerField()
 
 
+class TransactionExportSerializer(TransactionFilterSerializer):
+    limit = None
+    file_format = serializers.ChoiceField(choices=['csv', 'jsonl'], default='csv')
+    gzip = serializers.BooleanField(default=False)
+    chunk_size = serializers.IntegerField(default=2000, min_value=100, max_value=20000)
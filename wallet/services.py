@@ -1,9 +1,20 @@
-from typing import Optional
-from decimal import Decimal
+import random
+import re
+import time
+from datetime import timedelta
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from decimal import Decimal, ROUND_DOWN
+from django.conf import settings
+from django.core.cache import caches
 from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, Max, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
-from .models import Wallet, Transaction
+from .models import Wallet, WalletShard, WalletSnapshot, Transaction
+from .validators import MAX_WALLET_BALANCE, validate_credit_record
 from core.exceptions import (
     InsufficientBalanceError,
     WalletNotFoundError,
@@ -12,8 +23,54 @@ from core.exceptions import (
 
 User = get_user_model()
 
+BALANCE_CACHE_ALIAS = 'wallet'
+MAX_WALLET_SHARDS = 64
+BULK_CREDIT_CHUNK_SIZE = 1000
+SNAPSHOT_CHUNK_SIZE = 2000
+STATEMENT_EXPORT_FIELDS = [
+    'id', 'timestamp', 'transaction_type', 'amount', 'balance_after_transaction', 'description'
+]
+ROW_NUMBER_RE = re.compile(r'^Row (\d+):')
+
+
+def _error_row_number(error: str) -> int:
+    match = ROW_NUMBER_RE.match(error)
+    return int(match.group(1)) if match else 0
+
 
 class WalletService:
+    @staticmethod
+    def _balance_cache_key(user_id: int) -> str:
+        return f"wallet:balance:{user_id}"
+    
+    @staticmethod
+    def _balance_version_key(user_id: int) -> str:
+        return f"wallet:balance-version:{user_id}"
+    
+    @staticmethod
+    def invalidate_balance_cache(user_id: int) -> None:
+        WalletService.invalidate_balance_caches([user_id])
+    
+    @staticmethod
+    def invalidate_balance_caches(user_ids: Iterable[int]) -> None:
+        # Bump each user's version rather than deleting the entry: a read
+        # that fetched the balance before this commit and stores it after
+        # the bump is tagged with the old version, so it is never served.
+        version_keys = [WalletService._balance_version_key(user_id) for user_id in user_ids]
+        transaction.on_commit(
+            lambda: WalletService._bump_balance_versions(version_keys)
+        )
+    
+    @staticmethod
+    def _bump_balance_versions(version_keys: List[str]) -> None:
+        cache = caches[BALANCE_CACHE_ALIAS]
+        for version_key in version_keys:
+            try:
+                cache.incr(version_key)
+            except ValueError:
+                if not cache.add(version_key, time.time_ns()):
+                    cache.incr(version_key)
+    
     @staticmethod
     def get_or_create_wallet(user: User) -> Wallet:
         wallet, created = Wallet.objects.get_or_create(
@@ -29,6 +86,164 @@ class WalletService:
         except Wallet.DoesNotExist:
             raise WalletNotFoundError(f"Wallet not found for user {user.username}")
     
+    @staticmethod
+    def _total_balance(**filters) -> Optional[Decimal]:
+        # Base balance plus shards in a single statement, so the two parts
+        # are read from the same snapshot.
+        row = Wallet.objects.filter(**filters).annotate(
+            shard_total=Coalesce(
+                Sum('shards__balance'),
+                Value(Decimal('0.00')),
+                output_field=DecimalField(max_digits=12, decimal_places=2)
+            )
+        ).values_list('balance', 'shard_total').first()
+        
+        if row is None:
+            return None
+        return (row[0] + row[1]).quantize(Decimal('0.01'))
+    
+    @staticmethod
+    @transaction.atomic
+    def set_shard_count(user: User, shard_count: int) -> Wallet:
+        """
+        Split a wallet's balance across ``shard_count`` shard rows, or fold
+        it back into the wallet row with 0. The existing total is kept and
+        spread evenly over the new shards.
+        """
+        if not 0 <= shard_count <= MAX_WALLET_SHARDS:
+            raise InvalidTransactionError(
+                f"Shard count must be between 0 and {MAX_WALLET_SHARDS}"
+            )
+        
+        wallet = WalletService.get_or_create_wallet(user)
+        wallet, shards = WalletService._lock_wallet_and_shards(wallet.pk)
+        total = wallet.balance + sum(shard.balance for shard in shards)
+        
+        WalletShard.objects.filter(
+            wallet=wallet,
+            shard_index__gte=shard_count
+        ).delete()
+        existing = {shard.shard_index: shard for shard in shards}
+        shards = [
+            existing.get(index) or WalletShard.objects.create(wallet=wallet, shard_index=index)
+            for index in range(shard_count)
+        ]
+        
+        wallet.shard_count = shard_count
+        WalletService._spread_balance(wallet, shards, total)
+        WalletService.invalidate_balance_cache(user.id)
+        
+        return wallet
+    
+    @staticmethod
+    def _lock_wallet_and_shards(wallet_id: int):
+        # Lock order is always the wallet row, then its shards by index.
+        wallet = Wallet.objects.select_for_update().get(pk=wallet_id)
+        shards = list(
+            WalletShard.objects.select_for_update()
+            .filter(wallet_id=wallet_id)
+            .order_by('shard_index')
+        )
+        return wallet, shards
+    
+    @staticmethod
+    def _spread_balance(wallet: Wallet, shards: List[WalletShard], total: Decimal) -> None:
+        per_shard = Decimal('0.00')
+        if shards:
+            per_shard = (total / len(shards)).quantize(Decimal('0.01'), rounding=ROUND_DOWN)
+            for shard in shards:
+                shard.balance = per_shard
+            WalletShard.objects.bulk_update(shards, ['balance'])
+        
+        wallet.balance = total - per_shard * len(shards)
+        wallet.save(update_fields=['balance', 'shard_count', 'updated_at'])
+    
+    @staticmethod
+    def _credit_sharded(wallet: Wallet, amount: Decimal) -> None:
+        # Credits never need a balance check, so any shard will do.
+        updated = WalletShard.objects.filter(
+            wallet=wallet,
+            shard_index=random.randrange(wallet.shard_count)
+        ).update(
+            balance=F('balance') + amount,
+            updated_at=timezone.now()
+        )
+        
+        if not updated:
+            # The shard went away with a concurrent set_shard_count().
+            Wallet.objects.filter(pk=wallet.pk).update(
+                balance=F('balance') + amount,
+                updated_at=timezone.now()
+            )
+    
+    @staticmethod
+    def _debit_sharded(wallet: Wallet, amount: Decimal) -> None:
+        """
+        Take ``amount`` from a sharded wallet without locking the wallet row
+        in the common case: a guarded update on a random shard, then on the
+        other shards that look funded, then on the base balance. Only when
+        no single row holds enough is everything locked, pooled and
+        re-spread, which also refills the shards for later debits.
+        """
+        now = timezone.now()
+        
+        def take_from_shard(index: int) -> bool:
+            return bool(WalletShard.objects.filter(
+                wallet=wallet,
+                shard_index=index,
+                balance__gte=amount
+            ).update(balance=F('balance') - amount, updated_at=now))
+        
+        first_choice = random.randrange(wallet.shard_count)
+        if take_from_shard(first_choice):
+            return
+        
+        candidates = [
+            index
+            for index, balance in WalletShard.objects.filter(wallet=wallet)
+            .exclude(shard_index=first_choice)
+            .values_list('shard_index', 'balance')
+            if balance >= amount
+        ]
+        random.shuffle(candidates)
+        for index in candidates:
+            if take_from_shard(index):
+                return
+        
+        if Wallet.objects.filter(pk=wallet.pk, balance__gte=amount).update(
+            balance=F('balance') - amount,
+            updated_at=now
+        ):
+            return
+        
+        locked_wallet, shards = WalletService._lock_wallet_and_shards(wallet.pk)
+        total = locked_wallet.balance + sum(shard.balance for shard in shards)
+        if total < amount:
+            raise InsufficientBalanceError(
+                required_balance=float(amount),
+                available_balance=float(total)
+            )
+        WalletService._spread_balance(locked_wallet, shards, total - amount)
+    
+    @staticmethod
+    def _record_sharded_transaction(
+        wallet: Wallet,
+        transaction_type: str,
+        amount: Decimal,
+        description: str
+    ) -> Transaction:
+        WalletService.invalidate_balance_cache(wallet.user_id)
+        
+        # Other shards may change concurrently, so this is the total as seen
+        # right after this change rather than a strict running balance.
+        return Transaction.objects.create(
+            wallet=wallet,
+            transaction_type=transaction_type,
+            amount=amount,
+            balance_after_transaction=WalletService._total_balance(pk=wallet.pk),
+            description=description
+        )
+    
     @staticmethod
     @transaction.atomic
     def credit_wallet(
@@ -40,10 +255,18 @@ class WalletService:
             raise InvalidTransactionError("Credit amount must be greater than zero")
         
         wallet = WalletService.get_or_create_wallet(user)
-        wallet = Wallet.objects.select_for_update().get(pk=wallet.pk)
+        if not wallet.shard_count:
+            wallet = Wallet.objects.select_for_update().get(pk=wallet.pk)
+        
+        if wallet.shard_count:
+            WalletService._credit_sharded(wallet, amount)
+            return WalletService._record_sharded_transaction(
+                wallet, Transaction.TransactionType.CREDIT, amount, description
+            )
         
         wallet.balance += amount
         wallet.save(update_fields=['balance', 'updated_at'])
+        WalletService.invalidate_balance_cache(user.id)
         
         transaction_record = Transaction.objects.create(
             wallet=wallet,
@@ -66,7 +289,14 @@ class WalletService:
             raise InvalidTransactionError("Debit amount must be greater than zero")
         
         wallet = WalletService.get_wallet(user)
-        wallet = Wallet.objects.select_for_update().get(pk=wallet.pk)
+        if not wallet.shard_count:
+            wallet = Wallet.objects.select_for_update().get(pk=wallet.pk)
+        
+        if wallet.shard_count:
+            WalletService._debit_sharded(wallet, amount)
+            return WalletService._record_sharded_transaction(
+                wallet, Transaction.TransactionType.DEBIT, amount, description
+            )
         
         if wallet.balance < amount:
             raise InsufficientBalanceError(
@@ -76,6 +306,7 @@ class WalletService:
         
         wallet.balance -= amount
         wallet.save(update_fields=['balance', 'updated_at'])
+        WalletService.invalidate_balance_cache(user.id)
         
         transaction_record = Transaction.objects.create(
             wallet=wallet,
@@ -87,10 +318,255 @@ class WalletService:
         
         return transaction_record
     
+    @staticmethod
+    @transaction.atomic
+    def debit_wallet_conditional(
+        user: User,
+        amount: Decimal,
+        description: str = "Wallet debit"
+    ) -> Transaction:
+        if amount <= 0:
+            raise InvalidTransactionError("Debit amount must be greater than zero")
+        
+        updated = Wallet.objects.filter(
+            user=user,
+            shard_count=0,
+            balance__gte=amount
+        ).update(
+            balance=F('balance') - amount,
+            updated_at=timezone.now()
+        )
+        
+        wallet = WalletService.get_wallet(user)
+        
+        if not updated and wallet.shard_count:
+            WalletService._debit_sharded(wallet, amount)
+            return WalletService._record_sharded_transaction(
+                wallet, Transaction.TransactionType.DEBIT, amount, description
+            )
+        
+        if not updated:
+            raise InsufficientBalanceError(
+                required_balance=float(amount),
+                available_balance=float(wallet.balance)
+            )
+        
+        WalletService.invalidate_balance_cache(user.id)
+        
+        transaction_record = Transaction.objects.create(
+            wallet=wallet,
+            transaction_type=Transaction.TransactionType.DEBIT,
+            amount=amount,
+            balance_after_transaction=wallet.balance,
+            description=description
+        )
+        
+        return transaction_record
+    
+    @staticmethod
+    def bulk_credit(
+        records: Iterable[Dict[str, Any]],
+        chunk_size: int = BULK_CREDIT_CHUNK_SIZE,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Credit many wallets from ``{'user_id', 'amount', 'description'}``
+        records, ``chunk_size`` records per transaction.
+        
+        Each chunk locks its wallets in id order, creates missing wallets,
+        adds every wallet's total with one ``balance + CASE id WHEN ... END``
+        update and writes the ledger with one ``bulk_create``. Records for
+        the same wallet get consecutive ``balance_after_transaction`` values
+        in input order. Invalid records and unknown users are reported in
+        ``errors`` and skipped. Wrap the call in ``transaction.atomic()`` to
+        make the whole run all-or-nothing.
+        """
+        stats = {
+            'total': 0,
+            'credited': 0,
+            'rejected': 0,
+            'total_amount': Decimal('0.00'),
+            'wallets_credited': 0,
+            'errors': []
+        }
+        
+        credited_wallet_ids = set()
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, max(1, chunk_size)))
+            if not chunk:
+                break
+            
+            first_error = len(stats['errors'])
+            validated = []
+            for position, record in enumerate(chunk, start=stats['total'] + 1):
+                row_number = record.get('_row_number', position)
+                try:
+                    validated.append((row_number, validate_credit_record(record)))
+                except ValueError as e:
+                    stats['errors'].append(f"Row {row_number}: {str(e)}")
+            
+            stats['total'] += len(chunk)
+            stats['rejected'] += len(chunk) - len(validated)
+            if validated:
+                credited_wallet_ids |= WalletService._credit_chunk(validated, stats)
+                stats['wallets_credited'] = len(credited_wallet_ids)
+            
+            # Validation and crediting each report in input order; merge the
+            # chunk's two lists so errors read top to bottom.
+            stats['errors'][first_error:] = sorted(
+                stats['errors'][first_error:], key=_error_row_number
+            )
+            
+            if progress is not None:
+                progress(stats)
+        
+        return stats
+    
+    @staticmethod
+    @transaction.atomic
+    def _credit_chunk(
+        validated: List[Tuple[Any, Dict[str, Any]]],
+        stats: Dict[str, Any]
+    ) -> Set[int]:
+        user_ids = sorted({record['user_id'] for _, record in validated})
+        
+        # Only customers hold wallets (see wallet.signals); admins and other
+        # roles are rejected rather than given one.
+        roles = dict(User.objects.filter(id__in=user_ids).values_list('id', 'role'))
+        customer_ids = [
+            user_id for user_id in user_ids if roles.get(user_id) == User.Role.CUSTOMER
+        ]
+        
+        missing_user_ids = set(customer_ids) - set(
+            Wallet.objects.filter(user_id__in=customer_ids).values_list('user_id', flat=True)
+        )
+        if missing_user_ids:
+            Wallet.objects.bulk_create(
+                [Wallet(user_id=user_id) for user_id in sorted(missing_user_ids)],
+                ignore_conflicts=True
+            )
+        
+        wallets = {
+            user_id: {'id': wallet_id, 'base': balance, 'sharded': bool(shard_count)}
+            for wallet_id, user_id, balance, shard_count in Wallet.objects.select_for_update()
+            .filter(user_id__in=customer_ids)
+            .order_by('id')
+            .values_list('id', 'user_id', 'balance', 'shard_count')
+        }
+        
+        shard_totals = {}
+        sharded_ids = [wallet['id'] for wallet in wallets.values() if wallet['sharded']]
+        if sharded_ids:
+            shard_totals = dict(
+                WalletShard.objects.filter(wallet_id__in=sharded_ids)
+                .values('wallet_id')
+                .annotate(total=Sum('balance'))
+                .values_list('wallet_id', 'total')
+            )
+        
+        # Credits land on the base balance; the running total only adds the
+        # shards so each ledger row shows the wallet's whole balance.
+        running = {
+            wallet['id']: wallet['base'] + (shard_totals.get(wallet['id']) or Decimal('0.00'))
+            for wallet in wallets.values()
+        }
+        increments: Dict[int, Decimal] = {}
+        ledger = []
+        
+        for row_number, record in validated:
+            wallet = wallets.get(record['user_id'])
+            if wallet is None:
+                stats['rejected'] += 1
+                if record['user_id'] in roles:
+                    message = f"User with ID {record['user_id']} is not a customer"
+                else:
+                    message = f"User with ID {record['user_id']} not found"
+                stats['errors'].append(f"Row {row_number}: {message}")
+                continue
+            
+            wallet_id, amount = wallet['id'], record['amount']
+            # ``running`` includes the shards, so the cap applies to the
+            # whole balance of a sharded wallet, not just its base.
+            if running[wallet_id] + amount > MAX_WALLET_BALANCE:
+                stats['rejected'] += 1
+                stats['errors'].append(
+                    f"Row {row_number}: Balance would exceed {MAX_WALLET_BALANCE}"
+                )
+                continue
+            
+            increments[wallet_id] = increments.get(wallet_id, Decimal('0.00')) + amount
+            running[wallet_id] += amount
+            ledger.append(Transaction(
+                wallet_id=wallet_id,
+                transaction_type=Transaction.TransactionType.CREDIT,
+                amount=amount,
+                balance_after_transaction=running[wallet_id].quantize(Decimal('0.01')),
+                description=record['description']
+            ))
+        
+        if increments:
+            # Payout files mostly repeat a few amounts, so wallets are grouped
+            # by increment: one WHEN per distinct amount, not per wallet.
+            wallets_by_increment: Dict[Decimal, List[int]] = {}
+            for wallet_id, increment in increments.items():
+                wallets_by_increment.setdefault(increment, []).append(wallet_id)
+            
+            Wallet.objects.filter(id__in=list(increments)).update(
+                balance=F('balance') + Case(
+                    *[
+                        When(id__in=wallet_ids, then=Value(increment))
+                        for increment, wallet_ids in wallets_by_increment.items()
+                    ],
+                    default=Value(Decimal('0.00')),
+                    output_field=DecimalField(max_digits=10, decimal_places=2)
+                ),
+                updated_at=timezone.now()
+            )
+            Transaction.objects.bulk_create(ledger)
+            WalletService.invalidate_balance_caches(
+                user_id for user_id, wallet in wallets.items() if wallet['id'] in increments
+            )
+        
+        stats['credited'] += len(ledger)
+        stats['total_amount'] += sum(increments.values(), Decimal('0.00'))
+        return set(increments)
+    
     @staticmethod
     def get_wallet_balance(user: User) -> Decimal:
-        wallet = WalletService.get_or_create_wallet(user)
-        return wallet.balance
+        if not settings.WALLET_CACHE_ENABLED:
+            return WalletService._read_balance(user)
+        
+        cache = caches[BALANCE_CACHE_ALIAS]
+        cache_key = WalletService._balance_cache_key(user.id)
+        version_key = WalletService._balance_version_key(user.id)
+        
+        cached = cache.get_many([cache_key, version_key])
+        version = cached.get(version_key)
+        entry = cached.get(cache_key)
+        if entry is not None and version is not None and entry[0] == version:
+            return entry[1]
+        
+        if version is None:
+            # Start from the clock, so a version key that expired or was
+            # evicted can't come back at a value an old entry was stored
+            # under; that is what lets version keys share the alias timeout.
+            cache.add(version_key, time.time_ns())
+            version = cache.get(version_key)
+        
+        # The version is read before the balance, so a write committing in
+        # between bumps it and this entry is stale on arrival, not served.
+        balance = WalletService._read_balance(user)
+        cache.set(cache_key, (version, balance))
+        
+        return balance
+    
+    @staticmethod
+    def _read_balance(user: User) -> Decimal:
+        balance = WalletService._total_balance(user=user)
+        if balance is None:
+            balance = WalletService.get_or_create_wallet(user).balance
+        return balance
     
     @staticmethod
     def get_transaction_history(
@@ -109,13 +585,213 @@ class WalletService:
         
         return queryset
     
+    @staticmethod
+    def signed_amount() -> Case:
+        return Case(
+            When(transaction_type=Transaction.TransactionType.DEBIT, then=-F('amount')),
+            default=F('amount'),
+            output_field=DecimalField(max_digits=12, decimal_places=2)
+        )
+    
+    @staticmethod
+    def _ledger_balance_at(wallet_id: int, moment) -> Decimal:
+        # Start from the newest snapshot at or before ``moment`` and add up
+        # only the transactions after it, so the cost does not grow with the
+        # wallet's history.
+        snapshot = WalletSnapshot.objects.filter(
+            wallet_id=wallet_id,
+            as_of__lte=moment
+        ).order_by('-as_of').first()
+        
+        tail = Transaction.objects.filter(wallet_id=wallet_id, timestamp__lt=moment)
+        opening = Decimal('0.00')
+        if snapshot is not None:
+            tail = tail.filter(timestamp__gte=snapshot.as_of)
+            opening = snapshot.balance
+        
+        delta = tail.aggregate(total=Sum(WalletService.signed_amount()))['total']
+        return (opening + (delta or Decimal('0.00'))).quantize(Decimal('0.01'))
+    
+    @staticmethod
+    def balance_at(user: User, moment) -> Decimal:
+        """
+        The wallet balance just before ``moment``, from the ledger: every
+        transaction timestamped earlier counts.
+        """
+        wallet = WalletService.get_or_create_wallet(user)
+        return WalletService._ledger_balance_at(wallet.pk, moment)
+    
+    @staticmethod
+    def get_statement(user: User, since, until) -> Dict[str, Any]:
+        wallet = WalletService.get_or_create_wallet(user)
+        opening_balance = WalletService._ledger_balance_at(wallet.pk, since)
+        
+        totals = Transaction.objects.filter(
+            wallet=wallet,
+            timestamp__gte=since,
+            timestamp__lt=until
+        ).aggregate(
+            credits=Sum('amount', filter=Q(transaction_type=Transaction.TransactionType.CREDIT)),
+            debits=Sum('amount', filter=Q(transaction_type=Transaction.TransactionType.DEBIT)),
+            count=Count('id')
+        )
+        total_credits = (totals['credits'] or Decimal('0.00')).quantize(Decimal('0.01'))
+        total_debits = (totals['debits'] or Decimal('0.00')).quantize(Decimal('0.01'))
+        
+        return {
+            'since': since,
+            'until': until,
+            'opening_balance': opening_balance,
+            'total_credits': total_credits,
+            'total_debits': total_debits,
+            'closing_balance': opening_balance + total_credits - total_debits,
+            'transaction_count': totals['count']
+        }
+    
+    @staticmethod
+    def snapshot_cutoff():
+        return timezone.now() - timedelta(seconds=settings.WALLET_SNAPSHOT_DELAY)
+    
+    @staticmethod
+    def snapshot_balances(
+        period: str,
+        as_of,
+        chunk_size: int = SNAPSHOT_CHUNK_SIZE
+    ) -> Dict[str, int]:
+        """
+        Write ``period`` snapshots at ``as_of`` for every wallet with
+        transactions since its previous snapshot, ``chunk_size`` wallets at
+        a time. Each balance is the previous snapshot plus one grouped sum
+        over the transactions since, so taking snapshots in order never
+        rescans old history. Re-running for the same ``as_of`` overwrites
+        the earlier result.
+        
+        ``as_of`` must be at least ``WALLET_SNAPSHOT_DELAY`` seconds old: a
+        transaction is timestamped before it commits, so until then one
+        dated before ``as_of`` may still be in flight.
+        """
+        if as_of > WalletService.snapshot_cutoff():
+            raise ValueError(
+                f"Snapshots at {as_of.isoformat()} are not settled until "
+                f"{settings.WALLET_SNAPSHOT_DELAY}s after it"
+            )
+        
+        stats = {'wallets': 0, 'written': 0}
+        chunk_size = max(1, chunk_size)
+        wallet_ids = list(
+            Wallet.objects.filter(created_at__lt=as_of).order_by('id').values_list('id', flat=True)
+        )
+        
+        for offset in range(0, len(wallet_ids), chunk_size):
+            chunk = wallet_ids[offset:offset + chunk_size]
+            
+            latest = dict(
+                WalletSnapshot.objects.filter(wallet_id__in=chunk, as_of__lt=as_of)
+                .order_by()
+                .values('wallet_id')
+                .annotate(latest=Max('as_of'))
+                .values_list('wallet_id', 'latest')
+            )
+            opening = {}
+            for wallet_id, snapshot_as_of, balance in WalletSnapshot.objects.filter(
+                wallet_id__in=list(latest),
+                as_of__in=set(latest.values())
+            ).values_list('wallet_id', 'as_of', 'balance'):
+                if latest[wallet_id] == snapshot_as_of:
+                    opening[wallet_id] = balance
+            
+            # Wallets snapshotted on the same boundary share one tail query.
+            wallets_by_start: Dict[Any, List[int]] = {}
+            for wallet_id in chunk:
+                wallets_by_start.setdefault(latest.get(wallet_id), []).append(wallet_id)
+            
+            deltas = {}
+            for start, wallet_ids_since in wallets_by_start.items():
+                tail = Transaction.objects.filter(
+                    wallet_id__in=wallet_ids_since,
+                    timestamp__lt=as_of
+                )
+                if start is not None:
+                    tail = tail.filter(timestamp__gte=start)
+                deltas.update(
+                    tail.order_by()
+                    .values('wallet_id')
+                    .annotate(delta=Sum(WalletService.signed_amount()))
+                    .values_list('wallet_id', 'delta')
+                )
+            
+            snapshots = [
+                WalletSnapshot(
+                    wallet_id=wallet_id,
+                    period=period,
+                    as_of=as_of,
+                    balance=(opening.get(wallet_id, Decimal('0.00')) + delta).quantize(Decimal('0.01'))
+                )
+                for wallet_id, delta in deltas.items()
+            ]
+            WalletSnapshot.objects.bulk_create(
+                snapshots,
+                update_conflicts=True,
+                unique_fields=['wallet', 'period', 'as_of'],
+                update_fields=['balance']
+            )
+            
+            stats['wallets'] += len(chunk)
+            stats['written'] += len(snapshots)
+        
+        return stats
+    
+    @staticmethod
+    def _filter_statement_rows(queryset, since=None, until=None, transaction_type=None):
+        if since is not None:
+            queryset = queryset.filter(timestamp__gte=since)
+        if until is not None:
+            queryset = queryset.filter(timestamp__lt=until)
+        if transaction_type:
+            queryset = queryset.filter(transaction_type=transaction_type)
+        return queryset
+    
+    @staticmethod
+    def iter_statement_rows(
+        user: User,
+        since=None,
+        until=None,
+        transaction_type: Optional[str] = None,
+        chunk_size: int = 2000
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        The user's transactions as tuples of ``STATEMENT_EXPORT_FIELDS``,
+        oldest first, fetched ``chunk_size`` at a time.
+        """
+        wallet = WalletService.get_or_create_wallet(user)
+        queryset = WalletService._filter_statement_rows(
+            Transaction.objects.filter(wallet=wallet), since, until, transaction_type
+        )
+        return queryset.order_by('timestamp', 'id').values_list(
+            *STATEMENT_EXPORT_FIELDS
+        ).iterator(chunk_size=chunk_size)
+    
+    @staticmethod
+    def iter_all_statement_rows(
+        since=None,
+        until=None,
+        chunk_size: int = 2000
+    ) -> Iterator[Tuple[Any, ...]]:
+        """
+        Every wallet's transactions as ``(wallet_id, user_id, *fields)``
+        tuples in one ordered pass, grouped by wallet and oldest first
+        within each, so statements for all wallets can be written without a
+        query per wallet.
+        """
+        queryset = WalletService._filter_statement_rows(Transaction.objects.all(), since, until)
+        return queryset.order_by('wallet_id', 'timestamp', 'id').values_list(
+            'wallet_id', 'wallet__user_id', *STATEMENT_EXPORT_FIELDS
+        ).iterator(chunk_size=chunk_size)
+    
     @staticmethod
     def check_sufficient_balance(user: User, required_amount: Decimal) -> bool:
-        try:
-            wallet = WalletService.get_wallet(user)
-            return wallet.balance >= required_amount
-        except WalletNotFoundError:
-            return False
+        balance = WalletService._total_balance(user=user)
+        return balance is not None and balance >= required_amount
 
 
 
@@ -0,0 +1,37 @@
+from datetime import date, datetime, time, timedelta
+from typing import Iterator
+
+from django.utils import timezone
+
+from .models import WalletSnapshot
+
+
+def _start_of(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def period_start(period: str, moment: datetime) -> datetime:
+    """
+    Start of the day or month containing ``moment`` in the current time
+    zone. Snapshots are only taken on these boundaries.
+    """
+    day = timezone.localtime(moment).date()
+    if period == WalletSnapshot.Period.MONTHLY:
+        day = day.replace(day=1)
+    return _start_of(day)
+
+
+def next_period_start(period: str, boundary: datetime) -> datetime:
+    # Step by calendar date rather than by 24 hours, so DST changes can't
+    # land the next boundary back on the same day.
+    day = timezone.localtime(boundary).date()
+    if period == WalletSnapshot.Period.MONTHLY:
+        return _start_of((day.replace(day=1) + timedelta(days=32)).replace(day=1))
+    return _start_of(day + timedelta(days=1))
+
+
+def iter_period_starts(period: str, first: datetime, last: datetime) -> Iterator[datetime]:
+    boundary = period_start(period, first)
+    while boundary <= last:
+        yield boundary
+        boundary = next_period_start(period, boundary)
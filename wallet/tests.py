@@ -1,3 +1,259 @@
-from django.test import TestCase
+from decimal import Decimal
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.exceptions import InsufficientBalanceError
+from wallet.models import Transaction, Wallet, WalletShard
+from wallet.services import BALANCE_CACHE_ALIAS, WalletService
+
+
+User = get_user_model()
+
+
+class WalletTestCase(TestCase):
+    def setUp(self):
+        # Cached balances would otherwise leak between tests, whose user ids
+        # can repeat once each test's transaction is rolled back.
+        caches[BALANCE_CACHE_ALIAS].clear()
+        self.customer = User.objects.create_user(
+            username='wallet_customer',
+            email='wallet_customer@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.customer)
+    
+    def _api_balance(self) -> str:
+        response = self.client.get('/api/wallet/balance/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['data']['balance']
+
+
+@override_settings(WALLET_CACHE_ENABLED=True)
+class CachedBalanceTest(WalletTestCase):
+    def test_cached_balance_changes_after_credit(self):
+        self.assertEqual(self._api_balance(), '0.00')
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            WalletService.credit_wallet(self.customer, Decimal('40.00'))
+        self.assertEqual(self._api_balance(), '40.00')
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            WalletService.debit_wallet(self.customer, Decimal('15.00'))
+        self.assertEqual(self._api_balance(), '25.00')
+    
+    def test_repeat_reads_are_served_from_cache(self):
+        self._api_balance()
+        
+        with self.assertNumQueries(0):
+            self.assertEqual(WalletService.get_wallet_balance(self.customer), Decimal('0.00'))
+    
+    def test_entry_from_before_a_write_is_not_served(self):
+        # An entry stored under the version read before a concurrent write
+        # committed must be ignored once that write bumps the version.
+        self._api_balance()
+        WalletService.credit_wallet(self.customer, Decimal('40.00'))
+        with self.captureOnCommitCallbacks(execute=True):
+            WalletService.invalidate_balance_cache(self.customer.id)
+        
+        self.assertEqual(WalletService.get_wallet_balance(self.customer), Decimal('40.00'))
+    
+    @override_settings(WALLET_CACHE_ENABLED=False)
+    def test_disabled_cache_reads_the_database(self):
+        self._api_balance()
+        WalletService.credit_wallet(self.customer, Decimal('40.00'))
+        
+        self.assertEqual(self._api_balance(), '40.00')
+
+
+# Balances are read from the database so every assertion sees the shards'
+# current sum rather than an entry whose invalidation never commits here.
+@override_settings(WALLET_CACHE_ENABLED=False)
+class ShardedWalletTest(WalletTestCase):
+    def setUp(self):
+        super().setUp()
+        WalletService.credit_wallet(self.customer, Decimal('100.01'))
+        self.wallet = WalletService.set_shard_count(self.customer, 4)
+    
+    def _shard_total(self) -> Decimal:
+        return sum(
+            WalletShard.objects.filter(wallet=self.wallet).values_list('balance', flat=True),
+            Decimal('0.00')
+        )
+    
+    def test_sharding_keeps_the_total(self):
+        self.wallet.refresh_from_db()
+        
+        self.assertEqual(WalletShard.objects.filter(wallet=self.wallet).count(), 4)
+        self.assertEqual(self.wallet.balance + self._shard_total(), Decimal('100.01'))
+        self.assertEqual(WalletService.get_wallet_balance(self.customer), Decimal('100.01'))
+    
+    def test_balance_sums_base_and_shards(self):
+        for amount in ['10.00', '0.50', '7.25', '3.00', '1.10']:
+            WalletService.credit_wallet(self.customer, Decimal(amount))
+        WalletService.debit_wallet(self.customer, Decimal('20.00'))
+        self.wallet.refresh_from_db()
+        
+        expected = Decimal('101.86')
+        self.assertEqual(self.wallet.balance + self._shard_total(), expected)
+        self.assertEqual(WalletService.get_wallet_balance(self.customer), expected)
+        self.assertEqual(self._api_balance(), '101.86')
+        self.assertEqual(self.wallet.total_balance, expected)
+    
+    def test_debit_larger_than_any_shard_pools_the_shards(self):
+        WalletService.debit_wallet(self.customer, Decimal('90.00'))
+        
+        self.assertEqual(WalletService.get_wallet_balance(self.customer), Decimal('10.01'))
+    
+    def test_overdraw_is_rejected(self):
+        with self.assertRaises(InsufficientBalanceError):
+            WalletService.debit_wallet(self.customer, Decimal('100.02'))
+        
+        self.assertEqual(WalletService.get_wallet_balance(self.customer), Decimal('100.01'))
+    
+    def test_unsharding_folds_the_shards_back(self):
+        WalletService.credit_wallet(self.customer, Decimal('5.00'))
+        wallet = WalletService.set_shard_count(self.customer, 0)
+        
+        self.assertFalse(WalletShard.objects.filter(wallet=wallet).exists())
+        self.assertEqual(wallet.balance, Decimal('105.01'))
+
+
+@override_settings(WALLET_CACHE_ENABLED=False)
+class BulkCreditTest(WalletTestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_user(
+            username='wallet_admin',
+            email='wallet_admin@example.com',
+            password='testpass123',
+            role='ADMIN'
+        )
+        self.client.force_authenticate(self.admin)
+    
+    def _bulk_credit(self, credits):
+        return self.client.post('/api/wallet/bulk-credit/', {'credits': credits}, format='json')
+    
+    def test_credits_customers(self):
+        response = self._bulk_credit([
+            {'user_id': self.customer.id, 'amount': '10.00', 'description': 'Cashback'},
+            {'user_id': self.customer.id, 'amount': '2.50'},
+        ])
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual(data['credited'], 2)
+        self.assertEqual(data['total_amount'], '12.50')
+        self.assertEqual(WalletService.get_wallet_balance(self.customer), Decimal('12.50'))
+        self.assertEqual(
+            list(
+                Transaction.objects.filter(wallet__user=self.customer)
+                .order_by('id')
+                .values_list('balance_after_transaction', flat=True)
+            ),
+            [Decimal('10.00'), Decimal('12.50')]
+        )
+    
+    def test_rejects_non_customers_and_unknown_users(self):
+        response = self._bulk_credit([
+            {'user_id': self.admin.id, 'amount': '5.00'},
+            {'user_id': self.customer.id, 'amount': '5.00'},
+            {'user_id': self.admin.id + 1000, 'amount': '5.00'},
+        ])
+        
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual((data['credited'], data['rejected']), (1, 2))
+        self.assertEqual(
+            [error.split(':')[0] for error in data['errors']],
+            ['Row 1', 'Row 3']
+        )
+        self.assertIn('not a customer', data['errors'][0])
+        self.assertFalse(Transaction.objects.filter(wallet__user=self.admin).exists())
+        self.assertEqual(WalletService.get_wallet_balance(self.customer), Decimal('5.00'))
+    
+    def test_credit_over_the_wallet_cap_is_rejected(self):
+        WalletService.credit_wallet(self.customer, Decimal('99999999.00'))
+        
+        response = self._bulk_credit([{'user_id': self.customer.id, 'amount': '1.00'}])
+        
+        self.assertEqual(response.json()['data']['rejected'], 1)
+        self.assertEqual(
+            WalletService.get_wallet_balance(self.customer), Decimal('99999999.00')
+        )
+    
+    def test_oversized_upload_is_rejected_before_crediting(self):
+        rows = ''.join(f'{self.customer.id},1.00,x\n' for _ in range(10001))
+        upload = SimpleUploadedFile('credits.csv', f'user_id,amount,description\n{rows}'.encode())
+        
+        response = self.client.post(
+            '/api/wallet/bulk-credit/', {'file': upload}, format='multipart'
+        )
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Transaction.objects.filter(wallet__user=self.customer).exists())
+    
+    def test_customers_cannot_bulk_credit(self):
+        self.client.force_authenticate(self.customer)
+        
+        response = self._bulk_credit([{'user_id': self.customer.id, 'amount': '5.00'}])
+        
+        self.assertEqual(response.status_code, 403)
+
+
+class ReconcileWalletsTest(WalletTestCase):
+    def setUp(self):
+        super().setUp()
+        WalletService.credit_wallet(self.customer, Decimal('50.00'))
+        WalletService.debit_wallet(self.customer, Decimal('12.34'))
+        WalletService.credit_wallet(self.customer, Decimal('0.01'))
+        
+        self.sharded = User.objects.create_user(
+            username='wallet_sharded',
+            email='wallet_sharded@example.com',
+            password='testpass123'
+        )
+        WalletService.credit_wallet(self.sharded, Decimal('30.00'))
+        WalletService.set_shard_count(self.sharded, 3)
+        WalletService.credit_wallet(self.sharded, Decimal('5.00'))
+        WalletService.debit_wallet(self.sharded, Decimal('7.50'))
+    
+    def _reconcile(self) -> str:
+        out = StringIO()
+        call_command('reconcile_wallets', '--chunk-size', '2', stdout=out)
+        return out.getvalue()
+    
+    def test_consistent_ledger_passes(self):
+        self.assertIn('Every wallet matches its ledger', self._reconcile())
+    
+    def test_balance_mismatch_fails(self):
+        Wallet.objects.filter(user=self.customer).update(balance=Decimal('40.00'))
+        
+        with self.assertRaises(CommandError):
+            self._reconcile()
+    
+    def test_sharded_balance_mismatch_fails(self):
+        WalletShard.objects.filter(wallet__user=self.sharded, shard_index=0).update(
+            balance=Decimal('0.00')
+        )
+        
+        with self.assertRaises(CommandError):
+            self._reconcile()
+    
+    def test_running_total_break_fails(self):
+        first = Transaction.objects.filter(wallet__user=self.customer).order_by('id').first()
+        Transaction.objects.filter(id=first.id).update(
+            balance_after_transaction=Decimal('49.00')
+        )
+        
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('reconcile_wallets', stdout=out)
+        self.assertIn(f'transaction {first.id} records 49.00', out.getvalue())
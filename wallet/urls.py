@@ -1,7 +1,10 @@
 from django.urls import path
 from .views import (
     AddFundsView,
+    BulkCreditView,
+    TransactionExportView,
     TransactionHistoryView,
+    WalletStatementView,
     WalletBalanceView
 )
 
@@ -11,6 +14,9 @@ urlpatterns = [
     path('balance/', WalletBalanceView.as_view(), name='wallet_balance'),
     path('add-funds/', AddFundsView.as_view(), name='add_funds'),
     path('transactions/', TransactionHistoryView.as_view(), name='transaction_history'),
+    path('transactions/export/', TransactionExportView.as_view(), name='transaction_export'),
+    path('statement/', WalletStatementView.as_view(), name='wallet_statement'),
+    path('bulk-credit/', BulkCreditView.as_view(), name='bulk_credit'),
 ]
 
 
@@ -0,0 +1,36 @@
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict
+
+
+MAX_WALLET_BALANCE = Decimal('99999999.99')
+
+
+def validate_credit_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    validated = {}
+    
+    try:
+        user_id = int(str(record.get('user_id', '')).strip())
+        if user_id < 1:
+            raise ValueError
+        validated['user_id'] = user_id
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid user_id: {record.get('user_id')}")
+    
+    try:
+        amount = Decimal(str(record.get('amount', '')).strip())
+    except (InvalidOperation, ValueError, TypeError):
+        raise ValueError(f"Invalid amount: {record.get('amount')}")
+    if not amount.is_finite() or amount <= 0:
+        raise ValueError(f"Amount must be greater than zero: {record.get('amount')}")
+    if amount.as_tuple().exponent < -2:
+        raise ValueError(f"Amount cannot have more than 2 decimal places: {amount}")
+    if amount > MAX_WALLET_BALANCE:
+        raise ValueError(f"Amount too large: {amount}")
+    validated['amount'] = amount.quantize(Decimal('0.01'))
+    
+    description = str(record.get('description') or '').strip() or 'Wallet credit'
+    if len(description) > 255:
+        raise ValueError("Description cannot exceed 255 characters")
+    validated['description'] = description
+    
+    return validated
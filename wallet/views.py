@@ -1,24 +1,48 @@
+import io
+from datetime import datetime
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import status, generics
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
-from .models import Transaction
+from .models import Transaction, WalletSnapshot
+from .readers import get_credit_file_format, iter_credit_records
 from .serializers import (
+    BalanceQuerySerializer,
+    BalanceSerializer,
+    MAX_BULK_CREDITS,
+    BulkCreditSerializer,
+    StatementQuerySerializer,
+    StatementSerializer,
+    TransactionExportSerializer,
     TransactionSerializer,
+    TransactionFilterSerializer,
     AddFundsSerializer,
     WalletSerializer
 )
-from .services import WalletService
-from users.permissions import IsCustomer
+from .pagination import TransactionCursorPagination
+from .services import STATEMENT_EXPORT_FIELDS, WalletService
+from .snapshots import next_period_start
+from users.permissions import IsAdmin, IsCustomer
+from core.idempotency import IdempotentRequestMixin
+from core.streaming import export_filename, iter_export, streaming_export_response
 from core.utils import create_success_response, create_error_response
-from core.exceptions import InvalidTransactionError
+from core.exceptions import IdempotencyConflictError, InvalidTransactionError
 
 
-class AddFundsView(APIView):
+class AddFundsView(IdempotentRequestMixin, APIView):
     permission_classes = [IsAuthenticated, IsCustomer]
+    idempotency_scope = 'wallet.add_funds'
     
     def post(self, request):
+        replay = self.get_idempotent_replay(request)
+        if replay is not None:
+            return replay
+        
         serializer = AddFundsSerializer(data=request.data)
         
         if not serializer.is_valid():
@@ -31,27 +55,31 @@ class AddFundsView(APIView):
             )
         
         try:
-            transaction_record = WalletService.credit_wallet(
-                user=request.user,
-                amount=serializer.validated_data['amount'],
-                description=serializer.validated_data.get('description', 'Wallet credit')
-            )
-            
-            wallet = WalletService.get_wallet(request.user)
-            
-            response_data = {
-                'transaction': TransactionSerializer(transaction_record).data,
-                'wallet': WalletSerializer(wallet).data
-            }
-            
-            return Response(
-                create_success_response(
+            with transaction.atomic():
+                transaction_record = WalletService.credit_wallet(
+                    user=request.user,
+                    amount=serializer.validated_data['amount'],
+                    description=serializer.validated_data.get('description', 'Wallet credit')
+                )
+                
+                wallet = WalletService.get_wallet(request.user)
+                
+                response_data = {
+                    'transaction': TransactionSerializer(transaction_record).data,
+                    'wallet': WalletSerializer(wallet).data
+                }
+                response_body = create_success_response(
                     message='Funds added successfully',
                     data=response_data
-                ),
-                status=status.HTTP_200_OK
-            )
+                )
+                self.remember_idempotent_response(
+                    request, status.HTTP_200_OK, response_body
+                )
             
+            return Response(response_body, status=status.HTTP_200_OK)
+        
+        except IdempotencyConflictError:
+            return self.idempotency_conflict_response(request)
         except InvalidTransactionError as e:
             return Response(
                 create_error_response(str(e)),
@@ -71,9 +99,32 @@ class TransactionHistoryView(generics.ListAPIView):
     serializer_class = TransactionSerializer
     permission_classes = [IsAuthenticated, IsCustomer]
     
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            query_params = self.request.query_params
+            if query_params.get('pagination') == 'cursor' or 'cursor' in query_params:
+                self._paginator = TransactionCursorPagination()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+    
     def get_queryset(self):
+        filter_serializer = TransactionFilterSerializer(data=self.request.query_params)
+        filter_serializer.is_valid(raise_exception=True)
+        filters = filter_serializer.validated_data
+        
         wallet = WalletService.get_or_create_wallet(self.request.user)
-        return Transaction.objects.filter(wallet=wallet)
+        queryset = Transaction.objects.filter(wallet=wallet)
+        
+        if filters.get('transaction_type'):
+            queryset = queryset.filter(transaction_type=filters['transaction_type'])
+        if filters.get('since'):
+            queryset = queryset.filter(timestamp__gte=filters['since'])
+        if filters.get('until'):
+            queryset = queryset.filter(timestamp__lt=filters['until'])
+        
+        return queryset
     
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
@@ -92,15 +143,151 @@ class TransactionHistoryView(generics.ListAPIView):
         )
 
 
+class TransactionExportView(APIView):
+    permission_classes = [IsAuthenticated, IsCustomer]
+    
+    def get(self, request):
+        serializer = TransactionExportSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(
+                create_error_response('Invalid export parameters', serializer.errors),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        options = serializer.validated_data
+        chunks = iter_export(
+            options['file_format'],
+            STATEMENT_EXPORT_FIELDS,
+            WalletService.iter_statement_rows(
+                request.user,
+                since=options.get('since'),
+                until=options.get('until'),
+                transaction_type=options.get('transaction_type'),
+                chunk_size=options['chunk_size']
+            ),
+            compress=options['gzip']
+        )
+        return streaming_export_response(
+            chunks,
+            export_filename('transactions', options['file_format'], options['gzip']),
+            options['file_format'],
+            options['gzip']
+        )
+
+
 class WalletBalanceView(APIView):
     permission_classes = [IsAuthenticated, IsCustomer]
     
     def get(self, request):
-        balance = WalletService.get_wallet_balance(request.user)
+        query_serializer = BalanceQuerySerializer(data=request.query_params)
+        
+        if not query_serializer.is_valid():
+            return Response(
+                create_error_response(
+                    message='Invalid balance query',
+                    errors=query_serializer.errors
+                ),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        at = query_serializer.validated_data.get('at')
+        if at is not None:
+            balance = WalletService.balance_at(request.user, at)
+            data = {'balance': balance, 'at': at}
+        else:
+            balance = WalletService.get_wallet_balance(request.user)
+            data = {'balance': balance}
         
         return Response(
             create_success_response(
                 message='Balance retrieved successfully',
-                data={'balance': str(balance)}
+                data=BalanceSerializer(data).data
+            )
+        )
+
+
+class WalletStatementView(APIView):
+    permission_classes = [IsAuthenticated, IsCustomer]
+    
+    def get(self, request):
+        query_serializer = StatementQuerySerializer(data=request.query_params)
+        
+        if not query_serializer.is_valid():
+            return Response(
+                create_error_response(
+                    message='Invalid statement period',
+                    errors=query_serializer.errors
+                ),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        filters = query_serializer.validated_data
+        if 'month' in filters:
+            since = timezone.make_aware(datetime.strptime(filters['month'], '%Y-%m'))
+            until = next_period_start(WalletSnapshot.Period.MONTHLY, since)
+        else:
+            since = filters['since']
+            until = filters.get('until') or timezone.now()
+        
+        statement = WalletService.get_statement(request.user, since, until)
+        
+        return Response(
+            create_success_response(
+                message='Statement retrieved successfully',
+                data=StatementSerializer(statement).data
+            )
+        )
+
+
+class BulkCreditView(APIView):
+    permission_classes = [IsAuthenticated, IsAdmin]
+    
+    def post(self, request):
+        serializer = BulkCreditSerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return Response(
+                create_error_response(
+                    message='Invalid bulk credit request',
+                    errors=serializer.errors
+                ),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        upload = serializer.validated_data.get('file')
+        try:
+            if upload is not None:
+                # Parse the upload and apply the row cap before the
+                # transaction opens, so an oversized file never holds locks.
+                records = list(islice(
+                    iter_credit_records(
+                        io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline=''),
+                        get_credit_file_format(upload.name)
+                    ),
+                    MAX_BULK_CREDITS + 1
+                ))
+                if len(records) > MAX_BULK_CREDITS:
+                    raise ValueError(
+                        f"Cannot upload more than {MAX_BULK_CREDITS} credits at once; "
+                        f"use the bulk_credit_wallets command instead"
+                    )
+            else:
+                records = serializer.validated_data['credits']
+            
+            # All or nothing: a failure part way through must not leave some
+            # customers credited and others not.
+            with transaction.atomic():
+                result = WalletService.bulk_credit(records)
+        except ValueError as e:
+            return Response(
+                create_error_response(str(e)),
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        result['total_amount'] = str(result['total_amount'])
+        return Response(
+            create_success_response(
+                message=f"Credited {result['credited']} of {result['total']} records",
+                data=result
             )
         )